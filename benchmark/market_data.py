@@ -0,0 +1,39 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+
+def generate_market_data(tickers=10, years=10, missing_ratio=0.0, seed=0, start_date=datetime(2000, 1, 3)) -> dict:
+    """
+    벤치마크용 합성 시장 데이터 (영업일 기준, 시작 가격 100)
+    missing_ratio: 결측 비율, 절반은 상장 전 구간(앞쪽 결측), 나머지는 임의 날짜 결측
+    return: {"market_close_df", "market_open_price_df", "daily_price_df"}
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start_date, periods=int(years * 252))
+    columns = [f"T{i:04d}" for i in range(tickers)]
+    date_counts = len(index)
+
+    daily_returns = rng.normal(0.0003, 0.015, (date_counts, tickers))
+    close_array = 100 * np.cumprod(1 + daily_returns, axis=0)
+    gap = rng.normal(0, 0.004, (date_counts, tickers))
+    open_array = np.empty_like(close_array)
+    open_array[0] = 100
+    open_array[1:] = close_array[:-1] * (1 + gap[1:])
+
+    if missing_ratio > 0:
+        listing_rows = (rng.uniform(0, missing_ratio, tickers) * date_counts).astype(int)
+        is_missing = np.arange(date_counts)[:, np.newaxis] < listing_rows
+        is_missing |= rng.uniform(0, 1, (date_counts, tickers)) < missing_ratio / 2
+        # 첫 ticker 는 벤치마크용으로 결측 없음
+        is_missing[:, 0] = False
+        close_array[is_missing] = np.nan
+        open_array[is_missing] = np.nan
+
+    market_close_df = pd.DataFrame(close_array, index=index, columns=columns)
+    market_open_price_df = pd.DataFrame(open_array, index=index, columns=columns)
+    return {
+        "market_close_df": market_close_df,
+        "market_open_price_df": market_open_price_df,
+        "daily_price_df": market_close_df.ffill(),
+    }
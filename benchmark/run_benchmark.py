@@ -0,0 +1,303 @@
+"""
+백테스트 엔진, 유틸 함수 처리 속도 벤치마크
+
+실행: python benchmark/run_benchmark.py run --sizes small medium --output benchmark/results/new.json
+비교: python benchmark/run_benchmark.py compare benchmark/results/old.json benchmark/results/new.json
+"""
+import argparse
+from datetime import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.backtest.trading_day import TradingDay
+from quantrading.backtest.simulation_result_utils import calc_performance_from_value_history
+from market_data import generate_market_data
+
+SIZES = {
+    "small": {"tickers": 10, "years": 5},
+    "medium": {"tickers": 100, "years": 10},
+    "large": {"tickers": 500, "years": 20},
+}
+RESULT_FORMAT_VERSION = 1
+
+
+class EqualWeightStrategy(qt.Strategy):
+    def on_data(self):
+        close_df = self.market_close_df
+        tickers = close_df.columns[close_df.loc[self.date].notna()]
+        self.reserve_order(pd.Series(1 / len(tickers), index=tickers))
+
+
+class EqualWeightOpenCloseStrategy(qt.OpenCloseStrategy):
+    def on_data(self):
+        close_df = self.get_available_data()["market_close_df"]
+        tickers = close_df.columns[close_df.iloc[-1].notna()] if len(close_df) > 0 else close_df.columns[:1]
+        self.set_allocation({ticker: 1 / len(tickers) for ticker in tickers}, sum_should_one=False)
+
+
+class EqualWeightLightStrategy(qt.LightStrategy):
+    def initialize(self):
+        self.initial_order = True
+        self.on_data()
+
+    def on_data(self):
+        tickers = self.tickers
+        self.reserve_order({ticker: 1 / len(tickers) for ticker in tickers})
+
+
+def get_backtest_kwargs(data: dict) -> dict:
+    index = data["market_close_df"].index
+    return {
+        "name": "benchmark",
+        "start_date": index[0].to_pydatetime(),
+        "end_date": index[-1].to_pydatetime(),
+        "rebalancing_periodic": "monthly",
+        "rebalancing_moment": "first",
+    }
+
+
+def benchmark_strategy_run(data: dict) -> int:
+    strategy = EqualWeightStrategy(market_close_df=data["daily_price_df"], **get_backtest_kwargs(data))
+    strategy.run()
+    return len(strategy.trading_days)
+
+
+def benchmark_open_close_strategy_run(data: dict) -> int:
+    strategy = EqualWeightOpenCloseStrategy(market_close_df=data["market_close_df"],
+                                            market_open_price_df=data["market_open_price_df"],
+                                            **get_backtest_kwargs(data))
+    strategy.run()
+    return len(strategy.trading_days)
+
+
+def benchmark_light_strategy_run(data: dict) -> int:
+    strategy = EqualWeightLightStrategy(daily_price_df=data["daily_price_df"], **get_backtest_kwargs(data))
+    strategy.run()
+    return len(strategy.trading_days)
+
+
+def benchmark_rebalancing_days(data: dict) -> int:
+    index = data["market_close_df"].index
+    trading_day = TradingDay(index.to_series().reset_index(drop=True))
+    calls = 0
+    for rebalancing_periodic in ["daily", "weekly", "monthly", "quarterly", "yearly"]:
+        for rebalancing_moment in ["first", "last", 15]:
+            if rebalancing_moment == 15 and rebalancing_periodic != "monthly":
+                continue
+            trading_day.get_rebalancing_days(index[0], index[-1], rebalancing_periodic, rebalancing_moment)
+            calls += 1
+    return calls
+
+
+def benchmark_rebalancing_kernel(data: dict) -> int:
+    daily_return_df = data["daily_price_df"].pct_change()
+    index = daily_return_df.index
+    rebalancing_days = TradingDay(index.to_series().reset_index(drop=True)).get_rebalancing_days(
+        index[0], index[-1], "monthly", "first")[1:]
+    rng = np.random.default_rng(0)
+    weight_array = rng.uniform(0, 1, (len(rebalancing_days) + 1, daily_return_df.shape[1]))
+    weight_series_list = [pd.Series(row / row.sum(), index=daily_return_df.columns) for row in weight_array]
+
+    qt.get_dynamic_weight_rebalancing_port_daily_value_df(weight_series_list, daily_return_df, rebalancing_days)
+    qt.get_static_weight_rebalancing_port_daily_value_df(weight_series_list[0], daily_return_df, rebalancing_days)
+    return daily_return_df.size
+
+
+def benchmark_calc_performance(data: dict) -> int:
+    value_series = data["daily_price_df"].iloc[:, 0]
+    calc_performance_from_value_history(value_series)
+    return len(value_series)
+
+
+def benchmark_time_series_utils(data: dict) -> int:
+    price_df = data["daily_price_df"]
+    qt.get_panel_rolling_returns(price_df)
+    qt.get_panel_past_returns(price_df)
+    qt.get_panel_ma(price_df)
+    qt.get_panel_vol(price_df, [21, 63])
+    return price_df.size
+
+
+def benchmark_time_series_utils_by_ticker(data: dict) -> int:
+    price_series = data["daily_price_df"].iloc[:, 0]
+    qt.get_rolling_returns(price_series)
+    qt.get_past_returns(price_series)
+    qt.get_ma(price_series)
+    qt.get_vol(price_series, [21, 63])
+    return len(price_series)
+
+
+# 이름 -> (함수, 처리 단위)
+BENCHMARKS = {
+    "Strategy.run": (benchmark_strategy_run, "days"),
+    "OpenCloseStrategy.run": (benchmark_open_close_strategy_run, "days"),
+    "LightStrategy.run": (benchmark_light_strategy_run, "days"),
+    "TradingDay.get_rebalancing_days": (benchmark_rebalancing_days, "calls"),
+    "utils.rebalancing_kernel": (benchmark_rebalancing_kernel, "cells"),
+    "calc_performance_from_value_history": (benchmark_calc_performance, "days"),
+    "time_series_utils.panel": (benchmark_time_series_utils, "cells"),
+    "time_series_utils.series": (benchmark_time_series_utils_by_ticker, "days"),
+}
+
+
+def measure(func, data: dict, repeat: int) -> dict:
+    seconds_list = []
+    units = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = func(data)
+        seconds_list.append(time.perf_counter() - start)
+
+    best_seconds = min(seconds_list)
+    return {
+        "seconds_min": best_seconds,
+        "seconds_median": statistics.median(seconds_list),
+        "units": int(units),
+        "throughput": float(units / best_seconds) if best_seconds > 0 else None,
+    }
+
+
+def get_git_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True,
+                                  timeout=30).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": None if status is None else len(status) > 0}
+
+
+def get_package_version() -> str or None:
+    try:
+        with open(os.path.join(REPO_ROOT, "setup.py"), encoding="utf-8") as f:
+            for line in f:
+                if line.strip().startswith("version="):
+                    return line.split("=", 1)[1].strip().strip(",").strip("'\"")
+    except OSError:
+        pass
+    return None
+
+
+def run_benchmarks(size_names: list, benchmark_names: list, repeat=3, missing_ratio=0.05) -> dict:
+    results = []
+    for size_name in size_names:
+        size = SIZES[size_name]
+        data = generate_market_data(size["tickers"], size["years"], missing_ratio)
+        for name in benchmark_names:
+            func, unit = BENCHMARKS[name]
+            row = {"name": name, "size": size_name, **size, "missing_ratio": missing_ratio, "unit": unit}
+            try:
+                row.update(measure(func, data, repeat))
+            except Exception as e:
+                row["error"] = f"{type(e).__name__}: {e}"
+            results.append(row)
+            print_row(row)
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "quantrading_version": get_package_version(),
+        "git": get_git_info(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def print_row(row: dict):
+    if "error" in row:
+        print(f"{row['name']:<40} {row['size']:<8} ERROR {row['error']}")
+    elif row["throughput"] is None:
+        print(f"{row['name']:<40} {row['size']:<8} {row['seconds_min']:>10.4f}s {'-':>14} (측정 시간 0)")
+    else:
+        print(f"{row['name']:<40} {row['size']:<8} {row['seconds_min']:>10.4f}s "
+              f"{row['throughput']:>14,.0f} {row['unit']}/s")
+
+
+def compare_results(old: dict, new: dict, threshold=0.1) -> list:
+    """
+    같은 (name, size) 의 throughput 비율 (new / old)
+    return: [(name, size, old throughput, new throughput, 비율, regression 여부)]
+    측정 시간이 0 이라 throughput 이 없는 (None) 행은 비율 None, regression 아님
+    """
+    old_rows = {(row["name"], row["size"]): row for row in old["results"] if "error" not in row}
+    compare_rows = []
+    for row in new["results"]:
+        old_row = old_rows.get((row["name"], row["size"]))
+        if old_row is None or "error" in row:
+            continue
+        if row["throughput"] is None or old_row["throughput"] is None:
+            compare_rows.append((row["name"], row["size"], old_row["throughput"], row["throughput"], None, False))
+            continue
+        ratio = row["throughput"] / old_row["throughput"]
+        compare_rows.append((row["name"], row["size"], old_row["throughput"], row["throughput"], ratio,
+                             ratio < 1 - threshold))
+    return compare_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="quantrading benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--sizes", nargs="+", default=["small", "medium"], choices=list(SIZES))
+    run_parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--missing-ratio", type=float, default=0.05)
+    run_parser.add_argument("--output", default=None,
+                            help="결과 json 경로 (기본: benchmark/results/<commit>_<시각>.json)")
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="throughput 이 이 비율 이상 줄면 regression")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        result = run_benchmarks(args.sizes, args.benchmarks, args.repeat, args.missing_ratio)
+        output = args.output
+        if output is None:
+            commit = (result["git"]["commit"] or "unknown")[:10]
+            output = os.path.join(REPO_ROOT, "benchmark", "results",
+                                  f"{commit}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        result_json = json.dumps(result, indent=2, ensure_ascii=False)
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(result_json)
+        print(f"saved: {output}")
+    else:
+        with open(args.old, encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        compare_rows = compare_results(old, new, args.threshold)
+        for name, size, old_throughput, new_throughput, ratio, is_regression in compare_rows:
+            if ratio is None:
+                print(f"{name:<40} {size:<8} 비교 불가 (throughput 없음: old={old_throughput}, new={new_throughput})")
+                continue
+            flag = "REGRESSION" if is_regression else ""
+            print(f"{name:<40} {size:<8} {old_throughput:>14,.0f} -> {new_throughput:>14,.0f} ({ratio:6.2f}x) {flag}")
+        if any(row[-1] for row in compare_rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
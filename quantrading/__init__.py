@@ -1,39 +1,88 @@
-from .time_series_utils import (
-    add_future_price,
-    get_rolling_returns,
-    get_future_returns,
-    add_past_price,
-    get_past_returns,
-    add_both_side_returns,
-    add_ma_price,
-    get_ma,
-    get_pct_change,
-    get_vol,
-)
-from .performance_utils import (
-    get_returns,
-    get_annualized_returns,
-    get_delta_year,
-    convert_values_to_cumulative_returns,
-    get_annualized_std,
-    get_returns_between_returns,
-    get_annual_std,
-    get_performance_summary,
-    get_draw_down,
-)
-from .utils import (
-    generate_leverage_index
-)
-from .backtest import (
-    Strategy,
-    LightStrategy,
-    OpenCloseStrategy,
-    divide_code_list_by_quantiles,
-    apply_equal_weights,
-    get_static_weight_rebalancing_port_daily_value_df,
-    get_no_rebalancing_port_daily_value_df,
-    get_dynamic_weight_rebalancing_port_daily_value_df,
-    divide_code_list_by_percentile,
-    trading_day,
-)
-from .simulation import monte_carlo
+import importlib
+
+# 공개 이름 -> 정의된 module, 처음 접근할 때 import (PEP 562)
+_LAZY_ATTRIBUTE_MODULES = {
+    ".time_series_utils": [
+        "add_future_price",
+        "get_rolling_returns",
+        "get_panel_rolling_returns",
+        "get_future_returns",
+        "add_past_price",
+        "get_past_returns",
+        "add_both_side_returns",
+        "add_ma_price",
+        "get_ma",
+        "get_pct_change",
+        "get_vol",
+        "get_panel_past_returns",
+        "get_panel_future_returns",
+        "add_panel_both_side_returns",
+        "add_panel_ma_price",
+        "get_panel_ma",
+        "get_panel_vol",
+    ],
+    ".performance_utils": [
+        "get_returns",
+        "get_annualized_returns",
+        "get_delta_year",
+        "convert_values_to_cumulative_returns",
+        "get_annualized_std",
+        "get_returns_between_returns",
+        "get_annual_std",
+        "get_performance_summary",
+        "get_draw_down",
+        "get_draw_down_episodes",
+    ],
+    ".utils": [
+        "generate_leverage_index",
+    ],
+    ".feature_store": [
+        "FeatureStore",
+    ],
+    ".backtest": [
+        "Strategy",
+        "LightStrategy",
+        "OpenCloseStrategy",
+        "divide_code_list_by_quantiles",
+        "apply_equal_weights",
+        "get_static_weight_rebalancing_port_daily_value_df",
+        "get_no_rebalancing_port_daily_value_df",
+        "get_dynamic_weight_rebalancing_port_daily_value_df",
+        "divide_code_list_by_percentile",
+        "divide_panel_by_quantiles",
+        "get_panel_quantile_mask",
+        "get_panel_percentile_mask",
+        "trading_day",
+        "run_parameter_sweep",
+        "iter_parameter_sweep",
+        "evaluate_factor_quantiles",
+        "SleeveStrategy",
+    ],
+    ".simulation": [
+        "monte_carlo",
+    ],
+}
+_LAZY_ATTRIBUTES = {name: module for module, names in _LAZY_ATTRIBUTE_MODULES.items() for name in names}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        # qt.backtest 처럼 하위 module 접근
+        if name.startswith("__"):
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,19 +1,39 @@
 from .backtest import (
     Strategy
 )
-from .simulation_result_utils import save_simulation_result_to_excel_file
+from .simulation_result_utils import (
+    save_simulation_result_to_excel_file,
+    save_simulation_result_to_binary,
+    load_simulation_result_from_binary
+)
 from .light_backtest import (
     LightStrategy
 )
 from .utils import (
     divide_code_list_by_quantiles,
     divide_code_list_by_percentile,
+    divide_panel_by_quantiles,
+    get_panel_quantile_mask,
+    get_panel_percentile_mask,
     apply_equal_weights,
     get_no_rebalancing_port_daily_value_df,
     get_static_weight_rebalancing_port_daily_value_df,
     get_dynamic_weight_rebalancing_port_daily_value_df,
-    concat_simulation_result
+    concat_simulation_result,
+    SimulationResultAggregator
 )
 from .backtest_open_close import (
     OpenCloseStrategy
 )
+from .parameter_sweep import (
+    run_parameter_sweep,
+    iter_parameter_sweep
+)
+from .factor_evaluation import (
+    evaluate_factor_quantiles,
+    get_rebalancing_forward_returns
+)
+from .sleeve_strategy import (
+    SleeveStrategy,
+    get_sleeve_value_df
+)
@@ -1,7 +1,7 @@
+import numpy as np
 import pandas as pd
 from .simulation_result_utils import calc_performance_from_value_history
 from .backtest_base import BackTestBase
-from datetime import timedelta
 
 
 class Strategy(BackTestBase):
@@ -9,13 +9,14 @@ class Strategy(BackTestBase):
         super().__init__(**kwargs)
 
         self.market_df_pct_change = self.market_close_df.pct_change()
+        self._market_return_matrix = self.portfolio.get_return_matrix(self.market_df_pct_change)
 
         self.simulation_status = {}
         self.simulation_result = {}
         self.exist_reservation_order = False
         self.reservation_order = pd.Series()
+        self._order_weight_list = []
         self.selected_asset_counts = pd.Series()
-        self.daily_log_list = []
         self.returns_until_next_rebal_series = None
 
     def initialize(self):
@@ -25,24 +26,38 @@ class Strategy(BackTestBase):
         pass
 
     def run(self):
-        self.initialize()
-        end_date = self.end_date
-        while self.date <= end_date:
-            if self._is_trading_day():
+        profiler = self.profiler
+        profiler.start()
+        with profiler.measure("initialize"):
+            self.initialize()
+        for _ in self._iter_trading_days():
+            with profiler.measure("on_start_of_day"):
                 self.on_start_of_day()
-                if self.exist_reservation_order:
+            if self.exist_reservation_order:
+                with profiler.measure("execute_reservation_order"):
                     self.execute_reservation_order()
-                if self.is_rebalancing_day():
+            if self.is_rebalancing_day():
+                with profiler.measure("on_data"):
                     self.on_data()
+            with profiler.measure("on_end_of_day"):
                 self.on_end_of_day()
-            self.date += timedelta(days=1)
-        self.on_end_of_algorithm()
+        with profiler.measure("on_end_of_algorithm"):
+            self.on_end_of_algorithm()
+        profiler.stop(self._date_position + 1)
 
     def execute_reservation_order(self):
-        self.portfolio.set_allocations(self.reservation_order)
-        reservation_order_series = self.reservation_order
-        reservation_order_series.name = self.date
-        self.order_weight_df = pd.concat([self.order_weight_df, reservation_order_series.to_frame().T], axis=0)
+        portfolio = self.portfolio
+        previous_weights = portfolio.amounts / portfolio.get_total_portfolio_value()
+        portfolio.set_allocations(self.reservation_order)
+
+        # 회전율: 체결 전후 ticker 비중 변화 절대값 합 / 2 (새 ticker 는 체결 전 비중 0)
+        weights = portfolio.amounts / portfolio.get_total_portfolio_value()
+        weights[:len(previous_weights)] -= previous_weights
+        turnover_weight = np.abs(weights).sum() / 2
+        self._turnover_weight_series.loc[self.date] = turnover_weight
+        self.online_performance.add_turnover(turnover_weight)
+
+        self._order_weight_list.append(self.reservation_order.rename(self.date))
         self.selected_asset_counts.loc[self.date] = len(self.reservation_order)
         self.reservation_order = pd.Series()
         self.exist_reservation_order = False
@@ -55,11 +70,7 @@ class Strategy(BackTestBase):
         self.event_log.loc[len(self.event_log)] = [self.date, msg]
 
     def is_rebalancing_day(self):
-        today = self.date
-        if today in self.rebalancing_days:
-            return True
-        else:
-            return False
+        return self._is_rebalancing_day()
 
     def on_start_of_day(self):
         pass
@@ -69,7 +80,7 @@ class Strategy(BackTestBase):
         self.log_portfolio_value()
 
     def on_end_of_algorithm(self):
-        self.portfolio_log = pd.concat(self.daily_log_list, axis=1).T
+        self.portfolio_log = self._portfolio_log_buffer.to_frame()
         returns_until_next_rebal = (
             self.portfolio_log["port_value"]
                 .reindex(self.rebalancing_days)
@@ -80,19 +91,22 @@ class Strategy(BackTestBase):
         returns_until_next_rebal.name = self.name_for_result_column
         self.returns_until_next_rebal_series = returns_until_next_rebal
 
-    def log_portfolio_value(self):
-        port_value = self.portfolio.get_total_portfolio_value()
-        cash = self.portfolio.cash
-        series = pd.Series(self.portfolio.security_holding)
-        series.index = [ticker + "_amount" for ticker in series.index]
-        series.name = self.date
+    def get_order_weight_df(self) -> pd.DataFrame:
+        """
+        체결일별 주문 비중 (execute_reservation_order 마다 모은 주문을 한 번에 합침)
+        """
+        if len(self._order_weight_list) > 0:
+            self._order_weight_df = pd.concat([order.to_frame().T for order in self._order_weight_list], axis=0)
+        return self._order_weight_df
 
-        series.loc["port_value"] = port_value
-        series.loc["cash"] = cash
-        self.daily_log_list.append(series)
+    def log_portfolio_value(self):
+        with self.profiler.measure("log_portfolio_value"):
+            self._record_portfolio_log()
 
     def update_portfolio_value(self):
-        self.portfolio.update_holdings_value(self.date, self.market_df_pct_change)
+        with self.profiler.measure("update_portfolio_value"):
+            self.portfolio.update_holdings_value_by_position(self._get_market_row_position(),
+                                                             self._market_return_matrix)
 
     def get_daily_return(self):
         return self.portfolio_log['port_value'].pct_change()
@@ -119,7 +133,7 @@ class Strategy(BackTestBase):
         performance["portfolio_log"] = portfolio_log
         performance["returns_until_next_rebal"] = self.returns_until_next_rebal_series
 
-        rebalancing_weight = self.order_weight_df
+        rebalancing_weight = self.get_order_weight_df()
 
         asset_list = []
         for column in portfolio_log.columns:
@@ -131,6 +145,7 @@ class Strategy(BackTestBase):
         result['performance'] = performance
         result['rebalancing_weight'] = rebalancing_weight
         result['asset_weight'] = asset_weight_df
+        result['turnover_weight'] = self._turnover_weight_series
         return result
 
     def selected_asset_counts_to_csv(self, file_name=None, folder_path=None):
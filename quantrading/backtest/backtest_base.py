@@ -1,11 +1,14 @@
 from abc import ABCMeta, abstractmethod
-from .simulation_result_utils import save_simulation_result_to_excel_file
+from .simulation_result_utils import save_simulation_result_to_excel_file, save_simulation_result_to_binary
 from .. import utils
-import plotly.graph_objects as go
 from .trading_day import TradingDay
 from .simulation_result_utils import calc_performance_from_value_history
 import pandas as pd
+from datetime import timedelta
 from .portfolio import Portfolio
+from .portfolio_log import PortfolioLogBuffer
+from .online_performance import OnlinePerformance
+from .profiler import RunProfiler, NullProfiler
 
 
 class BackTestBase(metaclass=ABCMeta):
@@ -23,12 +26,11 @@ class BackTestBase(metaclass=ABCMeta):
         self.benchmark_ticker = kwargs.get("benchmark_ticker", None)
 
         self.portfolio = Portfolio(**kwargs)
-        self.portfolio_log = pd.DataFrame(columns=['port_value', 'cash'])
+        self._portfolio_log = None
 
         self.rebalancing_mp_weight = pd.DataFrame()
         self._order_weight_df = pd.DataFrame()
         self._turnover_weight_series = pd.Series()
-        self.port_weight_series_list = []
         self.port_weight_df = None
         self.event_log = pd.DataFrame(columns=["datetime", "log"])
 
@@ -43,6 +45,19 @@ class BackTestBase(metaclass=ABCMeta):
             self.rebalancing_moment
         )
 
+        # 거래일 위치 index (date -> position), 리밸런싱일 set
+        self._date_position = -1
+        self._trading_day_position = {date: i for i, date in enumerate(self.trading_days)}
+        self._rebalancing_day_set = set(self.rebalancing_days)
+        market_row_position = {date: i for i, date in enumerate(self.market_close_df.index)}
+        self._trading_day_market_rows = [market_row_position[date] for date in self.trading_days]
+        self._portfolio_log_buffer = PortfolioLogBuffer(self.trading_days, self.portfolio.tickers)
+        # 거래일마다 갱신되는 성과 지표, stop_run() 호출시 다음 거래일부터 실행 중단
+        self.online_performance = OnlinePerformance()
+        self._stop_requested = False
+        # profile=True 이면 run() 단계별 실행 시간 기록, get_result()['profile'] 에 포함
+        self.profiler = RunProfiler() if kwargs.get("profile", False) else NullProfiler()
+
         self.portfolio_rebalancing_factor_history_list = []
 
         if self.benchmark_ticker is not None:
@@ -65,19 +80,75 @@ class BackTestBase(metaclass=ABCMeta):
 
         result['rebalancing_factor_history'] = rebalancing_factor_history_df
         result['event_log'] = event_log
+
+        profile = self.profiler.get_summary()
+        if profile is not None:
+            result['profile'] = profile
         return result
 
-    def _log_port_weight(self):
-        port_weight_series = self.portfolio.get_allocations()
-        port_weight_row = port_weight_series.to_frame(self.date).T
-        self.port_weight_series_list.append(port_weight_row)
+    @property
+    def portfolio_log(self) -> pd.DataFrame:
+        """
+        백테스트 종료 전에는 지금까지 기록된 버퍼로 생성
+        """
+        if self._portfolio_log is None:
+            return self._portfolio_log_buffer.to_frame()
+        return self._portfolio_log
+
+    @portfolio_log.setter
+    def portfolio_log(self, portfolio_log: pd.DataFrame):
+        self._portfolio_log = portfolio_log
+
+    def _record_portfolio_log(self):
+        portfolio = self.portfolio
+        port_value = portfolio.get_total_portfolio_value()
+        self._portfolio_log_buffer.record(
+            self._date_position,
+            port_value,
+            portfolio.cash,
+            portfolio.amounts,
+            portfolio.held
+        )
+        self.online_performance.update(self.date, port_value)
+
+    def stop_run(self):
+        """
+        오늘까지 실행하고 종료 (on_end_of_algorithm 은 실행됨)
+        """
+        self._stop_requested = True
+
+    def _iter_trading_days(self):
+        """
+        거래일 위치 순서대로 self.date 를 이동
+        종료 후 self.date 는 달력일 순회 방식과 동일하게 end_date 다음 날
+        """
+        for position, date in enumerate(self.trading_days):
+            if self._stop_requested:
+                return
+            self._date_position = position
+            self.date = date
+            yield date
+
+        elapsed_days = max((self.end_date - self.start_date).days + 1, 0)
+        self.date = self.start_date + timedelta(days=elapsed_days)
 
     def _is_trading_day(self):
-        today = self.date
-        if today in self.trading_days:
-            return True
-        else:
-            return False
+        return self.date in self._trading_day_position
+
+    def _is_rebalancing_day(self):
+        return self.date in self._rebalancing_day_set
+
+    def _get_position(self, delta=0) -> int:
+        """
+        오늘 기준 delta 거래일 뒤의 위치, 마지막 거래일을 넘으면 마지막 거래일 위치
+        """
+        new_position = self._trading_day_position[self.date] + delta
+        if new_position >= len(self.trading_days):
+            return len(self.trading_days) - 1
+        return new_position
+
+    def _get_market_row_position(self) -> int:
+        return self._trading_day_market_rows[self._date_position]
 
     def add_to_rebalancing_factor_history(self, data: pd.Series or pd.DataFrame):
         self.portfolio_rebalancing_factor_history_list.append(data)
@@ -87,6 +158,8 @@ class BackTestBase(metaclass=ABCMeta):
         pass
 
     def print_result_log(self, display_image=False):
+        import plotly.graph_objects as go
+
         result: dict = self.get_result()
 
         performance: dict = result.get('performance', None)
@@ -187,6 +260,21 @@ class BackTestBase(metaclass=ABCMeta):
         result = self.get_result()
         save_simulation_result_to_excel_file(result, path)
 
+    def result_to_binary(self, file_name=None, folder_path=None):
+        """
+        result 를 column 별 npy 폴더로 저장, load_simulation_result_from_binary 로 복원
+        """
+        if file_name is None:
+            file_name = self.name
+
+        if folder_path is None:
+            path = f"./{file_name}"
+        else:
+            path = f"./{folder_path}/{file_name}"
+
+        result = self.get_result()
+        save_simulation_result_to_binary(result, path)
+
     def port_value_to_csv(self, file_name=None, folder_path=None):
         if file_name is None:
             file_name = self.name
@@ -1,8 +1,9 @@
 import pandas as pd
-from datetime import timedelta
 from .simulation_result_utils import calc_performance_from_value_history
 import numpy as np
 from .backtest_base import BackTestBase
+from .data_store import PointInTimeSlicer, PointInTimeDataStore
+from .order_queue import OrderQueue, OrderWeightLog
 
 
 class OpenCloseStrategy(BackTestBase):
@@ -52,7 +53,21 @@ class OpenCloseStrategy(BackTestBase):
         # 시가는 전일 종가와 비교
         self.__market_open_df_pct_change = self.__market_open_price_df.divide(self.market_close_df.shift(1)) - 1
 
-        self.__reservation_order = {}
+        # 평가용 수익률 행렬 (row 위치는 market_close_df 기준)
+        market_index = self.market_close_df.index
+        self.__intraday_return_matrix = self.portfolio.get_return_matrix(
+            self.__market_intraday_pct_change.reindex(market_index))
+        self.__open_return_matrix = self.portfolio.get_return_matrix(
+            self.__market_open_df_pct_change.reindex(market_index))
+
+        self.__data_slicer_dict = {
+            "market_close_df": PointInTimeSlicer(self.market_close_df),
+            "market_open_price_df": PointInTimeSlicer(self.__market_open_price_df),
+            "index_df": PointInTimeSlicer(self._index_df)
+        }
+
+        self.__order_queue = OrderQueue(self.portfolio.tickers)
+        self.__order_weight_log = OrderWeightLog(self.portfolio.tickers)
         self.__irregular_rebalancing = False
         self.__irregular_cool_time = 0
         self.portfolio_log_series_df = pd.DataFrame()
@@ -86,31 +101,40 @@ class OpenCloseStrategy(BackTestBase):
         return is_first_trading_day
 
     def run(self):
-        end_date = self.end_date
-        while self.date <= end_date:
-            if self._is_trading_day():
-                if self.is_first_trading_day():
+        profiler = self.profiler
+        profiler.start()
+        for _ in self._iter_trading_days():
+            if self.is_first_trading_day():
+                with profiler.measure("initialize"):
                     self.initialize()
 
+            with profiler.measure("on_start_of_day"):
                 self.__run_at_start_of_day()
-                if self.__is_custom_rebalancing_period():
+            if self.__is_custom_rebalancing_period():
+                with profiler.measure("custom_mp_rebalancing"):
                     if self.__is_custom_liquidate_date():
                         self.__run_at_custom_liquidate_date()
                     else:
                         self.__custom_mp_rebalancing()
-                else:
-                    if self.__is_rebalancing_day():
+            else:
+                if self.__is_rebalancing_day():
+                    with profiler.measure("on_data"):
                         self.on_data()
-                    if self.__is_irregular_rebalancing_day():
+                if self.__is_irregular_rebalancing_day():
+                    with profiler.measure("on_irregular_rebalacning"):
                         self.on_irregular_rebalacning()
+            with profiler.measure("update_portfolio_value"):
                 self.__update_portfolio_value('open')
+            with profiler.measure("reserve_allocation_order"):
                 self.__reserve_allocation_order()
-                if self.date in self.__reservation_order.keys():
+            if self._date_position in self.__order_queue:
+                with profiler.measure("execute_reservation_order"):
                     self.__execute_reservation_order()
 
-                self.__run_at_end_of_day()
-            self.date += timedelta(days=1)
-        self.__run_at_end_of_algorithm()
+            self.__run_at_end_of_day()
+        with profiler.measure("on_end_of_algorithm"):
+            self.__run_at_end_of_algorithm()
+        profiler.stop(self._date_position + 1)
 
     def on_start_of_day(self):
         pass
@@ -139,46 +163,33 @@ class OpenCloseStrategy(BackTestBase):
         self.event_log.loc[len(self.event_log)] = [self.date, msg]
 
     def get_date(self, delta=0):
-        cur_date_idx = self.trading_days.index(self.date)
-
-        new_date_idx = cur_date_idx + delta
-        if new_date_idx >= len(self.trading_days):
-            return self.trading_days[-1]
-        else:
-            return self.trading_days[cur_date_idx + delta]
-
-    def get_available_data(self, exclude_today_data=True) -> dict:
-        today_date = self.date
-
-        if exclude_today_data:
-            sliced_market_close_df = self.market_close_df.loc[self.market_close_df.index < today_date]
-            sliced_market_open_price_df = self.__market_open_price_df.loc[
-                self.__market_open_price_df.index < today_date]
-            sliced_index_df = self._index_df.loc[self._index_df.index < today_date]
-        else:
-            sliced_market_close_df = self.market_close_df.loc[self.market_close_df.index <= today_date]
-            sliced_market_open_price_df = self.__market_open_price_df.loc[
-                self.__market_open_price_df.index <= today_date]
-            sliced_index_df = self._index_df.loc[self._index_df.index <= today_date]
-
-        data_store = {
-            "market_close_df": sliced_market_close_df,
-            "market_open_price_df": sliced_market_open_price_df,
-            "index_df": sliced_index_df
-        }
+        return self.trading_days[self._get_position(delta)]
 
-        return data_store
+    def get_available_data(self, exclude_today_data=True, lazy=False) -> dict:
+        """
+        오늘 날짜 기준으로 사용 가능한 데이터 (원본 데이터의 view, 수정 금지)
+        lazy=True 이면 접근한 데이터만 slicing 하는 PointInTimeDataStore 반환
+        """
+        data_store = PointInTimeDataStore(self.__data_slicer_dict, self.date, exclude_today_data)
+        if lazy:
+            return data_store
+        return data_store.to_dict()
 
     def __run_at_end_of_day(self):
-        self.__update_portfolio_value('close')
-        self.__log_portfolio_value()
-        self._log_port_weight()
+        profiler = self.profiler
+        with profiler.measure("update_portfolio_value"):
+            self.__update_portfolio_value('close')
+        with profiler.measure("log_portfolio_value"):
+            self._record_portfolio_log()
         self.__last_day_portfolio_value = self.portfolio.get_total_portfolio_value()
-        self.on_end_of_day()
+        with profiler.measure("on_end_of_day"):
+            self.on_end_of_day()
         self.__irregular_cool_time -= 1
 
     def __run_at_end_of_algorithm(self):
-        self.port_weight_df = pd.concat(self.port_weight_series_list, axis=0)
+        self.portfolio_log = self._portfolio_log_buffer.to_frame()
+        self.port_weight_df = self._portfolio_log_buffer.to_weight_frame()
+        self._order_weight_df = self.__order_weight_log.to_frame()
 
         simulation_range_time_delta = self.end_date - self.start_date
         years_delta = simulation_range_time_delta.days / 365.25
@@ -269,41 +280,30 @@ class OpenCloseStrategy(BackTestBase):
             self.__is_buy_day = False
 
     def __execute_reservation_order(self):
-        today_reserved_order: pd.Series = self.__reservation_order.get(self.date)
-
-        buy_series = pd.Series()
-        sell_series = pd.Series()
-        for ticker, amount_delta in today_reserved_order.iteritems():
-            if np.isneginf(amount_delta):
-                amount_delta = -self.portfolio.security_holding.get(ticker, 0)
-                today_reserved_order[ticker] = amount_delta
-
-            if amount_delta == 0:
-                continue
-
-            if amount_delta > 0:
-                buy_series.loc[ticker] = amount_delta
-            else:
-                if self.portfolio.security_holding.get(ticker, 0) == 0:
-                    continue
-                sell_series.loc[ticker] = -amount_delta
+        """
+        오늘 체결할 주문을 매도 -> 매수 순서로 한 번에 체결
+        전량 매도(-inf) 는 현재 보유 amount 로 바꾸고, 보유하지 않은 ticker 의 매도는 무시
+        """
+        order_amounts, ordered = self.__order_queue.pop(self._date_position)
+        holding_amounts = self.portfolio.amounts
 
-        for ticker, amount in sell_series.iteritems():
-            self.portfolio.sell(ticker, amount)
+        liquidation = np.isneginf(order_amounts)
+        order_amounts[liquidation] = -holding_amounts[liquidation]
 
-        downsize_ratio = self.__evaluate_buy_ability(buy_series)
+        sell_mask = (order_amounts < 0) & (holding_amounts != 0)
+        self.portfolio.sell_array(-order_amounts, sell_mask)
 
-        for ticker, amount in buy_series.iteritems():
-            if downsize_ratio < 1:
-                amount *= downsize_ratio
-            self.portfolio.buy(ticker, amount)
+        buy_mask = order_amounts > 0
+        buy_amounts = order_amounts
+        downsize_ratio = self.__evaluate_buy_ability(order_amounts[buy_mask])
+        if downsize_ratio < 1:
+            buy_amounts = order_amounts * downsize_ratio
+        self.portfolio.buy_array(buy_amounts, buy_mask)
 
         port_value = self.__last_day_portfolio_value
-        reservation_order_series = today_reserved_order / port_value
-        reservation_order_series.name = self.date
-        turnover_weight = reservation_order_series.abs().sum() / 2
-        self._order_weight_df = pd.concat([self._order_weight_df, reservation_order_series.to_frame().T], axis=0)
+        turnover_weight = self.__order_weight_log.record(self.date, order_amounts, ordered, port_value)
         self._turnover_weight_series.loc[self.date] = turnover_weight
+        self.online_performance.add_turnover(turnover_weight)
 
     def __reserve_order(self, amount_series: pd.Series, order_type: str):
         assert order_type in ["buy", "sell"]
@@ -314,50 +314,33 @@ class OpenCloseStrategy(BackTestBase):
                 buy_delay -= 1
             if self.__is_custom_rebalancing_period():
                 buy_delay = 0
-            date = self.get_date(delta=buy_delay)
+            position = self._get_position(delta=buy_delay)
         else:
-            date = self.get_date(delta=self.__sell_delay)
+            position = self._get_position(delta=self.__sell_delay)
 
-        if date in self.__reservation_order.keys():
-            prev_amount_series = self.__reservation_order[date]
-            self.__reservation_order[date] = prev_amount_series.add(amount_series, fill_value=0)
-        else:
-            self.__reservation_order[date] = amount_series
-
-    def __evaluate_buy_ability(self, order_series: pd.Series) -> float:
-        cash = self.portfolio.cash
-        accumulated_amount = 0
-        for ticker, amount_delta in order_series.iteritems():
-            if amount_delta > 0:
-                accumulated_amount += amount_delta
+        ticker_positions = np.array([self.portfolio.get_ticker_position(ticker) for ticker in amount_series.index],
+                                    dtype=int)
+        self.__order_queue.reserve(position, ticker_positions, amount_series.to_numpy(dtype=float))
+
+    def __evaluate_buy_ability(self, buy_amounts: np.ndarray) -> float:
+        """
+        매수 가능 비율 (현금 / 매수 주문 합계)
+        """
+        accumulated_amount = buy_amounts.sum()
         if accumulated_amount == 0:
             return 1
-        return cash / accumulated_amount
+        return self.portfolio.cash / accumulated_amount
 
     def __is_rebalancing_day(self):
-        today = self.date
-
-        if today in self.rebalancing_days:
-            return True
-        else:
-            return False
-
-    def __log_portfolio_value(self):
-        port_value = self.portfolio.get_total_portfolio_value()
-        cash = self.portfolio.cash
-
-        self.portfolio_log.loc[self.date, "port_value"] = port_value
-        self.portfolio_log.loc[self.date, "cash"] = cash
-
-        for ticker, amount in self.portfolio.security_holding.items():
-            self.portfolio_log.loc[self.date, ticker + "_amount"] = amount
+        return self._is_rebalancing_day()
 
     def __update_portfolio_value(self, price_type):
         assert price_type in ['open', 'close']
+        row_position = self._get_market_row_position()
         if price_type == 'open':
-            self.portfolio.update_holdings_value(self.date, self.__market_open_df_pct_change)
+            self.portfolio.update_holdings_value_by_position(row_position, self.__open_return_matrix)
         else:
-            self.portfolio.update_holdings_value(self.date, self.__market_intraday_pct_change)
+            self.portfolio.update_holdings_value_by_position(row_position, self.__intraday_return_matrix)
 
     def get_daily_return(self):
         return self.portfolio_log['port_value'].pct_change()
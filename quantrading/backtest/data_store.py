@@ -0,0 +1,72 @@
+from collections.abc import Mapping
+from datetime import datetime
+import pandas as pd
+
+
+def is_copy_on_write_enabled() -> bool:
+    """
+    pandas 3 부터는 항상 copy on write, 그 이전은 mode.copy_on_write 옵션을 따름
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, "copy_on_write", False) is True
+
+
+class PointInTimeSlicer:
+    """
+    정렬된 날짜 index 를 가진 DataFrame 을 searchsorted 로 위치 slicing
+    copy on write 환경에서는 복사 없이 원본의 view 를 반환 (수정하면 그때 복사되므로 원본은 안전)
+    copy on write 가 꺼진 pandas 에서는 원본 보호를 위해 복사본 반환
+    index 가 정렬되지 않은 경우 boolean mask 로 slicing
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        index = df.index
+        self.__is_sorted = isinstance(index, pd.DatetimeIndex) and index.is_monotonic_increasing
+        self.__copy_slice = not is_copy_on_write_enabled()
+
+    def get(self, date: datetime, exclude_today_data=True) -> pd.DataFrame:
+        df = self.df
+        if len(df) == 0:
+            return df
+        if self.__is_sorted:
+            side = 'left' if exclude_today_data else 'right'
+            end_position = df.index.searchsorted(date, side=side)
+            if self.__copy_slice:
+                return df.iloc[:end_position].copy()
+            return df.iloc[:end_position]
+
+        if exclude_today_data:
+            return df.loc[df.index < date]
+        else:
+            return df.loc[df.index <= date]
+
+
+class PointInTimeDataStore(Mapping):
+    """
+    date 시점까지의 데이터 묶음
+    처음 접근하는 key 의 데이터만 slicing 하여 보관
+    """
+
+    def __init__(self, slicer_dict: dict, date: datetime, exclude_today_data=True):
+        self.__slicer_dict = slicer_dict
+        self.__date = date
+        self.__exclude_today_data = exclude_today_data
+        self.__data = {}
+
+    def __getitem__(self, key) -> pd.DataFrame:
+        data = self.__data.get(key)
+        if data is None:
+            data = self.__slicer_dict[key].get(self.__date, self.__exclude_today_data)
+            self.__data[key] = data
+        return data
+
+    def __iter__(self):
+        return iter(self.__slicer_dict)
+
+    def __len__(self):
+        return len(self.__slicer_dict)
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self}
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from .. import performance_utils
+from .trading_day import TradingDay
+from .utils import divide_panel_by_quantiles
+
+
+def get_rebalancing_forward_returns(price_df: pd.DataFrame, rebalancing_days: list) -> pd.DataFrame:
+    """
+    리밸런싱일 종가 매수 -> 다음 리밸런싱일 종가 매도 수익률 (index: 매수일)
+    매도일 가격이 없으면 직전 가격 사용, 매수일 가격이 없는 종목과 마지막 리밸런싱일은 NaN
+    """
+    rebalancing_days = pd.DatetimeIndex(pd.to_datetime(list(rebalancing_days)))
+    price_df = price_df.sort_index()
+    entry_price_array = price_df.reindex(rebalancing_days).to_numpy(dtype=float)
+    exit_price_array = price_df.ffill().reindex(rebalancing_days).to_numpy(dtype=float)
+
+    forward_return_array = np.full(entry_price_array.shape, np.nan)
+    forward_return_array[:-1] = exit_price_array[1:] / entry_price_array[:-1] - 1
+    return pd.DataFrame(forward_return_array, index=rebalancing_days, columns=price_df.columns)
+
+
+def get_bucket_mean_array(value_array: np.ndarray, code_array: np.ndarray, bucket_counts: int) -> np.ndarray:
+    """
+    row 별 구간 번호(code) 가 같은 값들의 평균 (rows, bucket_counts), 구간에 값이 없으면 NaN
+    """
+    rows = np.broadcast_to(np.arange(len(code_array))[:, np.newaxis], code_array.shape)
+    is_valid = (code_array >= 0) & ~np.isnan(value_array)
+    flat_index = rows[is_valid] * bucket_counts + code_array[is_valid]
+
+    size = len(code_array) * bucket_counts
+    bucket_sum = np.bincount(flat_index, weights=value_array[is_valid], minlength=size)
+    bucket_counts_array = np.bincount(flat_index, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bucket_mean = bucket_sum / bucket_counts_array
+    return bucket_mean.reshape(len(code_array), bucket_counts)
+
+
+def calc_row_correlation_array(x_array: np.ndarray, y_array: np.ndarray) -> np.ndarray:
+    """
+    row 별 pearson 상관계수, 두 값 모두 있는 column 만 사용 (2개 미만이면 NaN)
+    """
+    is_valid = ~np.isnan(x_array) & ~np.isnan(y_array)
+    counts = is_valid.sum(axis=1)
+    x_array = np.where(is_valid, x_array, 0)
+    y_array = np.where(is_valid, y_array, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_demeaned = np.where(is_valid, x_array - x_array.sum(axis=1, keepdims=True) / counts[:, np.newaxis], 0)
+        y_demeaned = np.where(is_valid, y_array - y_array.sum(axis=1, keepdims=True) / counts[:, np.newaxis], 0)
+        correlation = (x_demeaned * y_demeaned).sum(axis=1) / np.sqrt(
+            (x_demeaned ** 2).sum(axis=1) * (y_demeaned ** 2).sum(axis=1))
+    correlation[counts < 2] = np.nan
+    return correlation
+
+
+def get_quantile_turnover_array(code_array: np.ndarray, bucket_counts: int) -> np.ndarray:
+    """
+    구간별 동일가중 목표 비중 기준 회전율 (매 리밸런싱일, 비중 변화 절대값 합 / 2)
+    첫 리밸런싱일은 현금에서 매수하므로 0.5
+    """
+    turnover_array = np.full((len(code_array), bucket_counts), np.nan)
+    for bucket in range(bucket_counts):
+        is_member = code_array == bucket
+        weight_array = is_member / np.maximum(is_member.sum(axis=1, keepdims=True), 1)
+        weight_delta = np.diff(weight_array, axis=0, prepend=0)
+        turnover_array[:, bucket] = np.abs(weight_delta).sum(axis=1) / 2
+    return turnover_array
+
+
+def evaluate_factor_quantiles(score_df: pd.DataFrame, price_df: pd.DataFrame, quantiles=5, ascending=False,
+                              rebalancing_days=None, start_date=None, end_date=None,
+                              rebalancing_periodic="monthly", rebalancing_moment="first") -> dict:
+    """
+    factor score 구간별 동일가중 포트폴리오 성과를 이벤트 루프 없이 한 번에 계산
+    리밸런싱일마다 그 날까지의 마지막 score 로 구간을 나누고 (divide_panel_by_quantiles, 0 번이 상위 구간),
+    리밸런싱일 종가에 매수해 다음 리밸런싱일 종가까지 보유. 매수일 가격이 없는 종목은 제외.
+    rebalancing_days 미지정시 price_df 거래일로 TradingDay.get_rebalancing_days 사용
+
+    return:
+        forward_returns: 매수일 x ticker 다음 리밸런싱일까지 수익률
+        quantile_codes: 매수일 x ticker 구간 번호 (-1 은 제외)
+        quantile_returns: 매수일 x 구간 수익률, long_short 는 0 번 - 마지막 구간
+        quantile_value: 리밸런싱일 x 구간 value (첫 리밸런싱일 100)
+        ic: 매수일별 score 와 다음 수익률의 상관계수 (IC), 순위 상관계수 (rank_IC)
+        turnover: 매수일 x 구간 회전율
+        summary: 구간별 누적수익률, CAGR, 평균 회전율 / IC 평균, 표준편차, IR
+    """
+    if rebalancing_days is None:
+        trading_day = TradingDay(price_df.index.to_series().reset_index(drop=True))
+        start_date = price_df.index[0] if start_date is None else start_date
+        end_date = price_df.index[-1] if end_date is None else end_date
+        rebalancing_days = trading_day.get_rebalancing_days(start_date, end_date, rebalancing_periodic,
+                                                            rebalancing_moment)
+
+    forward_return_df = get_rebalancing_forward_returns(price_df, rebalancing_days)
+    rebalancing_index = forward_return_df.index
+    tickers = forward_return_df.columns
+
+    score_df = score_df.sort_index().reindex(columns=tickers)
+    rebalancing_score_df = score_df.reindex(rebalancing_index, method='ffill')
+    entry_price_df = price_df.sort_index().reindex(rebalancing_index)
+    rebalancing_score_df = rebalancing_score_df.where(entry_price_df.notna())
+    # 마지막 리밸런싱일은 보유 기간이 없으므로 구간을 나누지 않음
+    rebalancing_score_df.iloc[-1] = np.nan
+
+    code_df = divide_panel_by_quantiles(rebalancing_score_df, quantiles, ascending)
+    code_array = code_df.to_numpy()
+    forward_return_array = forward_return_df.to_numpy()
+
+    quantile_return_array = get_bucket_mean_array(forward_return_array, code_array, quantiles)[:-1]
+    quantile_return_df = pd.DataFrame(quantile_return_array, index=rebalancing_index[:-1], columns=range(quantiles))
+    quantile_return_df["long_short"] = quantile_return_df[0] - quantile_return_df[quantiles - 1]
+
+    quantile_value_array = np.ones((len(rebalancing_index), quantiles + 1))
+    quantile_value_array[1:] = np.cumprod(1 + quantile_return_df.fillna(0).to_numpy(), axis=0)
+    quantile_value_df = pd.DataFrame(quantile_value_array * 100, index=rebalancing_index,
+                                     columns=quantile_return_df.columns)
+
+    # IC 는 구간에 속하지 않은 나머지 종목도 포함
+    score_array = rebalancing_score_df.to_numpy(dtype=float)[:-1]
+    forward_return_array = forward_return_array[:-1]
+    score_rank_df = pd.DataFrame(np.where(np.isnan(forward_return_array), np.nan, score_array)).rank(axis=1)
+    return_rank_df = pd.DataFrame(np.where(np.isnan(score_array), np.nan, forward_return_array)).rank(axis=1)
+    ic_df = pd.DataFrame({
+        "IC": calc_row_correlation_array(score_array, forward_return_array),
+        "rank_IC": calc_row_correlation_array(score_rank_df.to_numpy(), return_rank_df.to_numpy()),
+    }, index=rebalancing_index[:-1])
+
+    turnover_df = pd.DataFrame(get_quantile_turnover_array(code_array[:-1], quantiles),
+                               index=rebalancing_index[:-1], columns=range(quantiles))
+
+    final_returns = quantile_value_df.iloc[-1] / 100 - 1
+    cagr = final_returns.apply(lambda returns: performance_utils.get_annualized_returns(
+        rebalancing_index[0], rebalancing_index[-1], returns))
+    quantile_summary = pd.DataFrame({
+        "누적수익률": final_returns,
+        "CAGR": cagr,
+        "평균회전율": turnover_df.iloc[1:].mean().reindex(quantile_value_df.columns),
+    })
+    ic_summary = pd.DataFrame({
+        "평균": ic_df.mean(),
+        "표준편차": ic_df.std(),
+        "IR": ic_df.mean() / ic_df.std(),
+    })
+
+    return {
+        "forward_returns": forward_return_df,
+        "quantile_codes": code_df,
+        "quantile_returns": quantile_return_df,
+        "quantile_value": quantile_value_df,
+        "ic": ic_df,
+        "turnover": turnover_df,
+        "summary": {
+            "quantile": quantile_summary,
+            "ic": ic_summary,
+        },
+    }
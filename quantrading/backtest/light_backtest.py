@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 from .trading_day import TradingDay
-from .utils import get_dynamic_weight_rebalancing_port_daily_value_df
-from .simulation_result_utils import calc_performance_from_value_history
+from .utils import get_rebalancing_segment_ids, calc_sparse_rebalancing_port_value_array
+from .simulation_result_utils import calc_performance_from_value_history, save_simulation_result_to_binary
 
 
 class LightStrategy:
@@ -17,6 +18,7 @@ class LightStrategy:
         self.daily_return_df = self.daily_return_df.loc[self.daily_return_df.index >= self.start_date]
 
         self.tickers = self.daily_return_df.columns.to_list()
+        self.__ticker_position = {ticker: i for i, ticker in enumerate(self.tickers)}
 
         # set trading days & rebalancing days
         trading_day = TradingDay(self.daily_price_df.index.to_series().reset_index(drop=True))
@@ -26,10 +28,16 @@ class LightStrategy:
         self.rebalancing_days = trading_day.get_rebalancing_days(self.start_date, self.end_date,
                                                                  self.rebalancing_periodic,
                                                                  self.rebalancing_moment)
+        self.__trading_day_set = set(self.trading_days)
+        self.__rebalancing_day_set = set(self.rebalancing_days)
         self.initial_order = False
-        self.weight_dict_list = []
         self.result = None
 
+        # 주문 비중 (주문 수 x ticker 수), CSR 형태로 row 별 column 위치와 비중만 저장
+        self.order_date_list = []
+        self.__order_columns = []
+        self.__order_weights = []
+
     def initialize(self):
         """
         상속하여 초기 포트 비중 설정시, self.initial_order = True 로 설정해줘야함.
@@ -47,67 +55,73 @@ class LightStrategy:
         self.on_end_of_algorithm()
 
     def reserve_order(self, allocation: dict):
-        allocation['date'] = self.date
-        self.weight_dict_list.append(allocation)
+        """
+        allocation: {ticker: 비중}, daily_price_df 의 column 에 있는 ticker 만 가능
+        """
+        columns = np.fromiter((self.__ticker_position[ticker] for ticker in allocation), dtype=np.intp,
+                              count=len(allocation))
+        weights = np.fromiter(allocation.values(), dtype=float, count=len(allocation))
+        self.order_date_list.append(self.date)
+        self.__order_columns.append(columns)
+        self.__order_weights.append(np.nan_to_num(weights, nan=0.0))
+
+    @property
+    def weight_dict_list(self) -> list:
+        """
+        주문별 {ticker: 비중, 'date': 주문일} list (읽기 전용, 저장된 주문으로 매번 새로 생성)
+        비중의 NaN 은 0 으로 저장되어 있음
+        """
+        weight_dict_list = []
+        for date, columns, weights in zip(self.order_date_list, self.__order_columns, self.__order_weights):
+            weight_dict = {self.tickers[column]: weight for column, weight in zip(columns, weights.tolist())}
+            weight_dict['date'] = date
+            weight_dict_list.append(weight_dict)
+        return weight_dict_list
+
+    def get_weight_matrix(self) -> np.ndarray:
+        """
+        (주문 수, ticker 수) dense 비중 행렬, column 순서는 self.tickers
+        """
+        weight_matrix = np.zeros((len(self.order_date_list), len(self.tickers)))
+        for row, (columns, weights) in enumerate(zip(self.__order_columns, self.__order_weights)):
+            weight_matrix[row, columns] = weights
+        return weight_matrix
 
     def is_trading_day(self):
-        today = self.date
-        if today in self.trading_days:
-            return True
-        else:
-            return False
+        return self.date in self.__trading_day_set
 
     def is_rebalancing_day(self):
-        today = self.date
-        if today in self.rebalancing_days:
-            return True
-        else:
-            return False
+        return self.date in self.__rebalancing_day_set
 
     def on_end_of_algorithm(self):
-        weight_dict_list = self.weight_dict_list
         daily_return_df = self.daily_return_df
+        order_rows = list(zip(self.__order_columns, self.__order_weights))
+        order_date_list = self.order_date_list
 
         if self.trading_days[0] in self.rebalancing_days:
             rebalacing_date_list = self.rebalancing_days[1:]
             if self.initial_order:
-                weight_dict_list = weight_dict_list[1:]
+                order_rows = order_rows[1:]
+                order_date_list = order_date_list[1:]
         else:
             rebalacing_date_list = self.rebalancing_days
+        if len(order_rows) != len(rebalacing_date_list) + 1:
+            raise ValueError(f"주문 수({len(order_rows)})가 리밸런싱 구간 수({len(rebalacing_date_list) + 1})와 다릅니다.")
 
-        ticker_set = set()
-        for weight_dict in weight_dict_list:
-            tickers = list(weight_dict.keys())
-            ticker_set = ticker_set.union(set(tickers))
-        ticker_set.remove('date')
-
-        traded_tickers = list(ticker_set)
-
-        daily_return_df = daily_return_df.loc[:, traded_tickers]
-
-        empty_weight_series = pd.Series(0, index=traded_tickers)
-        weight_series_list = []
-        for weight_dict in weight_dict_list:
-            date = weight_dict.pop('date')
-            weight_series = empty_weight_series.add(pd.Series(weight_dict)).fillna(0)
-            weight_series.name = date
-            weight_series_list.append(weight_series)
-
-        port_value_df = get_dynamic_weight_rebalancing_port_daily_value_df(
-            weight_series_list,
-            daily_return_df,
-            rebalacing_date_list
-        )
-        port_value_series = port_value_df.sum(axis=1)
-        port_value_series = port_value_series * 100
-        port_value_series.name = self.name
+        segment_ids = get_rebalancing_segment_ids(daily_return_df.index, rebalacing_date_list)
+        port_value_array = calc_sparse_rebalancing_port_value_array(daily_return_df.to_numpy(dtype=float),
+                                                                    order_rows, segment_ids)
+        port_value_series = pd.Series(port_value_array * 100, index=daily_return_df.index, name=self.name)
 
         result = dict()
         performance = calc_performance_from_value_history(port_value_series)
         performance['port_value'] = port_value_series
         result['performance'] = performance
 
-        weight_df = pd.DataFrame(weight_series_list)
+        weight_matrix = self.get_weight_matrix()[len(self.order_date_list) - len(order_date_list):]
+        ordered_columns = np.unique(np.concatenate([columns for columns, _ in order_rows]))
+        weight_df = pd.DataFrame(weight_matrix[:, ordered_columns], index=order_date_list,
+                                 columns=[self.tickers[i] for i in ordered_columns])
         result['rebalacing_history'] = weight_df
         self.result = result
 
@@ -127,4 +141,9 @@ class LightStrategy:
             rebalacing_history.to_excel(writer, sheet_name="리밸런싱 비중")
             monthly_returns.to_excel(writer, sheet_name="월별수익률")
             annual_summary.to_excel(writer, sheet_name="연도별 요약")
+            drawdown_episodes = performance.get("drawdown_episodes")
+            if drawdown_episodes is not None and len(drawdown_episodes) > 0:
+                drawdown_episodes.to_excel(writer, sheet_name="drawdown")
 
+    def result_value_to_binary(self, path):
+        save_simulation_result_to_binary(self.result, path)
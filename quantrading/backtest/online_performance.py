@@ -0,0 +1,162 @@
+import math
+import numpy as np
+import pandas as pd
+from .. import performance_utils
+
+
+class OnlinePerformance:
+    """
+    거래일마다 O(1) 로 갱신하는 성과 지표
+    value 는 base_value(100) 기준, 첫 value 의 수익률은 없음 (pct_change 와 동일)
+    종료 시점 요약은 calc_performance_from_value_history 의 performance_summary 와 같음
+    """
+
+    def __init__(self, base_value=100):
+        self.base_value = base_value
+        self.date = None
+        self.value = np.nan
+        self.start_date = None
+        self.end_date = None
+
+        # 일간 수익률 평균, 분산 (Welford)
+        self.count = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+
+        self.peak = np.nan
+        self.drawdown = 0.0
+        self.mdd = 0.0
+        self.turnover = 0.0
+
+        # 진행 중인 월, 연도 구간 (key, 누적 (1 + 수익률), 연도는 수익률 개수, 평균, 분산 합 포함)
+        self.__month_bucket = None
+        self.__year_bucket = None
+        self.__monthly_returns = []
+        self.__yearly_summary = []
+
+    def update(self, date, value: float):
+        previous_value = self.value
+        self.date = date
+        self.value = value
+
+        daily_returns = value / previous_value - 1
+        if math.isnan(daily_returns):
+            growth = 1.0
+        else:
+            growth = 1 + daily_returns
+            if self.start_date is None:
+                self.start_date = date
+            self.end_date = date
+            self.count += 1
+            delta = daily_returns - self.__mean
+            self.__mean += delta / self.count
+            self.__m2 += delta * (daily_returns - self.__mean)
+
+        if not value < self.peak:
+            self.peak = value
+        if self.peak > 0:
+            self.drawdown = value / self.peak - 1
+            self.mdd = min(self.mdd, self.drawdown)
+
+        self.__update_buckets(date, growth, daily_returns)
+
+    def __update_buckets(self, date, growth: float, daily_returns: float):
+        month_key = (date.year, date.month)
+        month_bucket = self.__month_bucket
+        if month_bucket is None or month_bucket[0] != month_key:
+            if month_bucket is not None:
+                self.__monthly_returns.append((month_bucket[0], month_bucket[1] - 1))
+            month_bucket = self.__month_bucket = [month_key, 1.0]
+        month_bucket[1] *= growth
+
+        year_bucket = self.__year_bucket
+        if year_bucket is None or year_bucket[0] != date.year:
+            if year_bucket is not None:
+                self.__yearly_summary.append(self.__close_year_bucket(year_bucket))
+            year_bucket = self.__year_bucket = [date.year, 1.0, 0, 0.0, 0.0]
+        year_bucket[1] *= growth
+        if not math.isnan(daily_returns):
+            year_bucket[2] += 1
+            delta = daily_returns - year_bucket[3]
+            year_bucket[3] += delta / year_bucket[2]
+            year_bucket[4] += delta * (daily_returns - year_bucket[3])
+
+    @staticmethod
+    def __close_year_bucket(year_bucket: list) -> tuple:
+        year, growth, count, _, m2 = year_bucket
+        std = math.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+        return year, growth - 1, performance_utils.get_annualized_std(std, "daily")
+
+    def add_turnover(self, turnover_weight: float):
+        self.turnover += turnover_weight
+
+    @property
+    def cumulative_returns(self) -> float:
+        return self.value / self.base_value - 1
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return np.nan
+        return math.sqrt(self.__m2 / (self.count - 1))
+
+    @property
+    def annual_std(self) -> float:
+        return performance_utils.get_annualized_std(self.std, "daily")
+
+    @property
+    def cagr(self) -> float:
+        if self.start_date is None:
+            return np.nan
+        return performance_utils.get_annualized_returns(self.start_date, self.end_date, self.cumulative_returns)
+
+    @property
+    def month_returns(self) -> float:
+        """
+        진행 중인 월의 수익률
+        """
+        return np.nan if self.__month_bucket is None else self.__month_bucket[1] - 1
+
+    @property
+    def year_returns(self) -> float:
+        """
+        진행 중인 연도의 수익률
+        """
+        return np.nan if self.__year_bucket is None else self.__year_bucket[1] - 1
+
+    def get_performance_summary(self) -> pd.Series:
+        cagr = self.cagr
+        annual_std = self.annual_std
+
+        performance_summary = pd.Series(dtype=object)
+        performance_summary.loc["시작일"] = self.start_date
+        performance_summary.loc["종료일"] = self.end_date
+        performance_summary.loc["누적수익률"] = self.cumulative_returns
+        performance_summary.loc["CAGR"] = cagr
+        performance_summary.loc["Ann.Std"] = annual_std
+        performance_summary.loc["MDD"] = self.mdd
+        performance_summary.loc["샤프지수"] = cagr / annual_std
+        return performance_summary
+
+    def get_monthly_returns(self) -> pd.Series:
+        """
+        (연도, 월) index 의 월별 수익률, 진행 중인 월 포함
+        """
+        monthly_returns = list(self.__monthly_returns)
+        if self.__month_bucket is not None:
+            monthly_returns.append((self.__month_bucket[0], self.__month_bucket[1] - 1))
+        if len(monthly_returns) == 0:
+            return pd.Series(dtype=float)
+        keys, values = zip(*monthly_returns)
+        return pd.Series(values, index=pd.MultiIndex.from_tuples(keys))
+
+    def get_annual_summary(self) -> pd.DataFrame:
+        """
+        연도별 수익률, 변동성, 진행 중인 연도 포함
+        """
+        yearly_summary = list(self.__yearly_summary)
+        if self.__year_bucket is not None:
+            yearly_summary.append(self.__close_year_bucket(self.__year_bucket))
+        annual_summary = pd.DataFrame([row[1:] for row in yearly_summary], columns=["수익률", "변동성"],
+                                      index=[row[0] for row in yearly_summary])
+        return annual_summary
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+def pad_array(array: np.ndarray, size: int, fill_value=0) -> np.ndarray:
+    """
+    ticker 가 추가되어 ticker index 가 길어진 경우 뒤를 fill_value 로 채움
+    """
+    if len(array) >= size:
+        return array
+    return np.pad(array, (0, size - len(array)), constant_values=fill_value)
+
+
+class OrderQueue:
+    """
+    거래일 위치(position) 별 예약 주문
+    주문 amount 는 ticker index (Portfolio.tickers) 위의 dense vector 로 보관하고, 같은 거래일의 주문은 합산
+    -inf 는 전량 매도 주문
+    """
+
+    def __init__(self, tickers: list):
+        # Portfolio.tickers 와 같은 list 를 공유 (ticker 가 추가되면 vector 길이도 늘어남)
+        self.tickers = tickers
+        self.__orders = {}
+
+    def __contains__(self, position: int) -> bool:
+        return position in self.__orders
+
+    def __len__(self):
+        return len(self.__orders)
+
+    def reserve(self, position: int, ticker_positions: np.ndarray, amounts: np.ndarray):
+        """
+        ticker_positions: 주문 ticker 의 ticker index 위치 (중복 없음)
+        amounts: 주문 amount (매수 > 0, 매도 < 0, 전량 매도 -inf)
+        주문이 비어 있어도 해당 거래일에 주문이 있는 것으로 기록
+        """
+        size = len(self.tickers)
+        order = self.__orders.get(position)
+        if order is None:
+            order_amounts = np.zeros(size)
+            ordered = np.zeros(size, dtype=bool)
+        else:
+            order_amounts = pad_array(order[0], size)
+            ordered = pad_array(order[1], size, False)
+
+        order_amounts[ticker_positions] += amounts
+        ordered[ticker_positions] = True
+        self.__orders[position] = (order_amounts, ordered)
+
+    def pop(self, position: int) -> tuple:
+        """
+        return: (주문 amount, 주문 여부) ticker index 길이의 array
+        """
+        order_amounts, ordered = self.__orders.pop(position)
+        size = len(self.tickers)
+        return pad_array(order_amounts, size), pad_array(ordered, size, False)
+
+
+class OrderWeightLog:
+    """
+    체결일별 주문 비중 기록, 주문하지 않은 ticker 는 NaN
+    """
+
+    def __init__(self, tickers: list):
+        self.tickers = tickers
+        self.__date_list = []
+        self.__weight_list = []
+
+    def __len__(self):
+        return len(self.__date_list)
+
+    def record(self, date, order_amounts: np.ndarray, ordered: np.ndarray, port_value: float) -> float:
+        """
+        return: 회전율 (주문 비중 절대값 합 / 2)
+        """
+        order_weights = np.where(ordered, order_amounts / port_value, np.nan)
+        self.__date_list.append(date)
+        self.__weight_list.append(order_weights)
+        return np.abs(order_weights[ordered]).sum() / 2
+
+    def to_frame(self) -> pd.DataFrame:
+        if len(self.__date_list) == 0:
+            return pd.DataFrame()
+
+        size = len(self.tickers)
+        data = np.full((len(self.__date_list), size), np.nan)
+        for i, order_weights in enumerate(self.__weight_list):
+            data[i, :len(order_weights)] = order_weights
+
+        ordered_columns = np.flatnonzero(~np.isnan(data).all(axis=0))
+        return pd.DataFrame(data[:, ordered_columns], index=self.__date_list,
+                            columns=[self.tickers[i] for i in ordered_columns])
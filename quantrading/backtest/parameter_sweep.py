@@ -0,0 +1,170 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from .simulation_result_utils import calc_performance_from_value_history, get_value_history
+
+# worker 프로세스에서 attach 한 market data, shared memory 가 닫히지 않도록 SharedDataFrame 도 보관 (worker 초기화마다 비움)
+_worker_market_data = {}
+_worker_shared_df_list = []
+
+
+class SharedDataFrame:
+    """
+    DataFrame 값을 shared memory 에 올리고, worker 에는 이름과 index, columns 만 pickle 하여 전달
+    값이 단일 숫자 dtype 이 아닌 DataFrame 은 그대로 pickle
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.index = df.index
+        self.columns = df.columns
+        self.__df = None
+        self.__shared_memory = None
+
+        values = df.to_numpy()
+        if values.dtype.kind not in 'biuf' or values.nbytes == 0:
+            self.__df = df
+            self.name = None
+            return
+
+        self.dtype = values.dtype
+        self.shape = values.shape
+        self.__shared_memory = shared_memory.SharedMemory(create=True, size=values.nbytes)
+        self.name = self.__shared_memory.name
+        np.ndarray(self.shape, dtype=self.dtype, buffer=self.__shared_memory.buf)[:] = values
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_SharedDataFrame__shared_memory'] = None
+        return state
+
+    def attach(self) -> pd.DataFrame:
+        """
+        shared memory 를 복사 없이 DataFrame 으로 감싸서 반환 (수정 금지)
+        """
+        if self.name is None:
+            return self.__df
+
+        if self.__shared_memory is None:
+            self.__shared_memory = attach_shared_memory(self.name)
+        values = np.ndarray(self.shape, dtype=self.dtype, buffer=self.__shared_memory.buf)
+        values.flags.writeable = False
+        return pd.DataFrame(values, index=self.index, columns=self.columns, copy=False)
+
+    def release(self):
+        if self.__shared_memory is not None:
+            self.__shared_memory.close()
+            self.__shared_memory.unlink()
+            self.__shared_memory = None
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    생성한 프로세스가 unlink 하므로, attach 하는 쪽은 추적하지 않음
+    (python 3.13 미만은 pool worker 가 생성 프로세스의 resource tracker 를 공유하므로 중복 등록되지 않음)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def generate_parameter_grid(param_grid) -> list:
+    """
+    {"a": [1, 2], "b": [3]} -> [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+    list of dict 는 그대로 사용
+    """
+    if isinstance(param_grid, dict):
+        keys = list(param_grid.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+    return [dict(params) for params in param_grid]
+
+
+def run_sweep_case(strategy_class, kwargs: dict, return_result=False) -> tuple:
+    strategy = strategy_class(**kwargs)
+    strategy.run()
+
+    value_history = get_value_history(strategy)
+    performance_summary = calc_performance_from_value_history(value_history)['performance_summary']
+
+    if return_result:
+        result = strategy.result if isinstance(getattr(strategy, 'result', None), dict) else strategy.get_result()
+    else:
+        result = None
+    return performance_summary, result
+
+
+def _init_worker(shared_market_data: dict):
+    _worker_market_data.clear()
+    _worker_shared_df_list.clear()
+    for key, shared_df in shared_market_data.items():
+        _worker_market_data[key] = shared_df.attach()
+        _worker_shared_df_list.append(shared_df)
+
+
+def _run_worker_case(strategy_class, kwargs: dict, return_result: bool) -> tuple:
+    kwargs = {**kwargs, **_worker_market_data}
+    return run_sweep_case(strategy_class, kwargs, return_result)
+
+
+def iter_parameter_sweep(strategy_class, param_grid, market_data: dict, base_kwargs=None, max_workers=None,
+                         return_result=False, mp_context=None):
+    """
+    parameter 조합별로 전략을 process pool 에서 실행, 끝나는 순서대로 반환
+    market_data: {"market_close_df": df, ...} 전략 kwargs 로 전달될 DataFrame, shared memory 로 공유
+    yield: (case_index, params, performance_summary, result or None)
+    """
+    base_kwargs = {} if base_kwargs is None else base_kwargs
+    params_list = generate_parameter_grid(param_grid)
+
+    if max_workers == 1:
+        for case_index, params in enumerate(params_list):
+            kwargs = {**base_kwargs, **params, **market_data}
+            yield (case_index, params, *run_sweep_case(strategy_class, kwargs, return_result))
+        return
+
+    shared_market_data = {}
+    try:
+        for key, df in market_data.items():
+            shared_market_data[key] = SharedDataFrame(df)
+
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, initializer=_init_worker,
+                                       initargs=(shared_market_data,))
+        is_completed = False
+        try:
+            future_to_case = {}
+            for case_index, params in enumerate(params_list):
+                future = executor.submit(_run_worker_case, strategy_class, {**base_kwargs, **params}, return_result)
+                future_to_case[future] = (case_index, params)
+
+            for future in as_completed(future_to_case):
+                case_index, params = future_to_case[future]
+                yield (case_index, params, *future.result())
+            is_completed = True
+        finally:
+            # 중간에 반복을 멈추면 대기 중인 case 는 취소하고 실행 중인 case 를 기다리지 않음
+            executor.shutdown(wait=is_completed, cancel_futures=not is_completed)
+    finally:
+        for shared_df in shared_market_data.values():
+            shared_df.release()
+
+
+def run_parameter_sweep(strategy_class, param_grid, market_data: dict, base_kwargs=None, max_workers=None,
+                        return_result=False, mp_context=None):
+    """
+    return: parameter 와 performance summary 를 column 으로 가진 DataFrame (case 순서)
+            return_result=True 이면 (DataFrame, case 순서의 result list)
+    """
+    summary_dict = {}
+    result_dict = {}
+    for case_index, params, performance_summary, result in iter_parameter_sweep(
+            strategy_class, param_grid, market_data, base_kwargs, max_workers, return_result, mp_context):
+        summary_dict[case_index] = pd.concat([pd.Series(params, dtype=object), performance_summary])
+        result_dict[case_index] = result
+
+    case_index_list = sorted(summary_dict.keys())
+    summary_df = pd.DataFrame([summary_dict[i] for i in case_index_list], index=case_index_list)
+    if return_result:
+        return summary_df, [result_dict[i] for i in case_index_list]
+    return summary_df
@@ -19,38 +19,174 @@ def convert_weight_delta(weight_delta_series: pd.Series) -> float:
 
 
 class Portfolio:
+    """
+    보유 자산 amount 를 고정된 ticker index 위의 numpy array 로 관리
+    tickers 미지정시 market_close_df 의 column 을 ticker index 로 사용
+    index 에 없는 ticker 를 매수하면 index 뒤에 추가됨.
+    """
+
     def __init__(self, **kwargs):
         self.cash = kwargs.get("portfolio_seed_value", 100)
         self.transaction_fee = kwargs.get("portfolio_transaction_fee", 0)   # 0%
-        self.security_holding = kwargs.get("SECURITY_HOLDING", {})
+
+        tickers = kwargs.get("tickers")
+        if tickers is None:
+            market_close_df = kwargs.get("market_close_df")
+            tickers = [] if market_close_df is None else market_close_df.columns
+        self.tickers = list(tickers)
+        self.__ticker_position = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.__amounts = np.zeros(len(self.tickers))
+        self.__held = np.zeros(len(self.tickers), dtype=bool)
+
+        for ticker, amount in kwargs.get("SECURITY_HOLDING", {}).items():
+            position = self.get_ticker_position(ticker)
+            self.__amounts[position] = amount
+            self.__held[position] = True
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """
+        ticker index 순서의 보유 amount (읽기 전용)
+        """
+        amounts = self.__amounts.view()
+        amounts.flags.writeable = False
+        return amounts
+
+    @property
+    def held(self) -> np.ndarray:
+        held = self.__held.view()
+        held.flags.writeable = False
+        return held
+
+    @property
+    def security_holding(self) -> dict:
+        positions = np.flatnonzero(self.__held)
+        return {self.tickers[i]: self.__amounts[i] for i in positions}
+
+    def get_ticker_position(self, ticker) -> int:
+        position = self.__ticker_position.get(ticker)
+        if position is None:
+            position = len(self.tickers)
+            self.tickers.append(ticker)
+            self.__ticker_position[ticker] = position
+            self.__amounts = np.append(self.__amounts, 0.0)
+            self.__held = np.append(self.__held, False)
+        return position
+
+    def get_return_matrix(self, market_df_pct_change: pd.DataFrame) -> np.ndarray:
+        """
+        수익률 DataFrame 을 ticker index 순서의 2차원 array 로 변환 (결측은 0)
+        row 위치는 market_df_pct_change 의 row 위치와 동일
+        """
+        return_matrix = market_df_pct_change.reindex(columns=self.tickers).to_numpy(dtype=float, copy=True)
+        return np.nan_to_num(return_matrix, nan=0.0, copy=False)
 
     def buy(self, ticker, amount):
+        position = self.get_ticker_position(ticker)
         amount_after_fee = amount * (1 - self.transaction_fee)
-        new_amount = self.security_holding.get(ticker, 0) + amount_after_fee
-        self.security_holding[ticker] = new_amount
+        self.__amounts[position] += amount_after_fee
+        self.__held[position] = True
         self.cash -= amount
 
     def sell(self, ticker, amount):
-        prev_amount = self.security_holding.get(ticker, 0)
-        self.security_holding[ticker] = prev_amount - amount
+        position = self.get_ticker_position(ticker)
+        self.__amounts[position] -= amount
+        self.__held[position] = True
         amount_after_fee = amount * (1 - self.transaction_fee)
         self.cash += amount_after_fee
 
-        if self.security_holding[ticker] == 0:
-            del self.security_holding[ticker]
+        if self.__amounts[position] == 0:
+            self.__held[position] = False
+
+    def sell_array(self, amounts: np.ndarray, mask: np.ndarray):
+        """
+        ticker index 순서의 amount 중 mask 위치를 한 번에 매도
+        """
+        self.__amounts[mask] -= amounts[mask]
+        self.__held[mask] = self.__amounts[mask] != 0
+        self.cash += amounts[mask].sum() * (1 - self.transaction_fee)
+
+    def buy_array(self, amounts: np.ndarray, mask: np.ndarray):
+        """
+        ticker index 순서의 amount 중 mask 위치를 한 번에 매수
+        """
+        self.__amounts[mask] += amounts[mask] * (1 - self.transaction_fee)
+        self.__held[mask] = True
+        self.cash -= amounts[mask].sum()
 
     def get_allocations(self) -> pd.Series:
-        allocations = pd.Series(self.security_holding)
+        allocations = pd.Series(self.security_holding, dtype=float)
         allocations.loc["cash"] = self.cash
         allocations = allocations / allocations.sum()
         return allocations
 
     def set_allocations(self, new_allocations: pd.Series):
-        allocations_delta_df = self.get_allocations_delta(new_allocations)
-        for ticker, weight in allocations_delta_df["next"].items():
-            if ticker == "cash":
-                continue
-            self.set_weight(ticker, weight)
+        """
+        new_allocations 비중으로 리밸런싱 ('cash' 는 남는 금액)
+        """
+        new_allocations = new_allocations.drop("cash", errors="ignore").fillna(0)
+        new_allocations = new_allocations[new_allocations != 0]
+        positions = [self.get_ticker_position(ticker) for ticker in new_allocations.index]
+
+        target_weights = np.zeros(len(self.tickers))
+        target_weights[positions] = new_allocations.to_numpy(dtype=float)
+        self.rebalance(target_weights)
+
+    def rebalance(self, target_weights: np.ndarray):
+        """
+        ticker index 순서의 목표 비중으로 한 번에 리밸런싱
+        ticker 마다 set_weight 를 weight_delta 오름차순(매도 먼저)으로 호출하는 것과 같은 결과
+        각 거래는 그 직전 거래들의 수수료가 빠진 평가금액 기준
+        목표 비중이 0 인 ticker 는 전량 매도
+        """
+        amounts = self.__amounts
+        port_value = self.get_total_portfolio_value()
+        weight_delta = target_weights - amounts / port_value
+
+        traded_positions = np.flatnonzero(weight_delta != 0)
+        traded_positions = traded_positions[np.argsort(weight_delta[traded_positions], kind='stable')]
+        if len(traded_positions) == 0:
+            return
+
+        next_weights = target_weights[traded_positions]
+        current_amounts = amounts[traded_positions]
+        trades = self.__get_rebalancing_trades(port_value, next_weights, current_amounts)
+
+        trade_amounts = np.zeros(len(self.tickers))
+        trade_amounts[traded_positions] = trades
+        self.sell_array(-trade_amounts, trade_amounts < 0)
+        self.buy_array(trade_amounts, trade_amounts > 0)
+
+    def __get_rebalancing_trades(self, port_value: float, next_weights: np.ndarray,
+                                 current_amounts: np.ndarray) -> np.ndarray:
+        """
+        거래 순서대로 k 번째 거래 amount t_k = w_k * P_k - a_k (매수 > 0, 매도 < 0, 목표 비중 0 은 -a_k)
+        P_k 는 k 번째 거래 직전 평가금액, P_(k+1) = P_k - fee * |t_k|
+        t_k 의 부호를 알면 P_(k+1) = alpha_k * P_k + beta_k 이므로 누적곱으로 계산
+        수수료로 평가금액이 줄면서 작은 매수가 매도로 바뀔 수 있으므로, 부호가 맞을 때까지 반복
+        (매번 처음 틀린 부호부터 바로잡히므로 최대 거래 수만큼 반복)
+        """
+        def get_trades(port_values: np.ndarray) -> np.ndarray:
+            return np.where(next_weights == 0, -current_amounts, port_values * next_weights - current_amounts)
+
+        fee = self.transaction_fee
+        if fee == 0:
+            return get_trades(port_value)
+
+        is_sell = get_trades(port_value) < 0
+        for _ in range(len(next_weights)):
+            sign = np.where(is_sell, 1, -1)
+            alpha = 1 + sign * fee * next_weights
+            beta = -sign * fee * current_amounts
+            cumulative_alpha = np.concatenate([[1.0], np.cumprod(alpha[:-1])])
+            scaled_beta = np.concatenate([[0.0], np.cumsum(beta[:-1] / cumulative_alpha[1:])])
+            trades = get_trades(cumulative_alpha * (port_value + scaled_beta))
+
+            next_is_sell = trades < 0
+            if np.array_equal(next_is_sell, is_sell):
+                break
+            is_sell = next_is_sell
+        return trades
 
     def get_allocations_delta(self, new_allocations: pd.Series) -> pd.DataFrame:
         current_allocations = self.get_allocations()
@@ -62,13 +198,16 @@ class Portfolio:
         return allocations_df
 
     def get_amount_delta(self, new_allocations: pd.Series) -> pd.Series:
+        """
+        ticker 별 거래 amount, 전체 매도는 -inf (convert_weight_delta 참고)
+        """
         allocation_delta_df = self.get_allocations_delta(new_allocations)
-        allocation_delta_df['weight_delta'] = allocation_delta_df.apply(convert_weight_delta, axis=1)
+        current_weight = allocation_delta_df["current"].to_numpy()
+        weight_delta = allocation_delta_df["weight_delta"].to_numpy()
+        weight_delta = np.where(current_weight == -weight_delta, -np.inf, weight_delta)
 
-        allocation_delta_series = allocation_delta_df["weight_delta"]
         portfolio_value = self.get_total_portfolio_value()
-        amount_delta_series = allocation_delta_series.multiply(portfolio_value)
-        return amount_delta_series
+        return pd.Series(weight_delta * portfolio_value, index=allocation_delta_df.index, name="weight_delta")
 
     def set_weight(self, ticker, weight):
         current_weight = self.get_weight(ticker)
@@ -87,15 +226,26 @@ class Portfolio:
             pass
 
     def update_holdings_value(self, today_date: datetime, market_df_pct_change: pd.DataFrame):
-        tickers = self.security_holding.keys()
-        amount_list = list(self.security_holding.values())
-        prev_amount_series = pd.Series(amount_list, index=tickers)
-        daily_returns_series = market_df_pct_change.loc[today_date, tickers].fillna(0)
-        new_amount_series = prev_amount_series * (1 + daily_returns_series)
-        self.security_holding = dict(zip(new_amount_series.index, new_amount_series.values))
+        daily_returns = market_df_pct_change.loc[today_date].reindex(self.tickers).to_numpy(dtype=float)
+        self.update_holdings_value_by_returns(np.nan_to_num(daily_returns, nan=0.0))
+
+    def update_holdings_value_by_position(self, row_position: int, return_matrix: np.ndarray):
+        """
+        get_return_matrix 로 미리 계산한 수익률 행렬의 row 위치로 평가
+        """
+        self.update_holdings_value_by_returns(return_matrix[row_position])
+
+    def update_holdings_value_by_returns(self, daily_returns: np.ndarray):
+        """
+        daily_returns: ticker index 순서의 일간 수익률 (결측 없음)
+        """
+        width = len(daily_returns)
+        amounts = self.__amounts[:width]
+        np.multiply(amounts, 1 + daily_returns, out=amounts, where=self.__held[:width])
 
     def get_weight(self, ticker):
-        amount = self.security_holding.get(ticker, 0)
+        position = self.__ticker_position.get(ticker)
+        amount = 0 if position is None else self.__amounts[position]
         port_value = self.get_total_portfolio_value()
         return amount / port_value
 
@@ -105,4 +255,4 @@ class Portfolio:
         return holdings_value + cash
 
     def get_total_holdings_value(self):
-        return sum(self.security_holding.values())
+        return self.__amounts.sum()
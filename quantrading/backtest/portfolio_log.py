@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+class PortfolioLogBuffer:
+    """
+    거래일 수 x ticker 수 크기로 미리 할당한 portfolio log 버퍼
+    거래일 위치(position) 에 port_value, cash, ticker 별 amount 기록
+    미보유 ticker 의 amount 는 NaN 으로 기록
+    """
+
+    def __init__(self, date_list: list, tickers: list):
+        self.date_list = date_list
+        # Portfolio.tickers 와 같은 list 를 공유 (Portfolio 에 ticker 가 추가되면 column 도 늘어남)
+        self.tickers = tickers
+
+        date_counts = len(date_list)
+        self.__port_value = np.full(date_counts, np.nan)
+        self.__cash = np.full(date_counts, np.nan)
+        self.__amounts = np.full((date_counts, len(tickers)), np.nan)
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def record(self, position: int, port_value: float, cash: float, amounts: np.ndarray, held: np.ndarray):
+        width = len(amounts)
+        if width > self.__amounts.shape[1]:
+            self.__amounts = np.pad(self.__amounts, ((0, 0), (0, width - self.__amounts.shape[1])),
+                                    constant_values=np.nan)
+
+        self.__port_value[position] = port_value
+        self.__cash[position] = cash
+        row = self.__amounts[position]
+        row.fill(np.nan)
+        np.copyto(row[:width], amounts, where=held)
+        self.__size = max(self.__size, position + 1)
+
+    def __get_held_columns(self) -> np.ndarray:
+        """
+        한 번이라도 보유한 ticker 의 column 위치, 처음 보유한 순서대로 정렬 (같은 날 처음 보유한 ticker 는 ticker index 순서)
+        """
+        amounts = self.__amounts[:self.__size]
+        ever_held = ~np.isnan(amounts)
+        held_columns = np.flatnonzero(ever_held.any(axis=0))
+        first_held_position = ever_held[:, held_columns].argmax(axis=0)
+        return held_columns[np.argsort(first_held_position, kind='stable')]
+
+    def to_frame(self) -> pd.DataFrame:
+        size = self.__size
+        held_columns = self.__get_held_columns()
+
+        data = np.empty((size, len(held_columns) + 2))
+        data[:, 0] = self.__port_value[:size]
+        data[:, 1] = self.__cash[:size]
+        data[:, 2:] = self.__amounts[:size, held_columns]
+
+        columns = ['port_value', 'cash'] + [self.tickers[i] + "_amount" for i in held_columns]
+        return pd.DataFrame(data, index=self.date_list[:size], columns=columns)
+
+    def to_weight_frame(self) -> pd.DataFrame:
+        """
+        날짜별 자산 비중 (cash 포함), 미보유 ticker 는 NaN
+        날짜별 Portfolio.get_allocations() 를 이어 붙인 것과 같은 column 순서:
+        첫 날 보유한 ticker, cash, 이후 처음 보유한 순서대로의 ticker (첫 날 보유 ticker 가 없으면 cash 가 맨 앞)
+        """
+        size = self.__size
+        held_columns = self.__get_held_columns()
+        port_value = self.__port_value[:size, np.newaxis]
+        cash_position = int((~np.isnan(self.__amounts[0, held_columns])).sum()) if size > 0 else 0
+
+        weight_array = self.__amounts[:size, held_columns] / port_value
+        cash_weights = self.__cash[:size] / port_value[:, 0]
+        data = np.insert(weight_array, cash_position, cash_weights, axis=1)
+
+        columns = [self.tickers[i] for i in held_columns]
+        columns.insert(cash_position, 'cash')
+        return pd.DataFrame(data, index=self.date_list[:size], columns=columns)
@@ -0,0 +1,89 @@
+from contextlib import contextmanager, nullcontext
+import time
+import numpy as np
+import pandas as pd
+
+
+class RunProfiler:
+    """
+    run() 의 단계별 실행 시간 기록
+    with profiler.measure("on_data"): ... 형태로 단계마다 호출 시간 누적
+    중첩된 단계의 시간은 바깥 단계 시간에도 포함됨 (ex. Strategy 의 on_end_of_day 안의 update_portfolio_value)
+    """
+
+    def __init__(self):
+        self.__elapsed_dict = {}
+        self.__run_start = None
+        self.run_seconds = 0.0
+        self.days = 0
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            elapsed_list = self.__elapsed_dict.get(name)
+            if elapsed_list is None:
+                self.__elapsed_dict[name] = [elapsed]
+            else:
+                elapsed_list.append(elapsed)
+
+    def start(self):
+        self.__run_start = time.perf_counter()
+
+    def stop(self, days: int):
+        if self.__run_start is not None:
+            self.run_seconds += time.perf_counter() - self.__run_start
+            self.__run_start = None
+        self.days += days
+
+    @property
+    def days_per_sec(self) -> float:
+        if self.run_seconds == 0:
+            return np.nan
+        return self.days / self.run_seconds
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        단계별 호출 수, 총 시간, 평균, 백분위(50, 90, 99), 최대 (초), 전체 run 대비 비중
+        """
+        columns = ["calls", "total", "mean", "p50", "p90", "p99", "max", "share"]
+        rows = []
+        for name, elapsed_list in self.__elapsed_dict.items():
+            elapsed_array = np.asarray(elapsed_list)
+            total = elapsed_array.sum()
+            p50, p90, p99 = np.percentile(elapsed_array, [50, 90, 99])
+            share = total / self.run_seconds if self.run_seconds > 0 else np.nan
+            rows.append([len(elapsed_array), total, total / len(elapsed_array), p50, p90, p99, elapsed_array.max(),
+                         share])
+        profile_df = pd.DataFrame(rows, index=list(self.__elapsed_dict.keys()), columns=columns)
+        return profile_df.sort_values("total", ascending=False)
+
+    def get_summary(self) -> dict:
+        return {
+            "phases": self.to_frame(),
+            "run_seconds": self.run_seconds,
+            "days": self.days,
+            "days_per_sec": self.days_per_sec,
+        }
+
+
+class NullProfiler:
+    """
+    profile 옵션을 켜지 않은 경우 사용, 기록하지 않음
+    """
+    __null_context = nullcontext()
+
+    def measure(self, name: str):
+        return self.__null_context
+
+    def start(self):
+        pass
+
+    def stop(self, days: int):
+        pass
+
+    def get_summary(self):
+        return None
@@ -1,11 +1,18 @@
-import empyrical
+import json
+import os
+import pickle
+import numpy as np
 import pandas as pd
-from xlsxwriter.utility import xl_col_to_name
 from .. import performance_utils
 
+BINARY_RESULT_FORMAT = "quantrading-columnar"
+BINARY_RESULT_VERSION = 1
+
 
 def save_simulation_result_to_excel_file(result: dict, path: str, insert_value_chart=False,
                                          compare_with_bench=False) -> None:
+    from xlsxwriter.utility import xl_col_to_name
+
     performance = result['performance']
     event_log = result.get('event_log', None)
     rebalancing_weight = result.get('rebalancing_weight', None)
@@ -19,6 +26,8 @@ def save_simulation_result_to_excel_file(result: dict, path: str, insert_value_c
     annual_summary = performance["annual_summary"]
     performance_summary = performance["performance_summary"]
     returns_until_next_rebal = performance.get('returns_until_next_rebal', None)
+    drawdown_episodes = performance.get('drawdown_episodes', None)
+    profile = result.get('profile', None)
 
     with pd.ExcelWriter(path, datetime_format="yyyy-mm-dd") as writer:
         portfolio_log.to_excel(writer, sheet_name="portfolio log")
@@ -40,6 +49,14 @@ def save_simulation_result_to_excel_file(result: dict, path: str, insert_value_c
         if returns_until_next_rebal is not None:
             returns_until_next_rebal.to_excel(writer, sheet_name="리밸간 수익률")
 
+        if drawdown_episodes is not None and len(drawdown_episodes) > 0:
+            drawdown_episodes.to_excel(writer, sheet_name="drawdown")
+
+        if profile is not None:
+            profile_df = profile['phases'].copy()
+            profile_df.loc['run', ['calls', 'total']] = [profile['days'], profile['run_seconds']]
+            profile_df.to_excel(writer, sheet_name="profile")
+
         if insert_value_chart:
             sheet_name = 'portfolio log'
             worksheet = writer.sheets[sheet_name]
@@ -135,8 +152,8 @@ def calc_performance_from_value_history(daily_values: pd.Series) -> dict:
     daily_returns = daily_values.pct_change()
     final_returns = daily_values.iloc[-1] / 100 - 1
 
-    monthly_returns = empyrical.aggregate_returns(daily_returns, "monthly")
-    yearly_returns = empyrical.aggregate_returns(daily_returns, "yearly")
+    monthly_returns = performance_utils.aggregate_returns(daily_returns, "monthly")
+    yearly_returns = performance_utils.aggregate_returns(daily_returns, "yearly")
     performance_summary = performance_utils.get_performance_summary(daily_returns, final_returns)
 
     annual_std = performance_utils.get_annual_std(daily_returns)
@@ -144,12 +161,131 @@ def calc_performance_from_value_history(daily_values: pd.Series) -> dict:
     annual_summary.columns = ["수익률", "변동성"]
 
     cumulative_returns = performance_utils.convert_values_to_cumulative_returns(daily_values)
-    drawdown = performance_utils.get_draw_down(cumulative_returns)
+    drawdown, drawdown_episodes = performance_utils.get_draw_down(cumulative_returns, return_episodes=True)
 
     return {
         "monthly_returns": monthly_returns,
         "yearly_returns": yearly_returns,
         "performance_summary": performance_summary,
         "annual_summary": annual_summary,
-        "drawdown": drawdown
-    }
\ No newline at end of file
+        "drawdown": drawdown,
+        "drawdown_episodes": drawdown_episodes
+    }
+
+
+def get_value_history(strategy) -> pd.Series:
+    """
+    run 이 끝난 전략의 포트폴리오 value (시작 100 기준)
+    """
+    result = getattr(strategy, 'result', None)
+    if isinstance(result, dict):
+        # LightStrategy, SleeveStrategy
+        return result['performance']['port_value']
+    return strategy.portfolio_log['port_value']
+
+
+def save_simulation_result_to_binary(result: dict, path: str) -> None:
+    """
+    result dict 를 column 별 npy 파일 폴더로 저장 (load_simulation_result_from_binary 로 복원)
+    path/manifest.json: key 경로별 저장 위치
+    path/objects/{n}/: DataFrame, Series 하나, meta.pkl(index, columns, dtype) + column 별 {i}.npy
+    path/values.pkl: pandas 객체가 아닌 값
+    """
+    os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+    manifest = {"format": BINARY_RESULT_FORMAT, "version": BINARY_RESULT_VERSION, "objects": [], "dicts": []}
+    values = []
+
+    def save(key_path: list, value):
+        if isinstance(value, dict):
+            manifest["dicts"].append(key_path)
+            for key, item in value.items():
+                save(key_path + [key], item)
+        elif isinstance(value, (pd.DataFrame, pd.Series)):
+            folder = str(len(manifest["objects"]))
+            _save_pandas_object_to_binary(value, os.path.join(path, "objects", folder))
+            manifest["objects"].append({"key_path": key_path, "folder": folder})
+        else:
+            values.append((key_path, value))
+
+    save([], result)
+    with open(os.path.join(path, "values.pkl"), "wb") as f:
+        pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+
+def load_simulation_result_from_binary(path: str, mmap=False) -> dict:
+    """
+    save_simulation_result_to_binary 로 저장한 result dict 복원
+    mmap=True 이면 숫자 column 을 memory map 으로 열어 필요한 부분만 읽음 (읽기 전용)
+    DataFrame 은 column 별 memory map 을 그대로 사용, 한 block 으로 합치는 연산을 하면 그때 RAM 으로 복사됨
+    """
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BINARY_RESULT_FORMAT:
+        raise ValueError(f"{path} 는 simulation result 폴더가 아닙니다.")
+
+    with open(os.path.join(path, "values.pkl"), "rb") as f:
+        values = pickle.load(f)
+
+    result = {}
+
+    def put(key_path: list, value):
+        target = result
+        for key in key_path[:-1]:
+            target = target[key]
+        target[key_path[-1]] = value
+
+    for key_path in manifest["dicts"]:
+        if len(key_path) > 0:
+            put(key_path, {})
+    for item in manifest["objects"]:
+        put(item["key_path"], _load_pandas_object_from_binary(os.path.join(path, "objects", item["folder"]), mmap))
+    for key_path, value in values:
+        put(key_path, value)
+    return result
+
+
+def _save_pandas_object_to_binary(data: pd.DataFrame or pd.Series, folder: str):
+    os.makedirs(folder, exist_ok=True)
+    df = data.to_frame() if isinstance(data, pd.Series) else data
+    meta = {
+        "kind": type(data).__name__,
+        "index": data.index,
+        "columns": df.columns,
+        "name": data.name if isinstance(data, pd.Series) else None,
+        "dtypes": list(df.dtypes),
+    }
+    with open(os.path.join(folder, "meta.pkl"), "wb") as f:
+        pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    for i in range(df.shape[1]):
+        column_values = df.iloc[:, i].to_numpy()
+        np.save(os.path.join(folder, f"{i}.npy"), column_values, allow_pickle=column_values.dtype.kind == 'O')
+
+
+def _load_pandas_object_from_binary(folder: str, mmap=False) -> pd.DataFrame or pd.Series:
+    with open(os.path.join(folder, "meta.pkl"), "rb") as f:
+        meta = pickle.load(f)
+
+    column_dict = {}
+    for i, dtype in enumerate(meta["dtypes"]):
+        column_path = os.path.join(folder, f"{i}.npy")
+        try:
+            column_values = np.load(column_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+            # memmap 을 base 로 갖는 ndarray view, 파일 매핑은 유지
+            column_values = column_values.view(np.ndarray)
+        except ValueError:
+            column_values = np.load(column_path, allow_pickle=True)
+        column = pd.Series(column_values, index=meta["index"], copy=False)
+        if column.dtype != dtype:
+            column = column.astype(dtype)
+        column_dict[i] = column
+
+    if meta["kind"] == "Series":
+        column_dict[0].name = meta["name"]
+        return column_dict[0]
+    # copy=False: column 별 block 을 합치지 않아야 memory map 이 RAM 으로 복사되지 않음
+    df = pd.DataFrame(column_dict, index=meta["index"], copy=False)
+    df.columns = meta["columns"]
+    return df
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from .trading_day import TradingDay
+from .utils import calc_rebalancing_port_value_array, get_rebalancing_segment_ids
+from .simulation_result_utils import calc_performance_from_value_history, get_value_history
+from ..performance_utils import get_performance_summary_array
+
+CASH = "cash"
+WEIGHT_TOLERANCE = 1e-8
+
+
+def get_sleeve_value_df(strategy_list: list) -> pd.DataFrame:
+    """
+    run 이 끝난 하위 전략 (Strategy, OpenCloseStrategy, LightStrategy) 의 value 를 column 으로 모음
+    column 이름은 전략 name
+    """
+    value_series_list = []
+    for strategy in strategy_list:
+        value_series = get_value_history(strategy).rename(strategy.name)
+        value_series_list.append(value_series)
+    return pd.concat(value_series_list, axis=1)
+
+
+class SleeveStrategy:
+    """
+    하위 전략 value 를 자산처럼 보고, sleeve 비중으로 리밸런싱한 포트폴리오
+    하위 전략은 한 번만 실행한 value 를 재사용하고, sleeve 비중 조합 여러 개를 리밸런싱 kernel 로 한 번에 계산
+    리밸런싱일 종가에 sleeve 비중을 맞춤, 비중 합이 1 보다 작으면 나머지는 현금 (수익률 0)
+    sleeve 비중 합이 1 보다 크거나, cash 를 지정했는데 전체 합이 1 이 아니면 ValueError
+    value 가 없는 날의 sleeve 수익률은 0
+
+    kwargs:
+        sleeve_value_df: 날짜 x sleeve value, 없으면 strategy_list (run 이 끝난 하위 전략 list) 로 생성
+        allocation: {sleeve: 비중} / pd.Series (고정 비중) 또는
+                    날짜 index 의 pd.DataFrame (리밸런싱일마다 그 날까지의 마지막 행 사용)
+    """
+
+    def __init__(self, **kwargs):
+        self.name = kwargs.get("name")
+        sleeve_value_df = kwargs.get("sleeve_value_df")
+        if sleeve_value_df is None:
+            sleeve_value_df = get_sleeve_value_df(kwargs.get("strategy_list"))
+        sleeve_value_df = sleeve_value_df.sort_index()
+
+        self.start_date = kwargs.get("start_date", sleeve_value_df.index[0])
+        self.end_date = kwargs.get("end_date", sleeve_value_df.index[-1])
+        self.sleeve_value_df = sleeve_value_df.loc[self.start_date:self.end_date]
+        self.sleeves = self.sleeve_value_df.columns.to_list()
+        self.trading_days = self.sleeve_value_df.index
+
+        self.rebalancing_periodic = kwargs.get("rebalancing_periodic", "monthly")
+        self.rebalancing_moment = kwargs.get("rebalancing_moment", "first")
+        trading_day = TradingDay(self.trading_days.to_series().reset_index(drop=True))
+        self.rebalancing_days = [
+            date for date in trading_day.get_rebalancing_days(self.start_date, self.end_date,
+                                                              self.rebalancing_periodic, self.rebalancing_moment)
+            if self.trading_days[0] < date <= self.trading_days[-1]
+        ]
+        self.__segment_ids = get_rebalancing_segment_ids(self.trading_days, self.rebalancing_days)
+        self.__segment_start_dates = pd.DatetimeIndex([self.trading_days[0], *self.rebalancing_days])
+
+        # sleeve 수익률 + 현금 column, 하위 전략 value 에서 한 번만 계산
+        daily_return_array = np.zeros((len(self.trading_days), len(self.sleeves) + 1))
+        daily_return_array[:, :-1] = self.sleeve_value_df.ffill().pct_change().to_numpy(dtype=float)
+        self.__daily_return_array = np.nan_to_num(daily_return_array, nan=0.0)
+
+        self.allocation = kwargs.get("allocation")
+        self.result = None
+
+    def get_weight_array(self, allocation) -> np.ndarray:
+        """
+        return: (리밸런싱 구간 수, sleeve 수 + 1) 구간별 sleeve 비중, 마지막 column 은 현금
+        """
+        if isinstance(allocation, dict):
+            allocation = pd.Series(allocation, dtype=float)
+
+        segment_counts = len(self.__segment_start_dates)
+        if isinstance(allocation, pd.Series):
+            weight_df = pd.DataFrame([allocation] * segment_counts, index=self.__segment_start_dates)
+        else:
+            weight_df = allocation.sort_index().reindex(self.__segment_start_dates, method='ffill')
+
+        unknown_sleeves = weight_df.columns.difference([*self.sleeves, CASH])
+        if len(unknown_sleeves) > 0:
+            raise ValueError(f"sleeve_value_df 에 없는 sleeve: {unknown_sleeves.to_list()}")
+
+        weight_array = np.zeros((segment_counts, len(self.sleeves) + 1))
+        weight_array[:, :-1] = weight_df.reindex(columns=self.sleeves).fillna(0).to_numpy(dtype=float)
+        weight_array[:, -1] = 1 - weight_array[:, :-1].sum(axis=1)
+
+        if (weight_array[:, -1] < -WEIGHT_TOLERANCE).any():
+            raise ValueError("sleeve 비중 합이 1 보다 큼")
+        if CASH in weight_df.columns:
+            cash_weights = weight_df[CASH].to_numpy(dtype=float)
+            is_given = ~np.isnan(cash_weights)
+            if not np.allclose(cash_weights[is_given], weight_array[is_given, -1], rtol=0, atol=WEIGHT_TOLERANCE):
+                raise ValueError("cash 를 포함한 비중 합이 1 이 아님")
+        return weight_array
+
+    def calc_value_array(self, weight_array: np.ndarray) -> np.ndarray:
+        """
+        weight_array: (..., 구간 수, sleeve 수 + 1)
+        return: (..., 일수, sleeve 수 + 1) 시작 value 100 기준 sleeve 별 value
+        """
+        return calc_rebalancing_port_value_array(self.__daily_return_array, weight_array, self.__segment_ids) * 100
+
+    def run(self):
+        weight_array = self.get_weight_array(self.allocation)
+        sleeve_value_array = self.calc_value_array(weight_array)
+        columns = [*self.sleeves, CASH]
+
+        port_value_series = pd.Series(sleeve_value_array.sum(axis=1), index=self.trading_days, name=self.name)
+        sleeve_value_df = pd.DataFrame(sleeve_value_array, index=self.trading_days, columns=columns)
+        performance = calc_performance_from_value_history(port_value_series)
+        performance['port_value'] = port_value_series
+        performance['portfolio_log'] = pd.concat([port_value_series.rename('port_value'), sleeve_value_df,
+                                                  performance['drawdown']], axis=1)
+
+        result = dict()
+        result['performance'] = performance
+        result['sleeve_value'] = sleeve_value_df
+        result['rebalancing_weight'] = pd.DataFrame(weight_array, index=self.__segment_start_dates, columns=columns)
+        self.result = result
+
+    def run_variants(self, allocation_dict: dict, chunk_size=256) -> dict:
+        """
+        sleeve 비중 조합별 포트폴리오 value 를 chunk_size 개씩 묶어 한 번에 계산
+        allocation_dict: {조합 이름: allocation}
+        return: port_value (날짜 x 조합), performance_summary (조합 x 누적수익률, CAGR, Ann.Std, MDD, 샤프지수)
+        """
+        names = list(allocation_dict.keys())
+        port_value_array = np.empty((len(names), len(self.trading_days)))
+        for start in range(0, len(names), chunk_size):
+            chunk_names = names[start:start + chunk_size]
+            weight_array = np.stack([self.get_weight_array(allocation_dict[name]) for name in chunk_names])
+            port_value_array[start:start + len(chunk_names)] = self.calc_value_array(weight_array).sum(axis=-1)
+
+        if len(self.trading_days) > 1:
+            performance_summary = get_performance_summary_array(port_value_array, self.trading_days[1],
+                                                                self.trading_days[-1])
+        else:
+            performance_summary = pd.DataFrame(np.nan, index=range(len(names)),
+                                               columns=["누적수익률", "CAGR", "Ann.Std", "MDD", "샤프지수"])
+        performance_summary.index = names
+        return {
+            "port_value": pd.DataFrame(port_value_array.T, index=self.trading_days, columns=names),
+            "performance_summary": performance_summary,
+        }
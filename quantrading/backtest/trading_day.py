@@ -1,4 +1,5 @@
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import calendar
 
@@ -6,8 +7,14 @@ DEFAULT_DATE_FORMAT = "%Y-%m-%d"
 
 
 class TradingDay:
+    """
+    정렬된 거래일 DatetimeIndex 기반 달력
+    magnet 및 리밸런싱 일정은 searchsorted 로 계산
+    """
+
     def __init__(self, trading_days: list, close_day_policy="after"):
         self.all_trading_days = pd.Series(trading_days).sort_values().reset_index(drop=True)
+        self.__trading_day_index = pd.DatetimeIndex(self.all_trading_days)
         self.first_date = self.all_trading_days.iloc[0]
         self.last_date = self.all_trading_days.iloc[-1]
 
@@ -19,10 +26,9 @@ class TradingDay:
             self.close_day_policy = 0
 
     def get_trading_day_list(self, start_date: datetime, end_date: datetime) -> pd.Series:
-        trading_days = self.all_trading_days
-        trading_days = trading_days[trading_days >= start_date]
-        trading_days = trading_days[trading_days <= end_date]
-        return trading_days
+        start_position = self.__trading_day_index.searchsorted(pd.Timestamp(start_date), side='left')
+        end_position = self.__trading_day_index.searchsorted(pd.Timestamp(end_date), side='right')
+        return self.all_trading_days.iloc[start_position:max(start_position, end_position)]
 
     def get_rebalancing_days(self,
                              start_date: datetime,
@@ -70,61 +76,76 @@ class TradingDay:
         ex) 2002Y,2M -> "2002-2"
         ex) 2015Y,12M -> "2015-12"
         """
-        year_n_month_combination = generate_year_n_month(start_date, end_date)
-        days = []
-        for year, month in year_n_month_combination:
-            first_date = f"{year}-{month}-1"
-            temp_date = self.magnet(first_date, 1)
-            days.append(temp_date)
-        return days
+        month_codes = generate_month_codes(start_date, end_date)
+        return self.__magnet_all(get_first_date_of_months(month_codes), 1)
 
     def get_last_day_of_every_month(self, start_date: str, end_date: str):
         """
         example
         date: 2019-12
+        거래일이 없는 달은 제외
         """
-        year_n_month_combination = generate_year_n_month(start_date, end_date)
-        days = []
-        for year, month in year_n_month_combination:
-            temp_trading_days = self.get_trading_days_by_year_n_month(year, month)
-            last_date = temp_trading_days.tolist()[-1]
-            days.append(last_date)
-        return days
+        month_codes = generate_month_codes(start_date, end_date)
+        return self.__get_last_day_between(get_first_date_of_months(month_codes),
+                                           get_last_date_of_months(month_codes))
 
     def get_n_th_day_of_every_month(self, start_date: str, end_date: str, n_th=15):
-        year_n_month_combination = generate_year_n_month(start_date, end_date)
-        days = []
-        for year, month in year_n_month_combination:
-            num_of_days = calendar.monthrange(year, month)[1]
-            date_list = pd.date_range(f'{year}-{month}-01', periods=num_of_days)
-            n_th_date = date_list[n_th - 1]
-            try:
-                n_th_date = self.magnet(n_th_date, self.close_day_policy)
-            except IndexError:
-                continue
-            days.append(n_th_date)
-        return days
+        """
+        n_th 가 그 달의 일수보다 크면 말일 기준
+        """
+        month_codes = generate_month_codes(start_date, end_date)
+        n_th_dates = np.minimum(get_first_date_of_months(month_codes) + (n_th - 1),
+                                get_last_date_of_months(month_codes))
+        return self.__magnet_all(n_th_dates, self.close_day_policy)
 
     def magnet(self, date, flag):
         """
         flag: before:0, after:1
         """
+        positions, is_valid = self.__get_magnet_positions(pd.DatetimeIndex([pd.Timestamp(date)]), flag)
+        if not is_valid[0]:
+            raise IndexError(f"No trading day to magnet : {date}")
+        return self.all_trading_days.iloc[positions[0]]
+
+    def __get_magnet_positions(self, dates: pd.DatetimeIndex, flag) -> tuple:
+        trading_day_index = self.__trading_day_index
         if flag == 1:
-            trading_days = self.get_trading_day_list(date, self.last_date)
-            near_date = trading_days.iloc[0]
+            positions = trading_day_index.searchsorted(dates, side='left')
+            is_valid = positions < len(trading_day_index)
         elif flag == 0:
-            trading_days = self.get_trading_day_list(self.first_date, date)
-            near_date = trading_days.iloc[-1]
+            positions = trading_day_index.searchsorted(dates, side='right') - 1
+            is_valid = positions >= 0
         else:
             raise ValueError(f"Invalid flag : {flag}")
-        return near_date
+        return positions, is_valid
+
+    def __magnet_all(self, dates, flag) -> list:
+        """
+        magnet 할 거래일이 없는 날짜는 제외
+        """
+        positions, is_valid = self.__get_magnet_positions(pd.DatetimeIndex(dates), flag)
+        return self.__trading_day_index[positions[is_valid]].to_list()
+
+    def __get_last_day_between(self, start_dates, end_dates) -> list:
+        """
+        [start_date, end_date] 구간별 마지막 거래일, 거래일이 없는 구간은 제외
+        """
+        positions, is_valid = self.__get_magnet_positions(pd.DatetimeIndex(end_dates), 0)
+        is_valid[is_valid] = self.__trading_day_index[positions[is_valid]] >= pd.DatetimeIndex(start_dates)[is_valid]
+        return self.__trading_day_index[positions[is_valid]].to_list()
+
+    def __get_first_day_between(self, start_dates, end_dates) -> list:
+        """
+        [start_date, end_date] 구간별 첫 거래일, 거래일이 없는 구간은 제외
+        """
+        positions, is_valid = self.__get_magnet_positions(pd.DatetimeIndex(start_dates), 1)
+        is_valid[is_valid] = self.__trading_day_index[positions[is_valid]] <= pd.DatetimeIndex(end_dates)[is_valid]
+        return self.__trading_day_index[positions[is_valid]].to_list()
 
     def get_trading_days_by_year_n_month(self, year, month):
         end_month_last_day = calendar.monthrange(year, month)[1]
-        start_date = f"{year}-{month}-01"
-        end_date = f"{year}-{month}-{end_month_last_day}"
-        start_date = datetime.strptime(start_date, DEFAULT_DATE_FORMAT)
-        end_date = datetime.strptime(end_date, DEFAULT_DATE_FORMAT)
+        start_date = datetime(year, month, 1)
+        end_date = datetime(year, month, end_month_last_day)
 
         trading_date_series = self.get_trading_day_list(start_date, end_date)
         return trading_date_series
@@ -132,59 +153,38 @@ class TradingDay:
     def get_first_day_of_report_month(self, start_date: str, end_date: str, quarterly_month_list=None):
         if quarterly_month_list is None:
             quarterly_month_list = [1, 4, 7, 10]
-        year_n_month_combination = generate_year_n_month(start_date, end_date)
-        days = []
-        for year, month in year_n_month_combination:
-            if month not in quarterly_month_list:
-                continue
-            first_date = f"{year}-{month}-1"
-            temp_date = self.magnet(first_date, 1)
-            days.append(temp_date)
-        return days
+        month_codes = generate_month_codes(start_date, end_date, quarterly_month_list)
+        return self.__magnet_all(get_first_date_of_months(month_codes), 1)
 
     def get_last_day_of_report_month(self, start_date: str, end_date: str, quarterly_month_list=None):
         if quarterly_month_list is None:
             quarterly_month_list = [3, 6, 9, 12]
-        year_n_month_combination = generate_year_n_month(start_date, end_date)
-        days = []
-        for year, month in year_n_month_combination:
-            if month not in quarterly_month_list:
-                continue
-            last_day_num = calendar.monthrange(year, month)[1]
-            last_date = f"{year}-{month}-{last_day_num}"
-            temp_date = self.magnet(last_date, 0)
-            days.append(temp_date)
-        return days
+        month_codes = generate_month_codes(start_date, end_date, quarterly_month_list)
+        return self.__magnet_all(get_last_date_of_months(month_codes), 0)
 
     def get_first_day_of_every_week(self, start_date: datetime, end_date: datetime) -> list:
         every_monday_list = generate_every_monday(start_date, end_date)
-        days = []
-        for date in every_monday_list:
-            temp_date = self.magnet(date, 1)
-            days.append(temp_date)
-        return days
+        return self.__magnet_all(every_monday_list, 1)
 
     def get_last_day_of_every_week(self, start_date: datetime, end_date: datetime) -> list:
         every_friday_list = generate_every_friday(start_date, end_date)
-        days = []
-        for date in every_friday_list:
-            temp_date = self.magnet(date, 0)
-            days.append(temp_date)
-        return days
+        return self.__magnet_all(every_friday_list, 0)
 
     def get_first_day_of_every_year(self, start_year: int, end_year: int) -> list:
-        days = []
-        for year in range(start_year, end_year + 1):
-            temp_date = self.get_trading_days_by_year(year).to_list()[0]
-            days.append(temp_date)
-        return days
+        """
+        거래일이 없는 해는 제외
+        """
+        year_codes = np.arange(start_year - 1970, end_year - 1970 + 1).astype('datetime64[Y]')
+        return self.__get_first_day_between(year_codes.astype('datetime64[D]'),
+                                            (year_codes + 1).astype('datetime64[D]') - 1)
 
     def get_last_day_of_every_year(self, start_year: int, end_year: int) -> list:
-        days = []
-        for year in range(start_year, end_year + 1):
-            temp_date = self.get_trading_days_by_year(year).to_list()[-1]
-            days.append(temp_date)
-        return days
+        """
+        거래일이 없는 해는 제외
+        """
+        year_codes = np.arange(start_year - 1970, end_year - 1970 + 1).astype('datetime64[Y]')
+        return self.__get_last_day_between(year_codes.astype('datetime64[D]'),
+                                           (year_codes + 1).astype('datetime64[D]') - 1)
 
     def get_trading_days_by_year(self, year):
         start_date = datetime(year, 1, 1)
@@ -193,6 +193,30 @@ class TradingDay:
         return trading_date_series
 
 
+def generate_month_codes(start_date: str, end_date: str, month_list=None) -> np.ndarray:
+    """
+    "2002-2" ~ "2015-12" 사이 월 코드 (datetime64[M])
+    month_list 지정시 해당 월만 포함
+    """
+    start_year, start_month = start_date.split("-")
+    end_year, end_month = end_date.split("-")
+    start_code = (int(start_year) - 1970) * 12 + int(start_month) - 1
+    end_code = (int(end_year) - 1970) * 12 + int(end_month) - 1
+
+    month_codes = np.arange(start_code, end_code + 1)
+    if month_list is not None:
+        month_codes = month_codes[np.isin(month_codes % 12 + 1, month_list)]
+    return month_codes.astype('datetime64[M]')
+
+
+def get_first_date_of_months(month_codes: np.ndarray) -> np.ndarray:
+    return month_codes.astype('datetime64[D]')
+
+
+def get_last_date_of_months(month_codes: np.ndarray) -> np.ndarray:
+    return (month_codes + 1).astype('datetime64[D]') - 1
+
+
 def generate_year_n_month(start_date: str, end_date: str):
     start_year, start_month = start_date.split("-")
     end_year, end_month = end_date.split("-")
@@ -243,11 +267,23 @@ def generate_year_n_quarter(start_quarter: str, end_quarter: str):
     return combinations
 
 
+def generate_every_weekday(start_date: datetime, end_date: datetime, weekday: int) -> pd.DatetimeIndex:
+    """
+    start_date ~ end_date 사이의 특정 요일 (월요일 0 ~ 일요일 6)
+    """
+    start_day = np.datetime64(pd.Timestamp(start_date).ceil('D').date(), 'D')
+    end_day = np.datetime64(pd.Timestamp(end_date).floor('D').date(), 'D')
+    # 1970-01-01 은 목요일(3)
+    start_weekday = (start_day.astype(np.int64) + 3) % 7
+    first_day = start_day + (weekday - start_weekday) % 7
+    return pd.DatetimeIndex(np.arange(first_day, end_day + 1, 7))
+
+
 def generate_every_monday(start_date: datetime, end_date: datetime):
-    every_monday_list = pd.date_range(start_date, end_date, freq="W-MON")
+    every_monday_list = generate_every_weekday(start_date, end_date, 0)
     return every_monday_list
 
 
 def generate_every_friday(start_date: datetime, end_date: datetime):
-    every_monday_list = pd.date_range(start_date, end_date, freq="W-FRI")
+    every_monday_list = generate_every_weekday(start_date, end_date, 4)
     return every_monday_list
@@ -1,19 +1,24 @@
+import numpy as np
 import pandas as pd
-import empyrical
+from .. import performance_utils
 
 
 def divide_code_list_by_quantiles(asset_series: pd.Series, quantiles: int, target_tile: int, ascending=False) -> tuple:
+    """
+    NaN 제외 후 정렬, 종목 수 // quantiles 개씩 나눈 target_tile 번째 구간 (나머지 종목은 어느 구간에도 속하지 않음)
+    ascending=False 이면 first_quantile 은 큰 값부터, last_quantile 은 작은 값부터 나눈 구간
+    같은 값은 index 순서 유지
+    """
+    asset_series = asset_series.dropna()
     counts_per_division = len(asset_series) / quantiles
     counts_per_division = int(counts_per_division)
 
     tile = target_tile
 
-    if ascending is True:
-        reversed_asset_series = asset_series.sort_values(ascending=False)
-    else:
-        reversed_asset_series = asset_series.sort_values(ascending=True)
+    sorted_asset_series = asset_series.sort_values(ascending=ascending, kind='stable')
+    reversed_asset_series = asset_series.sort_values(ascending=not ascending, kind='stable')
 
-    first_quantile = asset_series.index.to_list()[counts_per_division * tile: counts_per_division * (tile + 1)]
+    first_quantile = sorted_asset_series.index.to_list()[counts_per_division * tile: counts_per_division * (tile + 1)]
     last_quantile = reversed_asset_series.index.to_list()[counts_per_division * tile: counts_per_division * (tile + 1)]
     return first_quantile, last_quantile
 
@@ -33,6 +38,64 @@ def divide_code_list_by_percentile(series: pd.Series, start_percentile: int, end
     return ticker_list[start_idx:end_idx]
 
 
+def get_panel_rank_array(score_df: pd.DataFrame, ascending=False) -> tuple:
+    """
+    날짜별 횡단면 순위 (0 부터), 같은 값은 column 순서, NaN 은 순위 없음 (-1)
+    return: (순위 array, 날짜별 NaN 이 아닌 종목 수 array)
+    """
+    score_array = score_df.to_numpy(dtype=float)
+    is_valid = ~np.isnan(score_array)
+    sort_key = score_array if ascending else -score_array
+
+    # stable 정렬, NaN 은 뒤로
+    order = np.argsort(sort_key, axis=1, kind='stable')
+    rank_array = np.empty(score_array.shape, dtype=np.int64)
+    np.put_along_axis(rank_array, order, np.arange(score_array.shape[1])[np.newaxis, :], axis=1)
+    rank_array[~is_valid] = -1
+    return rank_array, is_valid.sum(axis=1)
+
+
+def divide_panel_by_quantiles(score_df: pd.DataFrame, quantiles: int, ascending=False) -> pd.DataFrame:
+    """
+    날짜 x ticker score 를 날짜별로 divide_code_list_by_quantiles 와 같은 규칙으로 나눈 구간 번호
+    0 번 구간이 divide_code_list_by_quantiles 의 target_tile=0 first_quantile
+    NaN, 나머지 종목은 -1
+    """
+    rank_array, valid_counts = get_panel_rank_array(score_df, ascending)
+    counts_per_division = (valid_counts // quantiles)[:, np.newaxis]
+
+    code_array = np.full(rank_array.shape, -1, dtype=np.int64)
+    has_code = (rank_array >= 0) & (rank_array < counts_per_division * quantiles)
+    code_array[has_code] = (rank_array // np.maximum(counts_per_division, 1))[has_code]
+    return pd.DataFrame(code_array, index=score_df.index, columns=score_df.columns)
+
+
+def get_panel_quantile_mask(score_df: pd.DataFrame, quantiles: int, target_tile: int, ascending=False) -> pd.DataFrame:
+    """
+    날짜별 target_tile 구간 종목 여부 (bool)
+    mask_df.loc[date] 가 True 인 ticker 가 divide_code_list_by_quantiles(score_df.loc[date], ...) 의 first_quantile
+    """
+    return divide_panel_by_quantiles(score_df, quantiles, ascending) == target_tile
+
+
+def get_panel_percentile_mask(score_df: pd.DataFrame, start_percentile: int, end_percentile: int,
+                              ascending=False) -> pd.DataFrame:
+    """
+    날짜별로 NaN 제외 후 정렬한 순서에서 [start_percentile, end_percentile) 구간 종목 여부 (bool)
+    divide_code_list_by_percentile(score_df.loc[date].dropna().sort_values(ascending=ascending), ...) 와 같은 규칙
+    """
+    assert 0 <= start_percentile <= 100
+    assert 0 <= end_percentile <= 100
+
+    rank_array, valid_counts = get_panel_rank_array(score_df, ascending)
+    one_block = valid_counts / 100
+    start_idx = (one_block * start_percentile).astype(np.int64)[:, np.newaxis]
+    end_idx = (one_block * end_percentile).astype(np.int64)[:, np.newaxis]
+
+    mask_array = (rank_array >= start_idx) & (rank_array < end_idx)
+    return pd.DataFrame(mask_array, index=score_df.index, columns=score_df.columns)
+
+
 def apply_equal_weights(code_list: list, for_short=False, exposure=1) -> dict:
     total_weight = -exposure if for_short else exposure
     if len(code_list) == 0:
@@ -60,71 +123,149 @@ def get_no_rebalancing_port_daily_value_df(weight_series: pd.Series, daily_retur
     return daily_value_df
 
 
+def get_rebalancing_segment_ids(date_index: pd.DatetimeIndex, rebalancing_date_list: list) -> np.ndarray:
+    """
+    날짜별 리밸런싱 구간 번호
+    구간 0: ~ 첫 리밸런싱일, 구간 i: (i-1 번째 리밸런싱일, i 번째 리밸런싱일], 마지막 리밸런싱일 이후는 구간 len(list)
+    리밸런싱 날의 종가에 매도, 매수 모두 이루어진다고 가정.
+    """
+    rebalancing_dates = pd.DatetimeIndex(pd.to_datetime(list(rebalancing_date_list)))
+    return rebalancing_dates.searchsorted(pd.DatetimeIndex(date_index), side='left')
+
+
+def get_segmented_cumulative_growth(daily_return_array: np.ndarray, segment_ids: np.ndarray) -> np.ndarray:
+    """
+    구간별 누적 (1 + 수익률) 곱, 로그 누적합으로 한 번에 계산
+    daily_return_array: (..., 일수, 자산수), 결측은 0 으로 간주
+    segment_ids: (일수,) 오름차순 구간 번호
+    """
+    growth = 1 + np.nan_to_num(daily_return_array, nan=0.0)
+    is_first_row_of_segment = np.ones(len(segment_ids), dtype=bool)
+    is_first_row_of_segment[1:] = segment_ids[1:] != segment_ids[:-1]
+    segment_start_rows = np.maximum.accumulate(np.where(is_first_row_of_segment, np.arange(len(segment_ids)), 0))
+
+    def accumulate_by_segment(values: np.ndarray) -> np.ndarray:
+        cumulative = np.cumsum(values, axis=-2)
+        previous_cumulative = np.zeros_like(cumulative)
+        previous_cumulative[..., 1:, :] = cumulative[..., :-1, :]
+        return cumulative - previous_cumulative[..., segment_start_rows, :]
+
+    is_zero = growth == 0
+    is_negative = growth < 0
+    log_growth = np.log(np.abs(np.where(is_zero, 1, growth)))
+    cumulative_growth = np.exp(accumulate_by_segment(log_growth))
+
+    if is_zero.any():
+        cumulative_growth[accumulate_by_segment(is_zero.astype(growth.dtype)) > 0] = 0
+    if is_negative.any():
+        cumulative_growth[accumulate_by_segment(is_negative.astype(growth.dtype)) % 2 == 1] *= -1
+    return cumulative_growth
+
+
+def calc_rebalancing_port_value_array(daily_return_array: np.ndarray,
+                                      weight_array: np.ndarray,
+                                      segment_ids: np.ndarray) -> np.ndarray:
+    """
+    리밸런싱이 반영된 자산별 value (첫 구간 시작 value 1 기준)
+    daily_return_array: (..., 일수, 자산수)
+    weight_array: (..., 구간수, 자산수) 구간 시작 비중, 구간 i 는 직전 구간 마지막 날 value 합계로 시작
+    segment_ids: (일수,) get_rebalancing_segment_ids 결과
+    """
+    segment_counts = weight_array.shape[-2]
+    cumulative_growth = get_segmented_cumulative_growth(daily_return_array, segment_ids)
+
+    rows_per_segment = np.bincount(segment_ids, minlength=segment_counts)
+    segment_end_rows = np.cumsum(rows_per_segment) - 1
+    is_empty_segment = rows_per_segment == 0
+
+    # 구간 마지막 날의 누적 성장, 빈 구간은 성장 없음
+    end_growth = np.ones(cumulative_growth.shape[:-2] + (segment_counts, cumulative_growth.shape[-1]),
+                         dtype=cumulative_growth.dtype)
+    end_growth[..., ~is_empty_segment, :] = cumulative_growth[..., segment_end_rows[~is_empty_segment], :]
+
+    segment_growth = (weight_array * end_growth).sum(axis=-1)
+    segment_start_value = np.ones_like(segment_growth)
+    segment_start_value[..., 1:] = np.cumprod(segment_growth[..., :-1], axis=-1)
+
+    start_value_array = weight_array * segment_start_value[..., np.newaxis]
+    return start_value_array[..., segment_ids, :] * cumulative_growth
+
+
+def calc_sparse_rebalancing_port_value_array(daily_return_array: np.ndarray,
+                                             weight_rows: list,
+                                             segment_ids: np.ndarray) -> np.ndarray:
+    """
+    리밸런싱이 반영된 포트폴리오 합계 value (첫 구간 시작 value 1 기준)
+    구간마다 비중이 있는 column 만 계산하므로 유니버스가 크고 보유 종목이 적을 때 사용
+    daily_return_array: (일수, 자산수), 결측은 0 으로 간주
+    weight_rows: 구간별 (column 위치 array, 비중 array), 구간 i 는 직전 구간 마지막 날 value 합계로 시작
+    segment_ids: (일수,) get_rebalancing_segment_ids 결과
+    """
+    rows_per_segment = np.bincount(segment_ids, minlength=len(weight_rows))
+    segment_end_rows = np.cumsum(rows_per_segment)
+
+    port_value_array = np.zeros(len(segment_ids), dtype=daily_return_array.dtype)
+    segment_start_value = 1.0
+    for (columns, weights), start_row, end_row in zip(weight_rows, segment_end_rows - rows_per_segment,
+                                                      segment_end_rows):
+        if start_row == end_row:
+            segment_start_value *= weights.sum()
+            continue
+
+        segment_return_array = daily_return_array[start_row:end_row, columns]
+        cumulative_growth = np.cumprod(1 + np.nan_to_num(segment_return_array, nan=0.0), axis=0)
+        port_value_array[start_row:end_row] = segment_start_value * (cumulative_growth @ weights)
+        segment_start_value = port_value_array[end_row - 1]
+    return port_value_array
+
+
 def get_static_weight_rebalancing_port_daily_value_df(weight_series: pd.Series,
                                                       daily_return_df: pd.DataFrame,
-                                                      rebalancing_date_list: list) -> pd.DataFrame:
+                                                      rebalancing_date_list: list,
+                                                      dtype=np.float64) -> pd.DataFrame:
     """
     리밸런싱이 반영된 포트폴리오 자산 value
     weight_series 의 index 와 daily_return_df column 이 일치해야함.
-    for 문 없앨수 없나??..
     리밸런싱 날의 종가에 매도, 매수 모두 이루어진다고 가정.
+    결측 수익률은 0 으로 간주, dtype=np.float32 로 메모리 절약 가능
     """
+    segment_ids = get_rebalancing_segment_ids(daily_return_df.index, rebalancing_date_list)
+    weight_array = weight_series.reindex(daily_return_df.columns).fillna(0).to_numpy(dtype=dtype)
+    weight_array = np.broadcast_to(weight_array, (len(rebalancing_date_list) + 1, len(weight_array)))
 
-    new_rebalancing_date_list = [*rebalancing_date_list]
-    if new_rebalancing_date_list[-1] != daily_return_df.index[-1].strftime("%Y-%m-%d"):
-        new_rebalancing_date_list.append(daily_return_df.index[-1].strftime("%Y-%m-%d"))
-
-    value_df_list = []
-    for i, date in enumerate(new_rebalancing_date_list):
-        if i == 0:
-            start_date = daily_return_df.index[0].strftime("%Y-%m-%d")
-            end_date = date
-            previous_value_series = weight_series
-            date_range = (daily_return_df.index >= start_date) & (daily_return_df.index <= end_date)
-        else:
-            start_date = new_rebalancing_date_list[i - 1]
-            end_date = date
-            previous_value_series = weight_series * sliced_value_df.iloc[-1].sum()
-            date_range = (daily_return_df.index > start_date) & (daily_return_df.index <= end_date)
-        sliced_daily_return_df = daily_return_df.loc[date_range]
-        sliced_value_df = sliced_daily_return_df.add(1).cumprod().multiply(previous_value_series)
-        value_df_list.append(sliced_value_df)
-
-    port_value_df = pd.concat([*value_df_list], axis=0)
-    return port_value_df
+    port_value_array = calc_rebalancing_port_value_array(
+        daily_return_df.to_numpy(dtype=dtype),
+        weight_array,
+        segment_ids
+    )
+    return pd.DataFrame(port_value_array, index=daily_return_df.index, columns=daily_return_df.columns)
 
 
 def get_dynamic_weight_rebalancing_port_daily_value_df(weight_series_list: list,
                                                        daily_return_df: pd.DataFrame,
-                                                       rebalancing_date_list: list) -> pd.DataFrame:
+                                                       rebalancing_date_list: list,
+                                                       dtype=np.float64) -> pd.DataFrame:
     """
     weight_eries_list 의 첫 항목은 최조 비중
     리밸런싱 날의 종가에 매도, 매수 모두 이루어진다고 가정.
+    결측 수익률은 0 으로 간주, dtype=np.float32 로 메모리 절약 가능
     """
     assert len(weight_series_list) == len(rebalancing_date_list) + 1
 
-    new_rebalancing_date_list = [*rebalancing_date_list]
-    if new_rebalancing_date_list[-1] != daily_return_df.index[-1].strftime("%Y-%m-%d"):
-        new_rebalancing_date_list.append(daily_return_df.index[-1].strftime("%Y-%m-%d"))
-
-    sliced_value_df_list = []
-    for i, date in enumerate(new_rebalancing_date_list):
-        print(date)
-        if i == 0:
-            start_date = daily_return_df.index[0].strftime("%Y-%m-%d")
-            end_date = date
-            previous_value_series = weight_series_list[i]
-            date_range = (daily_return_df.index >= start_date) & (daily_return_df.index <= end_date)
-        else:
-            start_date = rebalancing_date_list[i - 1]
-            end_date = date
-            previous_value_series = weight_series_list[i] * sliced_value_df_list[-1].iloc[-1].sum()
-            date_range = (daily_return_df.index > start_date) & (daily_return_df.index <= end_date)
-        sliced_daily_return_df = daily_return_df.loc[date_range]
-        sliced_value_df = sliced_daily_return_df.add(1).cumprod().multiply(previous_value_series)
-        sliced_value_df_list.append(sliced_value_df)
-    port_value_df = pd.concat([*sliced_value_df_list], axis=0)
-    return port_value_df
+    segment_ids = get_rebalancing_segment_ids(daily_return_df.index, rebalancing_date_list)
+    weight_array = (
+        pd.DataFrame(list(weight_series_list))
+            .reindex(columns=daily_return_df.columns)
+            .fillna(0)
+            .to_numpy(dtype=dtype)
+    )
+
+    port_value_array = calc_rebalancing_port_value_array(
+        daily_return_df.to_numpy(dtype=dtype),
+        weight_array,
+        segment_ids
+    )
+    return pd.DataFrame(port_value_array, index=daily_return_df.index, columns=daily_return_df.columns)
 
 
 def compare_strategy_with_benchmark(strategy, benchmark_list: list):
@@ -137,7 +278,7 @@ def compare_strategy_with_benchmark(strategy, benchmark_list: list):
 
     yearly_returns = strategy_performance["yearly_returns"]
     for benchmark in benchmark_list:
-        benchmark_yearly_returns = empyrical.aggregate_returns(benchmark.get_daily_return(), "yearly")
+        benchmark_yearly_returns = performance_utils.aggregate_returns(benchmark.get_daily_return(), "yearly")
         yearly_returns = pd.concat([yearly_returns, benchmark_yearly_returns], axis=1)
 
     yearly_returns.columns = all_columns
@@ -146,60 +287,134 @@ def compare_strategy_with_benchmark(strategy, benchmark_list: list):
 
 
 def merge_portfolio_log(algorithm_list):
-    total_portfolio_log = pd.DataFrame()
-    for algorithm in algorithm_list:
-        single_portfolio_log = algorithm.portfolio_log
-        total_portfolio_log = pd.concat([total_portfolio_log, single_portfolio_log], axis=1)
-
-    result_portfolio_log = pd.DataFrame()
-    col_list = total_portfolio_log.columns.drop_duplicates()
-    for col in col_list:
-        series_or_df = total_portfolio_log[col]
-        if type(series_or_df) == pd.Series:
-            result_portfolio_log = pd.concat([result_portfolio_log, series_or_df], axis=1)
+    """
+    같은 이름의 column 은 합산 (결측은 0), column 순서는 처음 나온 순서
+    모든 log 를 한 번에 concat 한 뒤 column 이름별로 합산
+    """
+    portfolio_log_list = [algorithm.portfolio_log for algorithm in algorithm_list]
+    if len(portfolio_log_list) == 0:
+        return pd.DataFrame()
+
+    total_portfolio_log = pd.concat(portfolio_log_list, axis=1)
+    column_codes, unique_columns = pd.factorize(total_portfolio_log.columns)
+    value_array = np.nan_to_num(total_portfolio_log.to_numpy(dtype=float), nan=0.0)
+
+    merged_array = np.zeros((len(total_portfolio_log), len(unique_columns)))
+    np.add.at(merged_array, (slice(None), column_codes), value_array)
+    return pd.DataFrame(merged_array, index=total_portfolio_log.index, columns=unique_columns)
+
+
+class SimulationResultAggregator:
+    """
+    시뮬레이션 결과 (get_result() 또는 LightStrategy.result) 를 모아 항목별로 한 번씩만 concat
+    worker 가 끝날 때마다 add() 하고, get_result() 로 그때까지의 합친 결과를 언제든 조회 가능
+    column 순서는 order (미지정시 add 순서) 기준
+
+    ex)
+    aggregator = SimulationResultAggregator()
+    for case_index, params, summary, result in iter_parameter_sweep(..., return_result=True):
+        aggregator.add(result, order=case_index)
+    aggregator.get_result()
+    """
+    PERFORMANCE_KEYS = ['portfolio_log', 'monthly_returns', 'annual_summary', 'performance_summary',
+                        'returns_until_next_rebal']
+
+    def __init__(self, custom_df: pd.DataFrame = None):
+        self.custom_df = custom_df
+        self.__order_list = []
+        self.__frame_list_dict = {key: [] for key in self.PERFORMANCE_KEYS}
+        # 이미 합친 결과 수와 항목별 합친 DataFrame, 이후 add 된 결과만 이어 붙임
+        # 합친 DataFrame 의 column 별 (order, add 순서, 이름 없는 Series 여부), column 순서를 맞출 때 사용
+        self.__merged_counts = 0
+        self.__merged_frame_dict = {key: None for key in self.PERFORMANCE_KEYS}
+        self.__column_keys_dict = {key: [] for key in self.PERFORMANCE_KEYS}
+        self.__combined_result = None
+
+    def __len__(self):
+        return len(self.__order_list)
+
+    def add(self, result: dict, order=None):
+        performance = result['performance']
+        if 'portfolio_log' in performance:
+            port_value = performance['portfolio_log'].iloc[:, 0]
         else:
-            new_col_series = series_or_df.sum(axis=1)
-            new_col_series.name = col
-            result_portfolio_log = pd.concat([result_portfolio_log, new_col_series], axis=1)
-    result_portfolio_log = result_portfolio_log.fillna(0)
-    return result_portfolio_log
+            port_value = performance['port_value']
+
+        self.__order_list.append(len(self.__order_list) if order is None else order)
+        self.__frame_list_dict['portfolio_log'].append(port_value)
+        for key in self.PERFORMANCE_KEYS[1:]:
+            self.__frame_list_dict[key].append(performance.get(key))
+        self.__combined_result = None
+
+    def extend(self, result_list: list):
+        for result in result_list:
+            self.add(result)
+
+    def get_result(self) -> dict:
+        """
+        add 와 번갈아 호출해도, 마지막 호출 이후 add 된 결과만 이어 붙임
+        (이전보다 앞선 order 가 add 된 경우 column 순서만 다시 맞춤)
+        """
+        if self.__combined_result is None:
+            self.__combined_result = {"performance": self.__combine()}
+        return self.__combined_result
+
+    def __combine(self) -> dict:
+        order_list = self.__order_list
+        new_positions = sorted(range(self.__merged_counts, len(order_list)), key=lambda i: order_list[i])
+
+        concated_performance = {}
+        for key, frame_list in self.__frame_list_dict.items():
+            merged_frame = self.__merged_frame_dict[key]
+            column_keys = self.__column_keys_dict[key]
+            merged_column_counts = len(column_keys)
+            new_frame_list = []
+            for i in new_positions:
+                frame = frame_list[i]
+                if frame is None:
+                    continue
+                new_frame_list.append(frame)
+                if isinstance(frame, pd.Series):
+                    column_keys.append((order_list[i], i, frame.name is None))
+                else:
+                    column_keys.extend([(order_list[i], i, False)] * frame.shape[1])
+
+            if len(new_frame_list) > 0:
+                if merged_frame is not None:
+                    new_frame_list.insert(0, merged_frame)
+                merged_frame = pd.concat(new_frame_list, axis=1)
+                if 0 < merged_column_counts < len(column_keys) and \
+                        column_keys[merged_column_counts] < column_keys[merged_column_counts - 1]:
+                    column_positions = sorted(range(len(column_keys)), key=column_keys.__getitem__)
+                    merged_frame = merged_frame.take(column_positions, axis=1)
+                    column_keys[:] = [column_keys[position] for position in column_positions]
+                if any(is_unnamed for _, _, is_unnamed in column_keys):
+                    merged_frame.columns = self.__get_column_names(merged_frame.columns, column_keys)
+            self.__merged_frame_dict[key] = merged_frame
+
+            if key == 'returns_until_next_rebal' and self.custom_df is not None:
+                frame_list = [] if merged_frame is None else [merged_frame]
+                merged_frame = pd.concat([*frame_list, self.custom_df], axis=1)
+            concated_performance[key] = pd.DataFrame() if merged_frame is None else merged_frame
+        self.__merged_counts = len(order_list)
+        return concated_performance
+
+    @staticmethod
+    def __get_column_names(columns: pd.Index, column_keys: list) -> pd.Index:
+        """
+        이름 없는 Series 는 한 번에 concat 할 때와 같은 번호 (0, 1, ...) 로 이름 지정
+        """
+        column_names = []
+        unnamed_counts = 0
+        for column, (_, _, is_unnamed) in zip(columns, column_keys):
+            if is_unnamed:
+                column = unnamed_counts
+                unnamed_counts += 1
+            column_names.append(column)
+        return pd.Index(column_names)
 
 
 def concat_simulation_result(result_list, **kwargs) -> dict:
-    concated_performance = {}
-
-    performance_list = [result['performance'] for result in result_list]
-
-    port_value_df = pd.DataFrame()
-    monthly_returns_df = pd.DataFrame()
-    annual_summary_df = pd.DataFrame()
-    performance_summary_df = pd.DataFrame()
-    returns_until_next_rebal_df = pd.DataFrame()
-    for performance in performance_list:
-        port_value = performance['portfolio_log'].iloc[:, 0]
-        port_value_df = pd.concat([port_value_df, port_value], axis=1)
-
-        monthly_returns = performance['monthly_returns']
-        monthly_returns_df = pd.concat([monthly_returns_df, monthly_returns], axis=1)
-
-        annual_summary = performance['annual_summary']
-        annual_summary_df = pd.concat([annual_summary_df, annual_summary], axis=1)
-
-        performance_summary = performance['performance_summary']
-        performance_summary_df = pd.concat([performance_summary_df, performance_summary], axis=1)
-
-        returns_until_next_rebal = performance['returns_until_next_rebal']
-        returns_until_next_rebal_df = pd.concat([returns_until_next_rebal_df, returns_until_next_rebal], axis=1)
-
-    custom_df = kwargs.get("custom_df", None)
-    if custom_df is not None:
-        returns_until_next_rebal_df = pd.concat([returns_until_next_rebal_df, custom_df], axis=1)
-
-    concated_performance['portfolio_log'] = port_value_df
-    concated_performance['monthly_returns'] = monthly_returns_df
-    concated_performance['annual_summary'] = annual_summary_df
-    concated_performance['performance_summary'] = performance_summary_df
-    concated_performance['returns_until_next_rebal'] = returns_until_next_rebal_df
-    return {
-        "performance": concated_performance
-    }
+    aggregator = SimulationResultAggregator(custom_df=kwargs.get("custom_df", None))
+    aggregator.extend(result_list)
+    return aggregator.get_result()
@@ -0,0 +1,276 @@
+from collections import OrderedDict
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+from .utils import make_folder
+
+DEFAULT_FOLDER = os.path.join(os.path.expanduser("~"), ".quantrading", "feature_store")
+FILE_SUFFIX = ".feature"
+# feature 함수 결과가 바뀌는 수정이 있으면 올려서 기존 cache 를 무효화
+FEATURE_KEY_VERSION = 1
+
+
+def get_data_fingerprint(data: pd.Series or pd.DataFrame) -> str:
+    """
+    index, column, dtype, 값을 모두 반영한 sha256
+    """
+    hasher = hashlib.sha256()
+    hasher.update(type(data).__name__.encode())
+    if isinstance(data, pd.DataFrame):
+        hasher.update(repr(list(data.columns)).encode())
+        hasher.update(repr(list(data.dtypes.astype(str))).encode())
+    else:
+        hasher.update(repr(data.name).encode())
+        hasher.update(str(data.dtype).encode())
+    hasher.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def update_code_hash(hasher, code):
+    """
+    bytecode, 참조 이름, 상수 (내부 함수, lambda 의 code 포함) 를 반영
+    """
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            update_code_hash(hasher, const)
+        else:
+            hasher.update(repr(const).encode())
+
+
+def update_value_hash(hasher, value):
+    """
+    parameter, closure 값 등을 반영, repr 은 큰 array 나 pandas 객체를 생략(...)하므로 값 전체를 사용
+    tuple, list, dict, set 은 원소마다 재귀
+    """
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        hasher.update(get_data_fingerprint(value).encode())
+    elif isinstance(value, np.ndarray):
+        hasher.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        if value.dtype.kind == 'O':
+            update_value_hash(hasher, value.tolist())
+        else:
+            hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (tuple, list)):
+        hasher.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            update_value_hash(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f"dict{len(value)}".encode())
+        for key, item in value.items():
+            update_value_hash(hasher, key)
+            update_value_hash(hasher, item)
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in sorted(value, key=repr):
+            update_value_hash(hasher, item)
+    elif inspect.isfunction(value) or isinstance(value, functools.partial):
+        hasher.update(get_function_fingerprint(value).encode())
+    else:
+        hasher.update(repr(value).encode())
+
+
+def get_function_fingerprint(func) -> str:
+    """
+    함수 이름 + code + 기본값 + closure 값으로 만든 sha256
+    이름이 같은 lambda 나 closure 도 내용이 다르면 다른 값, 함수를 수정해도 다른 값
+    """
+    hasher = hashlib.sha256()
+    if isinstance(func, functools.partial):
+        hasher.update(get_function_fingerprint(func.func).encode())
+        update_value_hash(hasher, func.args)
+        update_value_hash(hasher, dict(sorted(func.keywords.items())))
+        return hasher.hexdigest()
+
+    hasher.update(f"{func.__module__}.{func.__qualname__}".encode())
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        update_code_hash(hasher, code)
+        update_value_hash(hasher, func.__defaults__)
+        update_value_hash(hasher, func.__kwdefaults__)
+        for cell in func.__closure__ or ():
+            update_value_hash(hasher, cell.cell_contents)
+    return hasher.hexdigest()
+
+
+def get_feature_key(func, data: pd.Series or pd.DataFrame, args=(), kwargs=None) -> str:
+    """
+    입력 데이터 fingerprint + 함수 fingerprint + parameter (기본값 포함) + FEATURE_KEY_VERSION 으로 만든 key
+    """
+    bound_arguments = inspect.signature(func).bind(data, *args, **(kwargs or {}))
+    bound_arguments.apply_defaults()
+    params = list(bound_arguments.arguments.items())[1:]
+
+    hasher = hashlib.sha256()
+    hasher.update(f"v{FEATURE_KEY_VERSION}".encode())
+    hasher.update(get_function_fingerprint(func).encode())
+    update_value_hash(hasher, params)
+    hasher.update(get_data_fingerprint(data).encode())
+    return hasher.hexdigest()
+
+
+def get_nbytes(feature: pd.Series or pd.DataFrame) -> int:
+    if isinstance(feature, pd.DataFrame):
+        return int(feature.memory_usage(index=True).sum())
+    return int(feature.memory_usage(index=True))
+
+
+class FeatureStore:
+    """
+    time_series_utils 등 feature 함수 결과 cache
+    key: 입력 데이터 fingerprint + 함수 (code, closure 값 포함) + parameter
+    memory LRU (max_memory_bytes) 와 disk LRU (max_disk_bytes, 파일 수정 시각 기준) 를 함께 사용
+    파일은 임시 파일에 쓴 뒤 os.replace 로 교체하므로 여러 프로세스가 같은 폴더를 공유해도 됨
+    memory cache 에서 반환된 값은 cache 와 공유하므로 수정 금지
+    """
+
+    def __init__(self, folder=DEFAULT_FOLDER, max_memory_bytes=512 * 1024 ** 2, max_disk_bytes=4 * 1024 ** 3):
+        self.folder = folder
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.__memory_cache = OrderedDict()
+        self.__memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if folder is not None:
+            make_folder(folder)
+
+    def get(self, func, data: pd.Series or pd.DataFrame, *args, **kwargs):
+        """
+        cache 에 있으면 load, 없으면 func(data, *args, **kwargs) 계산 후 저장
+        """
+        key = get_feature_key(func, data, args, kwargs)
+        feature = self.__get_from_memory(key)
+        if feature is None:
+            feature = self.__load(key)
+            if feature is not None:
+                self.__put_in_memory(key, feature)
+
+        if feature is not None:
+            self.hits += 1
+            return feature
+
+        self.misses += 1
+        feature = func(data, *args, **kwargs)
+        self.__put_in_memory(key, feature)
+        self.__save(key, feature)
+        return feature
+
+    def cached(self, func):
+        """
+        store.cached(get_ma)(price_series, [5, 20]) 형태로 사용하는 wrapper
+        """
+        @functools.wraps(func)
+        def wrapper(data, *args, **kwargs):
+            return self.get(func, data, *args, **kwargs)
+        return wrapper
+
+    def clear(self, disk=False):
+        self.__memory_cache.clear()
+        self.__memory_bytes = 0
+        if disk and self.folder is not None:
+            for path, _, _ in self.__list_files():
+                self.__remove(path)
+
+    def __get_from_memory(self, key: str):
+        item = self.__memory_cache.get(key)
+        if item is None:
+            return None
+        self.__memory_cache.move_to_end(key)
+        return item[0]
+
+    def __put_in_memory(self, key: str, feature):
+        nbytes = get_nbytes(feature)
+        if nbytes > self.max_memory_bytes:
+            return
+        if key in self.__memory_cache:
+            self.__memory_bytes -= self.__memory_cache.pop(key)[1]
+        self.__memory_cache[key] = (feature, nbytes)
+        self.__memory_bytes += nbytes
+        while self.__memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_nbytes) = self.__memory_cache.popitem(last=False)
+            self.__memory_bytes -= evicted_nbytes
+
+    def __get_path(self, key: str) -> str:
+        return os.path.join(self.folder, key + FILE_SUFFIX)
+
+    def __load(self, key: str):
+        """
+        파일 구성: pickle 한 metadata (종류, index, columns, name) + np.save 한 값
+        """
+        if self.folder is None:
+            return None
+        path = self.__get_path(key)
+        try:
+            with open(path, "rb") as f:
+                metadata = pickle.load(f)
+                values = np.load(f, allow_pickle=metadata['allow_pickle'])
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+            return None
+
+        if metadata['kind'] == "DataFrame":
+            return pd.DataFrame(values, index=metadata['index'], columns=metadata['columns'], copy=False)
+        return pd.Series(values, index=metadata['index'], name=metadata['name'], copy=False)
+
+    def __save(self, key: str, feature):
+        if self.folder is None or not isinstance(feature, (pd.Series, pd.DataFrame)):
+            return
+
+        values = feature.to_numpy()
+        metadata = {
+            'kind': type(feature).__name__,
+            'index': feature.index,
+            'columns': feature.columns if isinstance(feature, pd.DataFrame) else None,
+            'name': feature.name if isinstance(feature, pd.Series) else None,
+            'allow_pickle': values.dtype.kind == 'O',
+        }
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(metadata, f, protocol=pickle.HIGHEST_PROTOCOL)
+                np.save(f, values, allow_pickle=metadata['allow_pickle'])
+            os.replace(temp_path, self.__get_path(key))
+        except BaseException:
+            self.__remove(temp_path)
+            raise
+        self.__evict_disk()
+
+    def __list_files(self) -> list:
+        """
+        return: [(경로, 크기, 수정 시각)]
+        """
+        file_list = []
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if not entry.name.endswith(FILE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                file_list.append((entry.path, stat.st_size, stat.st_mtime))
+        return file_list
+
+    def __evict_disk(self):
+        file_list = self.__list_files()
+        total_bytes = sum(size for _, size, _ in file_list)
+        for path, size, _ in sorted(file_list, key=lambda item: item[2]):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            self.__remove(path)
+            total_bytes -= size
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,7 +1,6 @@
 import pandas as pd
 from datetime import datetime
 import numpy as np
-import empyrical
 
 
 def get_returns(cur_price: float, base_price: float):
@@ -66,7 +65,7 @@ def get_performance_summary(daily_returns_series: pd.Series, final_returns: floa
     end_date = date_list[-1]
     cagr = get_annualized_returns(start_date, end_date, final_returns)
     annual_std = get_annualized_std(daily_returns_series.std(), "daily")
-    mdd = empyrical.max_drawdown(daily_returns_series)
+    mdd = get_max_drawdown(daily_returns_series)
 
     performance_summary.loc["시작일"] = start_date
     performance_summary.loc["종료일"] = end_date
@@ -79,9 +78,110 @@ def get_performance_summary(daily_returns_series: pd.Series, final_returns: floa
     return performance_summary
 
 
-def get_draw_down(returns: pd.Series):
-    df = pd.DataFrame()
-    df['cumulative_returns'] = returns
-    df['historical_high'] = df['cumulative_returns'].cummax()
-    df['drawdown'] = df.loc[:, ['historical_high', 'cumulative_returns']].apply(get_returns_between_returns, axis=1)
-    return df['drawdown']
+def aggregate_returns(daily_returns: pd.Series, convert_to: str) -> pd.Series:
+    """
+    empyrical.aggregate_returns 와 동일, 결측 수익률은 0
+    convert_to: 'weekly', 'monthly', 'quarterly', 'yearly'
+    """
+    index = pd.DatetimeIndex(daily_returns.index)
+    year = index.year.to_numpy(dtype=np.int64)
+    if convert_to == "weekly":
+        grouping = [year, index.isocalendar().week.to_numpy(dtype=np.int64)]
+    elif convert_to == "monthly":
+        grouping = [year, index.month.to_numpy(dtype=np.int64)]
+    elif convert_to == "quarterly":
+        grouping = [year, index.quarter.to_numpy(dtype=np.int64)]
+    elif convert_to == "yearly":
+        grouping = [year]
+    else:
+        raise ValueError("Invalid convert_to : ", convert_to)
+    return daily_returns.fillna(0).add(1).groupby(grouping).prod() - 1
+
+
+def get_max_drawdown(daily_returns: pd.Series or np.ndarray) -> float:
+    """
+    empyrical.max_drawdown 과 동일, 시작 value 를 포함하며 결측 수익률은 0
+    """
+    returns = np.nan_to_num(np.asarray(daily_returns, dtype=float), nan=0.0)
+    if len(returns) < 1:
+        return np.nan
+    cumulative = np.empty(len(returns) + 1)
+    cumulative[0] = 100
+    np.cumprod(returns + 1, out=cumulative[1:])
+    cumulative[1:] *= 100
+    max_value = np.fmax.accumulate(cumulative)
+    return np.nanmin((cumulative - max_value) / max_value)
+
+
+def get_draw_down(returns: pd.Series or pd.DataFrame, return_episodes=False):
+    """
+    returns: 누적수익률 Series 또는 전략별 누적수익률 DataFrame
+    return_episodes=True 이면 (drawdown, get_draw_down_episodes 결과) 반환
+    """
+    drawdown = (returns + 1) / (returns.cummax() + 1) - 1
+    if isinstance(drawdown, pd.Series):
+        drawdown.name = 'drawdown'
+    if not return_episodes:
+        return drawdown
+    return drawdown, get_draw_down_episodes(drawdown)
+
+
+def get_draw_down_episodes(drawdown: pd.Series or pd.DataFrame) -> pd.DataFrame:
+    """
+    drawdown 구간별 고점일, 저점일, 회복일(미회복시 NaT), 낙폭, 기간(고점 ~ 회복 또는 마지막 날까지 거래일 수)
+    DataFrame 이면 (column, 구간 번호) index
+    """
+    if isinstance(drawdown, pd.DataFrame):
+        episodes_list = [get_draw_down_episodes(drawdown[column]) for column in drawdown.columns]
+        return pd.concat(episodes_list, keys=drawdown.columns)
+
+    columns = ["고점일", "저점일", "회복일", "낙폭", "기간"]
+    values = drawdown.to_numpy(dtype=float)
+    underwater = values < 0
+    if not underwater.any():
+        return pd.DataFrame(columns=columns)
+
+    edges = np.diff(np.concatenate([[0], underwater.astype(np.int8), [0]]))
+    start_positions = np.flatnonzero(edges == 1)
+    end_positions = np.flatnonzero(edges == -1)
+
+    underwater_values = np.where(underwater, values, 0)
+    depth = np.minimum.reduceat(underwater_values, start_positions)
+    segment_ids = np.cumsum(edges[:-1] == 1) - 1
+    is_trough = underwater & (underwater_values == depth[segment_ids])
+    _, first_trough_index = np.unique(segment_ids[is_trough], return_index=True)
+    trough_positions = np.flatnonzero(is_trough)[first_trough_index]
+
+    index = drawdown.index
+    peak_positions = np.maximum(start_positions - 1, 0)
+    recovery_positions = np.where(end_positions < len(values), end_positions, -1)
+
+    return pd.DataFrame({
+        "고점일": index[peak_positions],
+        "저점일": index[trough_positions],
+        "회복일": index.take(recovery_positions, allow_fill=True, fill_value=pd.NaT),
+        "낙폭": depth,
+        "기간": np.minimum(end_positions, len(values) - 1) - peak_positions,
+    }, columns=columns)
+
+
+def get_performance_summary_array(value_array: np.ndarray, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """
+    value_array: (경로수, 일수) 첫 날 value 100 기준의 경로별 value
+    get_performance_summary 와 같은 지표를 경로별로 한 번에 계산
+    start_date: 첫 수익률 날짜(둘째 날), end_date: 마지막 날짜
+    """
+    value_array = np.asarray(value_array, dtype=float)
+    daily_returns = value_array[:, 1:] / value_array[:, :-1] - 1
+    final_returns = value_array[:, -1] / 100 - 1
+
+    years = get_delta_year(start_date, end_date)
+    if years == 0:
+        cagr = np.full(len(value_array), np.nan)
+    else:
+        cagr = (1 + final_returns) ** (1 / years) - 1
+    annual_std = get_annualized_std(daily_returns.std(axis=1, ddof=1), "daily")
+    mdd = (value_array / np.maximum.accumulate(value_array, axis=1) - 1).min(axis=1)
+
+    summary_array = np.column_stack([final_returns, cagr, annual_std, mdd, cagr / annual_std])
+    return pd.DataFrame(summary_array, columns=["누적수익률", "CAGR", "Ann.Std", "MDD", "샤프지수"])
@@ -1,3 +1,8 @@
 from .monte_carlo import (
-    generate_single_case
-)
\ No newline at end of file
+    generate_single_case,
+    MonteCarloGenerator
+)
+from .strategy_simulation import (
+    simulate_strategy_performance,
+    get_synthetic_trading_days,
+)
@@ -1,3 +1,4 @@
+import copy
 import pandas as pd
 import numpy as np
 
@@ -20,3 +21,84 @@ def generate_single_case(returns_df: pd.DataFrame, walk_length: int):
     L = np.linalg.cholesky(cov)
     future_returns = np.full((walk_length, assets_counts), returns_mean).T + np.dot(L, Z)
     return pd.DataFrame(future_returns.T, columns=returns_df.columns)
+
+
+class MonteCarloGenerator:
+    """
+    generate_single_case 의 다중 경로 버전
+    평균, 표준편차, 표준화 수익률, cholesky 분해는 생성 시 한 번만 계산 (결측 있는 날짜 제외)
+    경로는 (경로수, walk_length, 자산수) array 로 생성하며,
+    경로 번호 PATH_BLOCK_SIZE 개 단위로 seed 에서 파생한 독립 np.random.Generator 를 사용하므로
+    같은 seed 이면 chunk 크기나 병렬 worker 수와 관계없이 경로 번호별 결과가 같음.
+    """
+    PATH_BLOCK_SIZE = 64
+
+    def __init__(self, returns_df: pd.DataFrame, seed=None):
+        returns_df = returns_df.dropna()
+        self.columns = returns_df.columns
+        self.returns_mean = returns_df.mean().to_numpy()
+        returns_std = returns_df.std().to_numpy()
+        self.standardized_returns = (returns_df.to_numpy() - self.returns_mean) / returns_std
+        self.cholesky = np.linalg.cholesky(returns_df.cov().to_numpy())
+
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+
+    def spawn(self, n_streams: int) -> list:
+        """
+        통계는 공유하고 seed 만 독립인 generator 목록 (프로세스별 독립 stream 용)
+        """
+        generator_list = []
+        for seed_sequence in self.seed_sequence.spawn(n_streams):
+            generator = copy.copy(self)
+            generator.seed_sequence = seed_sequence
+            generator_list.append(generator)
+        return generator_list
+
+    def get_block_rng(self, block_index: int) -> np.random.Generator:
+        seed_sequence = np.random.SeedSequence(self.seed_sequence.entropy,
+                                               spawn_key=(*self.seed_sequence.spawn_key, block_index))
+        return np.random.default_rng(seed_sequence)
+
+    def generate_chunk(self, n_paths: int, walk_length: int, start_path=0) -> np.ndarray:
+        """
+        경로 번호 start_path ~ start_path + n_paths - 1 의 경로
+        """
+        standardized_returns = self.standardized_returns
+        sample_counts, assets_counts = standardized_returns.shape
+        block_size = self.PATH_BLOCK_SIZE
+        first_block = start_path // block_size
+        end_block = -(-(start_path + n_paths) // block_size)
+
+        # 자산별로 독립적으로 표준화 수익률 복원 추출, block 단위로 뽑은 뒤 필요한 경로만 사용
+        sample_index = np.empty((0, walk_length, assets_counts), dtype=np.int64)
+        if n_paths > 0:
+            sample_index = np.concatenate([
+                self.get_block_rng(block_index).integers(0, sample_counts,
+                                                         size=(block_size, walk_length, assets_counts))
+                for block_index in range(first_block, end_block)
+            ])
+        offset = start_path - first_block * block_size
+        sample_index = sample_index[offset:offset + n_paths]
+
+        z = standardized_returns[sample_index, np.arange(assets_counts)]
+        return self.returns_mean + z @ self.cholesky.T
+
+    def iter_paths(self, n_paths: int, walk_length: int, chunk_size=1000):
+        """
+        yield: (시작 경로 번호, (chunk 경로수, walk_length, 자산수) array)
+        """
+        for start in range(0, n_paths, chunk_size):
+            chunk_paths = min(chunk_size, n_paths - start)
+            yield start, self.generate_chunk(chunk_paths, walk_length, start)
+
+    def generate_paths(self, n_paths: int, walk_length: int, chunk_size=1000) -> np.ndarray:
+        paths = np.empty((n_paths, walk_length, len(self.columns)))
+        for start, chunk in self.iter_paths(n_paths, walk_length, chunk_size):
+            paths[start:start + len(chunk)] = chunk
+        return paths
+
+    def to_dataframe(self, path: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(path, columns=self.columns)
@@ -0,0 +1,177 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from .monte_carlo import MonteCarloGenerator
+from ..backtest.trading_day import TradingDay
+from ..backtest.utils import calc_rebalancing_port_value_array, get_rebalancing_segment_ids
+from ..performance_utils import get_performance_summary_array
+
+DEFAULT_START_DATE = datetime(2000, 1, 3)
+
+# worker 프로세스에서 공유하는 simulation 설정
+_worker_case = {}
+
+
+def get_synthetic_trading_days(walk_length: int, start_date=DEFAULT_START_DATE) -> pd.DatetimeIndex:
+    """
+    시작일(value 100) + walk_length 개의 영업일
+    경로의 i 번째 수익률은 i + 1 번째 날짜의 수익률
+    """
+    return pd.bdate_range(start_date, periods=walk_length + 1)
+
+
+def get_rebalancing_segments(trading_days: pd.DatetimeIndex, rebalancing_periodic: str,
+                             rebalancing_moment: str or int) -> tuple:
+    """
+    return: (시작일을 제외한 리밸런싱 날짜 list, 날짜별 리밸런싱 구간 번호)
+    """
+    trading_day = TradingDay(trading_days.to_series().reset_index(drop=True))
+    rebalancing_days = trading_day.get_rebalancing_days(trading_days[0], trading_days[-1],
+                                                        rebalancing_periodic, rebalancing_moment)
+    rebalancing_days = [date for date in rebalancing_days if date != trading_days[0]]
+    return rebalancing_days, get_rebalancing_segment_ids(trading_days, rebalancing_days)
+
+
+def get_weight_array(weight, columns, segment_counts: int) -> np.ndarray:
+    """
+    weight: pd.Series 이면 매 리밸런싱마다 같은 비중,
+            pd.DataFrame 이면 행 순서대로 구간별 비중 (행 수 = 리밸런싱 횟수 + 1)
+    """
+    if isinstance(weight, pd.Series):
+        weight_series = weight.reindex(columns).fillna(0)
+        return np.tile(weight_series.to_numpy(dtype=float), (segment_counts, 1))
+
+    weight_df = pd.DataFrame(weight).reindex(columns=columns).fillna(0)
+    if len(weight_df) != segment_counts:
+        raise ValueError(f"weight 행 수({len(weight_df)})가 리밸런싱 구간 수({segment_counts})와 다릅니다.")
+    return weight_df.to_numpy(dtype=float)
+
+
+def calc_path_value_array(return_array: np.ndarray, weight_array: np.ndarray, segment_ids: np.ndarray) -> np.ndarray:
+    """
+    return_array: (경로수, walk_length, 자산수)
+    return: (경로수, walk_length + 1) 시작 value 100 기준 포트폴리오 value
+    """
+    path_counts, walk_length, assets_counts = return_array.shape
+    daily_return_array = np.zeros((path_counts, walk_length + 1, assets_counts), dtype=return_array.dtype)
+    daily_return_array[:, 1:] = return_array
+    value_array = calc_rebalancing_port_value_array(daily_return_array, weight_array, segment_ids)
+    return value_array.sum(axis=-1) * 100
+
+
+def calc_strategy_value_array(return_array: np.ndarray, strategy_class, strategy_kwargs: dict,
+                              trading_days: pd.DatetimeIndex, columns) -> np.ndarray:
+    """
+    경로별 가격 DataFrame 을 만들어 LightStrategy 를 실행
+    return: (경로수, walk_length + 1) 포트폴리오 value
+    """
+    value_list = []
+    for path in return_array:
+        price_array = np.empty((len(path) + 1, path.shape[1]))
+        price_array[0] = 100
+        np.cumprod(1 + path, axis=0, out=price_array[1:])
+        price_array[1:] *= 100
+
+        kwargs = {
+            **strategy_kwargs,
+            "start_date": trading_days[0],
+            "end_date": trading_days[-1],
+            "daily_price_df": pd.DataFrame(price_array, index=trading_days, columns=columns),
+        }
+        strategy = strategy_class(**kwargs)
+        strategy.run()
+        port_value = strategy.result['performance']['port_value']
+        value_list.append(port_value.reindex(trading_days).to_numpy())
+    if len(value_list) == 0:
+        return np.empty((0, len(trading_days)))
+    return np.stack(value_list)
+
+
+def simulate_chunk(return_array: np.ndarray, case: dict) -> np.ndarray:
+    """
+    return: (경로수, 5) 누적수익률, CAGR, Ann.Std, MDD, 샤프지수
+    """
+    trading_days = case['trading_days']
+    if case['strategy_class'] is None:
+        value_array = calc_path_value_array(return_array, case['weight_array'], case['segment_ids'])
+    else:
+        value_array = calc_strategy_value_array(return_array, case['strategy_class'], case['strategy_kwargs'],
+                                                trading_days, case['columns'])
+    return get_performance_summary_array(value_array, trading_days[1], trading_days[-1]).to_numpy()
+
+
+def _init_worker(case: dict):
+    _worker_case.clear()
+    _worker_case.update(case)
+
+
+def _run_worker_chunk(chunk) -> np.ndarray:
+    """
+    chunk: (시작 경로 번호, 경로수) 이면 worker 에서 경로 생성, array 이면 그대로 사용
+    """
+    if isinstance(chunk, tuple):
+        start_path, chunk_paths = chunk
+        chunk = _worker_case['generator'].generate_chunk(chunk_paths, _worker_case['walk_length'], start_path)
+    return simulate_chunk(chunk, _worker_case)
+
+
+def simulate_strategy_performance(paths, weight=None, strategy_class=None, strategy_kwargs=None,
+                                  n_paths=None, walk_length=None,
+                                  rebalancing_periodic='monthly', rebalancing_moment='first',
+                                  start_date=DEFAULT_START_DATE, chunk_size=1000,
+                                  max_workers=None, mp_context=None) -> pd.DataFrame:
+    """
+    monte carlo 경로별로 전략을 실행하여 성과 분포 계산
+    paths: MonteCarloGenerator (n_paths, walk_length 필요, worker 에서 chunk 단위 생성),
+           generate_single_case 결과 DataFrame list 또는 (경로수, walk_length, 자산수) array
+    weight: 비중 (get_weight_array 참고), 리밸런싱 kernel 로 chunk 단위 일괄 계산
+    strategy_class: weight 대신 경로마다 실행할 LightStrategy 클래스 (strategy_kwargs 로 생성)
+    return: 경로 순서의 누적수익률, CAGR, Ann.Std, MDD, 샤프지수 DataFrame
+    """
+    if (weight is None) == (strategy_class is None):
+        raise ValueError("weight 와 strategy_class 중 하나만 지정해야 합니다.")
+
+    generator = None
+    if isinstance(paths, MonteCarloGenerator):
+        if n_paths is None or walk_length is None:
+            raise ValueError("MonteCarloGenerator 사용시 n_paths, walk_length 를 지정해야 합니다.")
+        generator = paths
+        columns = generator.columns
+        chunk_list = [(start, min(chunk_size, n_paths - start)) for start in range(0, n_paths, chunk_size)]
+    else:
+        if isinstance(paths, np.ndarray):
+            return_array = paths
+            columns = pd.RangeIndex(return_array.shape[-1])
+        else:
+            columns = paths[0].columns
+            return_array = np.stack([path_df.reindex(columns=columns).to_numpy(dtype=float) for path_df in paths])
+        n_paths, walk_length = return_array.shape[:2]
+        chunk_list = [return_array[start:start + chunk_size] for start in range(0, n_paths, chunk_size)]
+
+    trading_days = get_synthetic_trading_days(walk_length, start_date)
+    rebalancing_days, segment_ids = get_rebalancing_segments(trading_days, rebalancing_periodic, rebalancing_moment)
+    case = {
+        'generator': generator,
+        'walk_length': walk_length,
+        'columns': columns,
+        'trading_days': trading_days,
+        'segment_ids': segment_ids,
+        'weight_array': None if weight is None else get_weight_array(weight, columns, len(rebalancing_days) + 1),
+        'strategy_class': strategy_class,
+        'strategy_kwargs': {} if strategy_kwargs is None else strategy_kwargs,
+    }
+
+    if max_workers == 1 or len(chunk_list) <= 1:
+        _init_worker(case)
+        try:
+            summary_list = [_run_worker_chunk(chunk) for chunk in chunk_list]
+        finally:
+            _worker_case.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, initializer=_init_worker,
+                                 initargs=(case,)) as executor:
+            summary_list = list(executor.map(_run_worker_chunk, chunk_list))
+
+    summary_array = np.concatenate(summary_list) if summary_list else np.empty((0, 5))
+    return pd.DataFrame(summary_array, columns=["누적수익률", "CAGR", "Ann.Std", "MDD", "샤프지수"])
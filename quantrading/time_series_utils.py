@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
 
@@ -19,13 +21,65 @@ def get_rolling_returns(price_series: pd.Series, window_list=None) -> pd.DataFra
     if window_list is None:
         window_list = [21, 63, 126, 252]
 
-    df = pd.DataFrame()
-    for window in window_list:
-        name = f"Rolling{window}Returns"
-        rolling_returns = price_series.pct_change().add(1).rolling(window=window).agg(lambda x: x.prod()) - 1
-        rolling_returns.name = name
-        df = pd.concat([df, rolling_returns], axis=1)
-    return df
+    daily_returns = price_series.pct_change().to_numpy(dtype=float)[:, np.newaxis]
+    rolling_returns = calc_rolling_returns_array(daily_returns, window_list)[:, 0, :]
+    return pd.DataFrame(rolling_returns, index=price_series.index,
+                        columns=[f"Rolling{window}Returns" for window in window_list])
+
+
+def calc_rolling_returns_array(daily_return_array: np.ndarray, window_list: list) -> np.ndarray:
+    """
+    daily_return_array: (일수, ticker 수) 일간 수익률
+    return: (일수, ticker 수, window 수) window 기간 누적 수익률, window 안에 결측이 있으면 NaN
+    누적 로그 가격 한 번으로 모든 window 계산, 수익률 -100% 는 별도로 집계
+    """
+    date_counts, ticker_counts = daily_return_array.shape
+    is_missing = np.isnan(daily_return_array)
+    growth = 1 + np.where(is_missing, 0, daily_return_array)
+    is_zero = growth <= 0
+
+    def cumsum_with_zero_row(values: np.ndarray) -> np.ndarray:
+        cumulative = np.zeros((date_counts + 1, ticker_counts), dtype=float)
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        return cumulative
+
+    cumulative_log_price = cumsum_with_zero_row(np.log(np.where(is_zero, 1, growth)))
+    cumulative_missing = cumsum_with_zero_row(is_missing)
+    cumulative_zero = cumsum_with_zero_row(is_zero)
+
+    rolling_returns = np.full((date_counts, ticker_counts, len(window_list)), np.nan)
+    for i, window in enumerate(window_list):
+        if window > date_counts:
+            continue
+        end = slice(window, date_counts + 1)
+        start = slice(0, date_counts + 1 - window)
+        window_returns = np.expm1(cumulative_log_price[end] - cumulative_log_price[start])
+        window_returns[cumulative_zero[end] - cumulative_zero[start] > 0] = -1
+        window_returns[cumulative_missing[end] - cumulative_missing[start] > 0] = np.nan
+        rolling_returns[window - 1:, :, i] = window_returns
+    return rolling_returns
+
+
+def get_panel_rolling_returns(price_df: pd.DataFrame, window_list=None, chunk_size=500) -> pd.DataFrame:
+    """
+    날짜 x ticker 가격 DataFrame 의 rolling 수익률 (get_rolling_returns 의 panel 버전)
+    chunk_size 개 column 씩 계산하여 중간 array 메모리 제한
+    return: (date, ticker) MultiIndex, Rolling{window}Returns column
+    """
+    if window_list is None:
+        window_list = [21, 63, 126, 252]
+
+    daily_return_df = price_df.pct_change()
+    date_counts, ticker_counts = daily_return_df.shape
+    rolling_returns = np.empty((date_counts, ticker_counts, len(window_list)))
+    for start in range(0, ticker_counts, chunk_size):
+        columns = slice(start, start + chunk_size)
+        daily_returns = daily_return_df.iloc[:, columns].to_numpy(dtype=float)
+        rolling_returns[:, columns] = calc_rolling_returns_array(daily_returns, window_list)
+
+    index = pd.MultiIndex.from_product([price_df.index, price_df.columns], names=["date", "ticker"])
+    return pd.DataFrame(rolling_returns.reshape(date_counts * ticker_counts, len(window_list)), index=index,
+                        columns=[f"Rolling{window}Returns" for window in window_list])
 
 
 def get_future_returns(price_series: pd.Series, shift_list=None) -> pd.DataFrame:
@@ -118,3 +172,186 @@ def get_vol(price_series: pd.Series, window_list) -> pd.DataFrame:
         df = pd.concat([df, temp_ma], axis=1)
     df.columns = [f"{window}VOL" for window in window_list]
     return df
+
+
+def calc_panel_features(value_df: pd.DataFrame, feature_names: list, calc_block, max_workers=None,
+                        block_size=256) -> pd.DataFrame:
+    """
+    날짜 x ticker DataFrame 의 ticker 별 feature 를 미리 할당한 (일수, ticker 수, feature 수) array 에 계산
+    calc_block(values, out): (일수, block ticker 수) 값으로 out (일수, block ticker 수, feature 수) 를 채움
+    column block 단위로 thread pool 에서 실행 (numpy 연산은 GIL 을 해제)
+    return: (ticker, feature 이름) MultiIndex column DataFrame
+    """
+    values = value_df.to_numpy(dtype=float)
+    date_counts, ticker_counts = values.shape
+    features = np.empty((date_counts, ticker_counts, len(feature_names)))
+
+    def calc(start: int):
+        columns = slice(start, start + block_size)
+        calc_block(values[:, columns], features[:, columns])
+
+    block_starts = range(0, ticker_counts, block_size)
+    if max_workers == 1 or len(block_starts) <= 1:
+        for start in block_starts:
+            calc(start)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(calc, block_starts))
+
+    columns = pd.MultiIndex.from_product([value_df.columns, feature_names])
+    return pd.DataFrame(features.reshape(date_counts, ticker_counts * len(feature_names)), index=value_df.index,
+                        columns=columns)
+
+
+def shift_array(values: np.ndarray, shift: int) -> np.ndarray:
+    """
+    pd.DataFrame.shift 와 같이 행 방향 이동, 빈 자리는 NaN
+    """
+    shifted = np.full_like(values, np.nan)
+    if abs(shift) >= len(values):
+        return shifted
+    if shift >= 0:
+        shifted[shift:] = values[:len(values) - shift]
+    else:
+        shifted[:shift] = values[-shift:]
+    return shifted
+
+
+def calc_rolling_mean_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    rolling(window).mean() 과 동일, window 안에 결측이 있으면 NaN
+    """
+    rolling_mean = np.full_like(values, np.nan)
+    if window > len(values):
+        return rolling_mean
+    is_missing = np.isnan(values)
+    cumulative = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(np.where(is_missing, 0, values), axis=0, out=cumulative[1:])
+    cumulative_missing = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(is_missing, axis=0)])
+
+    window_sum = cumulative[window:] - cumulative[:-window]
+    window_missing = cumulative_missing[window:] - cumulative_missing[:-window]
+    rolling_mean[window - 1:] = np.where(window_missing > 0, np.nan, window_sum / window)
+    return rolling_mean
+
+
+def calc_rolling_std_array(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    rolling(window).std() 과 동일 (ddof=1), window 안에 결측이 있으면 NaN
+    정밀도를 위해 column 평균을 뺀 값으로 계산
+    """
+    rolling_std = np.full_like(values, np.nan)
+    if window < 2 or window > len(values):
+        return rolling_std
+    with np.errstate(invalid='ignore'):
+        centered = values - np.nanmean(values, axis=0)
+    rolling_mean = calc_rolling_mean_array(centered, window)
+    rolling_square_mean = calc_rolling_mean_array(centered ** 2, window)
+    variance = (rolling_square_mean - rolling_mean ** 2) * window / (window - 1)
+    rolling_std[:] = np.sqrt(np.maximum(variance, 0))
+    return rolling_std
+
+
+def _get_shift_returns_calculator(shift_list: list, base_feature=False):
+    """
+    shift 가 양수이면 과거 대비 수익률 (D-n), 음수이면 미래 수익률 (D+n)
+    base_feature=True 이면 마지막 feature 에 가격 자체 기록
+    """
+    def calc_block(price: np.ndarray, out: np.ndarray):
+        for i, shift in enumerate(shift_list):
+            shifted_price = shift_array(price, shift)
+            if shift >= 0:
+                out[:, :, i] = (price - shifted_price) / shifted_price
+            else:
+                out[:, :, i] = (shifted_price - price) / price
+        if base_feature:
+            out[:, :, -1] = price
+    return calc_block
+
+
+def get_panel_past_returns(price_df: pd.DataFrame, shift_list=None, max_workers=None) -> pd.DataFrame:
+    """
+    get_past_returns 의 panel 버전, (ticker, "D-n") column
+    """
+    if shift_list is None:
+        shift_list = [21, 63, 126, 252]
+    return calc_panel_features(price_df, [f"D-{shift}" for shift in shift_list],
+                               _get_shift_returns_calculator(shift_list), max_workers)
+
+
+def get_panel_future_returns(price_df: pd.DataFrame, shift_list=None, max_workers=None) -> pd.DataFrame:
+    """
+    get_future_returns 의 panel 버전, (ticker, "D+n") column
+    """
+    if shift_list is None:
+        shift_list = [-21, -63]
+    return calc_panel_features(price_df, [f"D+{-shift}" for shift in shift_list],
+                               _get_shift_returns_calculator(shift_list), max_workers)
+
+
+def add_panel_both_side_returns(price_df: pd.DataFrame, remove_base=True, max_workers=None) -> pd.DataFrame:
+    """
+    add_both_side_returns 의 panel 버전
+    remove_base=False 이면 (ticker, ticker) column 에 가격 포함
+    """
+    past_shift_list = [21, 63, 126, 252]
+    future_shift_list = [-21, -63]
+    feature_names = [f"D-{shift}" for shift in past_shift_list] + [f"D+{-shift}" for shift in future_shift_list]
+    df = calc_panel_features(price_df, feature_names + ["__base__"],
+                             _get_shift_returns_calculator(past_shift_list + future_shift_list, base_feature=True),
+                             max_workers)
+    if remove_base:
+        return df.drop(columns="__base__", level=1)
+
+    # 기존 함수와 같이 과거 수익률, 가격, 미래 수익률 순서
+    columns = []
+    for ticker in price_df.columns:
+        columns += [(ticker, name) for name in feature_names[:len(past_shift_list)]]
+        columns.append((ticker, "__base__"))
+        columns += [(ticker, name) for name in feature_names[len(past_shift_list):]]
+    df = df.loc[:, columns]
+    df.columns = pd.MultiIndex.from_tuples([(ticker, ticker if name == "__base__" else name)
+                                            for ticker, name in columns])
+    return df
+
+
+def add_panel_ma_price(price_df: pd.DataFrame, ma_list: list, max_workers=None) -> pd.DataFrame:
+    """
+    add_ma_price 의 panel 버전, (ticker, ticker) 가격과 (ticker, "nMA") column
+    """
+    def calc_block(price: np.ndarray, out: np.ndarray):
+        out[:, :, 0] = price
+        for i, ma in enumerate(ma_list):
+            out[:, :, i + 1] = calc_rolling_mean_array(price, ma)
+
+    df = calc_panel_features(price_df, ["__base__"] + [f"{ma}MA" for ma in ma_list], calc_block, max_workers)
+    df.columns = pd.MultiIndex.from_tuples([(ticker, ticker if name == "__base__" else name)
+                                            for ticker, name in df.columns])
+    return df
+
+
+def get_panel_ma(price_df: pd.DataFrame, ma_list=None, max_workers=None) -> pd.DataFrame:
+    """
+    get_ma 의 panel 버전, (ticker, "nMA") column
+    ticker 마다 결측 구간이 다르므로 결측 행은 제거하지 않음
+    """
+    if ma_list is None:
+        ma_list = [21, 63, 126, 252]
+
+    def calc_block(price: np.ndarray, out: np.ndarray):
+        for i, ma in enumerate(ma_list):
+            out[:, :, i] = calc_rolling_mean_array(price, ma)
+
+    return calc_panel_features(price_df, [f"{ma}MA" for ma in ma_list], calc_block, max_workers)
+
+
+def get_panel_vol(price_df: pd.DataFrame, window_list, max_workers=None) -> pd.DataFrame:
+    """
+    get_vol 의 panel 버전, (ticker, "nVOL") column
+    """
+    def calc_block(daily_returns: np.ndarray, out: np.ndarray):
+        for i, window in enumerate(window_list):
+            out[:, :, i] = calc_rolling_std_array(daily_returns, window)
+
+    return calc_panel_features(price_df.pct_change(), [f"{window}VOL" for window in window_list], calc_block,
+                               max_workers)
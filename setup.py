@@ -12,7 +12,8 @@ setup(
     author_email="dnwogo@naver.com",
     description="backtest utils",
     install_requires=[
-        'empyrical',
+        'numpy',
+        'pandas',
         'openpyxl',
         'xlsxwriter',
         'plotly',
@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.backtest.simulation_result_utils import save_simulation_result_to_excel_file
+
+
+class FixedWeightStrategy(qt.Strategy):
+    def on_data(self):
+        self.reserve_order(pd.Series({'A': 0.6, 'B': 0.4}))
+
+
+class FixedWeightOpenCloseStrategy(qt.OpenCloseStrategy):
+    def on_data(self):
+        self.set_allocation({'A': 0.6, 'B': 0.3, 'cash': 0.1})
+
+
+class FixedWeightLightStrategy(qt.LightStrategy):
+    def on_data(self):
+        self.reserve_order({'A': 0.6, 'B': np.nan})
+
+
+class SkipOrderLightStrategy(qt.LightStrategy):
+    def on_data(self):
+        if self.date.month != 2:
+            self.reserve_order({'A': 0.6, 'B': 0.4})
+
+
+class BackTestRunTestCase(unittest.TestCase):
+    """
+    기대값은 달력일을 순회하고 DataFrame 에 행을 추가하던 기존 run 의 결과
+    """
+
+    def setUp(self):
+        index = pd.bdate_range("2020-01-01", "2020-03-31")
+        i = np.arange(len(index))
+        self.market_close_df = pd.DataFrame({'A': 100 * 1.01 ** i, 'B': 100 + 10 * np.sin(i / 5)}, index=index)
+        self.market_open_price_df = self.market_close_df.shift(1).fillna(100) * 1.002
+        self.kwargs = {
+            "start_date": index[0],
+            "end_date": index[-1],
+            "rebalancing_periodic": "monthly",
+            "rebalancing_moment": "first",
+            "portfolio_transaction_fee": 0.001,
+        }
+        self.log_dates = pd.to_datetime(["2020-01-01", "2020-01-02", "2020-01-31", "2020-02-03", "2020-03-02",
+                                         "2020-03-31"])
+
+    def assert_portfolio_log(self, portfolio_log: pd.DataFrame, expected: list):
+        self.assertEqual(len(portfolio_log), 65)
+        self.assertEqual(sorted(portfolio_log.columns), ['A_amount', 'B_amount', 'cash', 'port_value'])
+        columns = ['port_value', 'cash', 'A_amount', 'B_amount']
+        np.testing.assert_allclose(portfolio_log.loc[self.log_dates, columns].to_numpy(dtype=float), expected,
+                                   rtol=1e-10, atol=1e-12)
+
+    def test_strategy_run(self):
+        strategy = FixedWeightStrategy(market_close_df=self.market_close_df, **self.kwargs)
+        strategy.run()
+
+        self.assert_portfolio_log(strategy.portfolio_log, [
+            [100.0, 100.0, np.nan, np.nan],
+            [101.29306688585707, 0.024, 60.51518424, 40.75388264585707],
+            [110.75982343875431, 0.024, 74.57842532601683, 36.15739811273748],
+            [111.33742032875767, 0.024, 75.324209579277, 35.98921074948067],
+            [134.5724574122748, -0.005113054429212838, 81.51168681519017, 53.06588365151383],
+            [150.81331782196304, -0.00046092742069570036, 99.50760714458245, 51.30617160480128],
+        ])
+
+    def test_open_close_strategy_run(self):
+        strategy = FixedWeightOpenCloseStrategy(market_close_df=self.market_close_df,
+                                                market_open_price_df=self.market_open_price_df,
+                                                sell_delay=0, buy_delay=1, **self.kwargs)
+        strategy.run()
+
+        self.assert_portfolio_log(strategy.portfolio_log, [
+            [100.0, 100.0, np.nan, np.nan],
+            [100.92296605228822, 10.0, 60.41856287425149, 30.50440317803673],
+            [111.52327067667001, 10.0, 74.45934993360304, 27.06392074306697],
+            [112.07394404414663, 17.564905824353577, 67.57100622167879, 26.938031998114266],
+            [133.37109556409513, 13.323231901937072, 80.59243384973979, 39.45542981241825],
+            [150.22442423881117, 12.774215186554335, 99.32146592940401, 38.128743122852825],
+        ])
+
+    def test_profile(self):
+        strategy_list = [
+            FixedWeightStrategy(market_close_df=self.market_close_df, profile=True, **self.kwargs),
+            FixedWeightOpenCloseStrategy(market_close_df=self.market_close_df,
+                                         market_open_price_df=self.market_open_price_df,
+                                         sell_delay=0, buy_delay=1, profile=True, **self.kwargs),
+        ]
+        phase_list = [
+            ["initialize", "on_start_of_day", "execute_reservation_order", "on_data", "on_end_of_day",
+             "on_end_of_algorithm", "log_portfolio_value", "update_portfolio_value"],
+            ["initialize", "on_start_of_day", "on_data", "update_portfolio_value", "reserve_allocation_order",
+             "execute_reservation_order", "on_end_of_algorithm"],
+        ]
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, ignore_errors=True)
+        for strategy, phases in zip(strategy_list, phase_list):
+            strategy.run()
+            profile = strategy.get_result()['profile']
+            self.assertTrue(set(phases).issubset(profile['phases'].index))
+            self.assertEqual(profile['phases'].loc['on_data', 'calls'], 3)
+            self.assertEqual(profile['days'], 65)
+            self.assertGreater(profile['run_seconds'], 0)
+
+            path = os.path.join(folder, f"{type(strategy).__name__}.xlsx")
+            save_simulation_result_to_excel_file(strategy.get_result(), path)
+            profile_sheet = pd.read_excel(path, sheet_name="profile", index_col=0)
+            self.assertTrue(set(phases).issubset(profile_sheet.index))
+            self.assertEqual(profile_sheet.loc['run', 'calls'], 65)
+
+        strategy = FixedWeightStrategy(market_close_df=self.market_close_df, **self.kwargs)
+        strategy.run()
+        self.assertNotIn('profile', strategy.get_result())
+
+    def test_light_strategy_weight_dict_list(self):
+        strategy = FixedWeightLightStrategy(daily_price_df=self.market_close_df, **self.kwargs)
+        strategy.run()
+
+        weight_dict_list = strategy.weight_dict_list
+        self.assertEqual(len(weight_dict_list), len(strategy.rebalancing_days))
+        self.assertEqual(weight_dict_list[0], {'A': 0.6, 'B': 0.0, 'date': strategy.rebalancing_days[0]})
+        weight_dict_list.clear()
+        self.assertEqual(len(strategy.weight_dict_list), len(strategy.rebalancing_days))
+        with self.assertRaises(AttributeError):
+            strategy.weight_dict_list = []
+
+    def test_light_strategy_order_counts(self):
+        strategy = SkipOrderLightStrategy(daily_price_df=self.market_close_df, **self.kwargs)
+        with self.assertRaisesRegex(ValueError, r"주문 수\(2\)가 리밸런싱 구간 수\(3\)"):
+            strategy.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
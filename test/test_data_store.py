@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+import pandas as pd
+from quantrading.backtest.data_store import PointInTimeSlicer, PointInTimeDataStore
+
+
+class PointInTimeSlicerTestCase(unittest.TestCase):
+    def setUp(self):
+        index = pd.bdate_range("2020-01-01", periods=10)
+        self.df = pd.DataFrame({'A': np.arange(10.0), 'B': np.arange(10.0) * 2}, index=index)
+        self.date = index[4]
+
+    def assert_point_in_time(self, df: pd.DataFrame):
+        slicer = PointInTimeSlicer(df)
+        pd.testing.assert_frame_equal(slicer.get(self.date), df.loc[df.index < self.date])
+        pd.testing.assert_frame_equal(slicer.get(self.date, exclude_today_data=False), df.loc[df.index <= self.date])
+
+        # 영업일이 아닌 날짜
+        weekend = pd.Timestamp("2020-01-04")
+        pd.testing.assert_frame_equal(slicer.get(weekend), df.loc[df.index < weekend])
+        self.assertEqual(len(slicer.get(pd.Timestamp("2019-12-31"))), 0)
+
+    def test_sorted_index(self):
+        self.assert_point_in_time(self.df)
+
+    def test_unsorted_index(self):
+        self.assert_point_in_time(self.df.iloc[[3, 1, 7, 0, 9, 4, 2, 8, 6, 5]])
+
+    def test_source_not_modified(self):
+        slicer = PointInTimeSlicer(self.df)
+        sliced_df = slicer.get(self.date)
+        sliced_df.iloc[0, 0] = -1
+        self.assertEqual(self.df.iloc[0, 0], 0)
+
+    def test_data_store(self):
+        slicer_dict = {"market_close_df": PointInTimeSlicer(self.df),
+                       "index_df": PointInTimeSlicer(self.df[['A']])}
+        data_store = PointInTimeDataStore(slicer_dict, self.date, exclude_today_data=False)
+
+        self.assertEqual(list(data_store), ["market_close_df", "index_df"])
+        self.assertIs(data_store["market_close_df"], data_store["market_close_df"])
+        self.assertEqual(data_store["market_close_df"].index[-1], self.date)
+        self.assertEqual(len(data_store.to_dict()["index_df"]), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
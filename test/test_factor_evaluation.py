@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+
+
+class FactorEvaluationTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", periods=120)
+        tickers = [f"T{i}" for i in range(12)]
+        self.price_df = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.02, (120, 12)), axis=0), index=index,
+                                     columns=tickers)
+        self.price_df.iloc[:30, 0] = np.nan
+        self.score_df = pd.DataFrame(rng.normal(size=(120, 12)), index=index, columns=tickers)
+        self.rebalancing_days = [index[0], index[25], index[50], index[75], index[119]]
+
+    def test_evaluate_factor_quantiles(self):
+        result = qt.evaluate_factor_quantiles(self.score_df, self.price_df, quantiles=3,
+                                              rebalancing_days=self.rebalancing_days)
+        quantile_returns = result["quantile_returns"]
+        self.assertEqual(len(quantile_returns), 4)
+
+        for start_date, end_date in zip(self.rebalancing_days[:-1], self.rebalancing_days[1:]):
+            score_series = self.score_df.loc[start_date].where(self.price_df.loc[start_date].notna())
+            forward_returns = self.price_df.loc[end_date] / self.price_df.loc[start_date] - 1
+            for tile in range(3):
+                first_quantile, _ = qt.divide_code_list_by_quantiles(score_series, 3, tile)
+                self.assertAlmostEqual(quantile_returns.loc[start_date, tile], forward_returns[first_quantile].mean())
+
+            valid = pd.concat([score_series, forward_returns], axis=1).dropna()
+            self.assertAlmostEqual(result["ic"].loc[start_date, "IC"], valid.corr().iloc[0, 1])
+            self.assertAlmostEqual(result["ic"].loc[start_date, "rank_IC"], valid.rank().corr().iloc[0, 1])
+
+        np.testing.assert_allclose(quantile_returns["long_short"], quantile_returns[0] - quantile_returns[2])
+        expected_value = 100 * (1 + quantile_returns[1]).prod()
+        self.assertAlmostEqual(result["quantile_value"][1].iloc[-1], expected_value)
+        np.testing.assert_allclose(result["turnover"].iloc[0], 0.5)
+        self.assertTrue((result["quantile_codes"].loc[self.rebalancing_days[0], "T0"] == -1))
+
+    def test_trading_day_schedule(self):
+        result = qt.evaluate_factor_quantiles(self.score_df, self.price_df, quantiles=4,
+                                              rebalancing_periodic="monthly", rebalancing_moment="first")
+        self.assertEqual(result["quantile_value"].index[0], self.price_df.index[0])
+        self.assertEqual(list(result["summary"]["quantile"].index), [0, 1, 2, 3, "long_short"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+
+
+def get_weighted_sum(data: pd.DataFrame, weights: pd.Series, scale: np.ndarray):
+    return data.sum(axis=1) * weights.sum() * scale.sum()
+
+
+class FeatureStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", periods=200)
+        self.price_df = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.02, (200, 3)), axis=0), index=index,
+                                     columns=["A", "B", "C"])
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, ignore_errors=True)
+
+    def test_cache(self):
+        store = qt.FeatureStore(self.folder)
+        result = store.get(qt.get_panel_vol, self.price_df, [5, 21])
+        self.assertEqual((store.hits, store.misses), (0, 1))
+
+        store.get(qt.get_panel_vol, self.price_df, window_list=[5, 21])
+        self.assertEqual((store.hits, store.misses), (1, 1))
+
+        # 다른 프로세스와 같이 새 store 는 disk 에서 load
+        new_store = qt.FeatureStore(self.folder)
+        pd.testing.assert_frame_equal(new_store.get(qt.get_panel_vol, self.price_df, [5, 21]), result)
+        self.assertEqual(new_store.hits, 1)
+
+        changed_price_df = self.price_df.copy()
+        changed_price_df.iloc[10, 0] += 1
+        new_store.get(qt.get_panel_vol, changed_price_df, [5, 21])
+        new_store.cached(qt.get_ma)(self.price_df["A"], [5])
+        self.assertEqual(new_store.misses, 2)
+        self.assertEqual(len(os.listdir(self.folder)), 3)
+
+    def test_function_key(self):
+        store = qt.FeatureStore(self.folder)
+        ma_df = store.get(lambda data: qt.get_panel_ma(data, [5]), self.price_df)
+        vol_df = store.get(lambda data: qt.get_panel_vol(data, [5]), self.price_df)
+        self.assertEqual(store.misses, 2)
+        self.assertFalse(ma_df.columns.equals(vol_df.columns))
+
+        def make_feature_func(window):
+            def feature_func(data):
+                return qt.get_panel_ma(data, [window])
+            return feature_func
+
+        self.assertNotEqual(qt.feature_store.get_feature_key(make_feature_func(5), self.price_df),
+                            qt.feature_store.get_feature_key(make_feature_func(20), self.price_df))
+        self.assertEqual(qt.feature_store.get_feature_key(make_feature_func(5), self.price_df),
+                         qt.feature_store.get_feature_key(make_feature_func(5), self.price_df))
+
+    def test_large_parameter_key(self):
+        store = qt.FeatureStore(self.folder)
+        weights = pd.Series(np.zeros(5000))
+        scale = np.ones(5000)
+        changed_weights = weights.copy()
+        changed_weights.iloc[2500] = 1
+        changed_scale = scale.copy()
+        changed_scale[2500] = 2
+
+        self.assertEqual(store.get(get_weighted_sum, self.price_df, weights, scale).abs().sum(), 0)
+        result = store.get(get_weighted_sum, self.price_df, changed_weights, scale)
+        pd.testing.assert_series_equal(result, self.price_df.sum(axis=1) * 5000)
+        store.get(get_weighted_sum, self.price_df, weights, scale=changed_scale)
+        self.assertEqual((store.hits, store.misses), (0, 3))
+
+        store.get(get_weighted_sum, self.price_df, weights=changed_weights, scale=scale.copy())
+        self.assertEqual(store.hits, 1)
+
+    def test_disk_eviction(self):
+        store = qt.FeatureStore(self.folder, max_disk_bytes=0)
+        store.get(qt.get_panel_vol, self.price_df, [5])
+        self.assertEqual(os.listdir(self.folder), [])
+        store.get(qt.get_panel_vol, self.price_df, [5])
+        self.assertEqual(store.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
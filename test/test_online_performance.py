@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.backtest.online_performance import OnlinePerformance
+from quantrading.backtest.simulation_result_utils import calc_performance_from_value_history
+
+
+class OnlinePerformanceTestCase(unittest.TestCase):
+    def test_same_as_value_history(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2019-11-15", periods=600)
+        value_series = pd.Series(100 * np.cumprod(1 + rng.normal(0.0003, 0.012, 600)), index=index)
+
+        online_performance = OnlinePerformance()
+        for date, value in value_series.items():
+            online_performance.update(date, value)
+        expected = calc_performance_from_value_history(value_series)
+
+        result_summary = online_performance.get_performance_summary()
+        expected_summary = expected['performance_summary']
+        self.assertEqual(result_summary.loc["시작일"], expected_summary.loc["시작일"])
+        self.assertEqual(result_summary.loc["종료일"], expected_summary.loc["종료일"])
+        for key in ["누적수익률", "CAGR", "Ann.Std", "MDD", "샤프지수"]:
+            self.assertAlmostEqual(result_summary.loc[key], expected_summary.loc[key], places=12)
+
+        np.testing.assert_allclose(online_performance.get_monthly_returns().values,
+                                   expected['monthly_returns'].values, atol=1e-12)
+        np.testing.assert_allclose(online_performance.get_annual_summary().values,
+                                   expected['annual_summary'].values, atol=1e-12)
+
+
+class HalfHalfStrategy(qt.Strategy):
+    def on_data(self):
+        self.reserve_order(pd.Series({'A': 0.5, 'B': 0.5}))
+
+
+class StrategyTurnoverTestCase(unittest.TestCase):
+    def test_strategy_turnover(self):
+        index = pd.bdate_range("2020-01-01", "2020-02-28")
+        market_close_df = pd.DataFrame({'A': 100.0, 'B': np.where(index.month == 1, 100.0, 120.0)}, index=index)
+        strategy = HalfHalfStrategy(market_close_df=market_close_df, start_date=index[0], end_date=index[-1],
+                                    rebalancing_periodic="monthly", rebalancing_moment="first")
+        strategy.run()
+
+        # 1/2 현금에서 50:50 매수, 2/4 A 50 : B 60 -> 50:50
+        turnover_weight = strategy.get_result()['turnover_weight']
+        self.assertEqual(turnover_weight.index.to_list(), [pd.Timestamp("2020-01-02"), pd.Timestamp("2020-02-04")])
+        np.testing.assert_allclose(turnover_weight.to_numpy(dtype=float), [0.5, 1 / 22])
+        self.assertAlmostEqual(strategy.online_performance.turnover, 0.5 + 1 / 22)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from quantrading.backtest.order_queue import OrderQueue, OrderWeightLog
+
+
+class OrderQueueTestCase(unittest.TestCase):
+    def test_reserve_and_pop(self):
+        tickers = ['A', 'B']
+        order_queue = OrderQueue(tickers)
+        order_queue.reserve(3, np.array([0]), np.array([-np.inf]))
+        order_queue.reserve(3, np.array([0, 1]), np.array([5.0, 10.0]))
+        order_queue.reserve(5, np.array([], dtype=int), np.array([]))
+        tickers.append('C')
+
+        self.assertIn(3, order_queue)
+        self.assertIn(5, order_queue)
+        order_amounts, ordered = order_queue.pop(3)
+        np.testing.assert_array_equal(order_amounts, [-np.inf, 10, 0])
+        np.testing.assert_array_equal(ordered, [True, True, False])
+        self.assertNotIn(3, order_queue)
+        self.assertFalse(order_queue.pop(5)[1].any())
+
+    def test_order_weight_log(self):
+        tickers = ['A', 'B']
+        order_weight_log = OrderWeightLog(tickers)
+        turnover = order_weight_log.record(datetime(2020, 1, 2), np.array([-20.0, 0]), np.array([True, False]), 100)
+        tickers.append('C')
+        order_weight_log.record(datetime(2020, 1, 3), np.array([0, 0, 30.0]), np.array([False, False, True]), 100)
+
+        self.assertAlmostEqual(turnover, 0.1)
+        order_weight_df = order_weight_log.to_frame()
+        self.assertEqual(list(order_weight_df.columns), ['A', 'C'])
+        self.assertAlmostEqual(order_weight_df.loc[datetime(2020, 1, 2), 'A'], -0.2)
+        self.assertTrue(np.isnan(order_weight_df.loc[datetime(2020, 1, 2), 'C']))
+
+
+if __name__ == '__main__':
+    unittest.main()
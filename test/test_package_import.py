@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+
+class PackageImportTestCase(unittest.TestCase):
+    def run_in_fresh_interpreter(self, code):
+        return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    def test_submodule_access(self):
+        for name in ["backtest", "simulation", "performance_utils", "time_series_utils", "utils", "feature_store"]:
+            completed = self.run_in_fresh_interpreter(
+                f"import quantrading as qt; print(qt.{name}.__name__)")
+            self.assertEqual(completed.returncode, 0, completed.stderr)
+            self.assertEqual(completed.stdout.strip(), f"quantrading.{name}")
+
+    def test_public_name_access(self):
+        completed = self.run_in_fresh_interpreter(
+            "import quantrading as qt; print(qt.Strategy.__name__, qt.get_draw_down.__name__)")
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout.split(), ["Strategy", "get_draw_down"])
+
+    def test_unknown_attribute(self):
+        completed = self.run_in_fresh_interpreter(
+            "import quantrading as qt\n"
+            "try:\n"
+            "    qt.no_such_module\n"
+            "except AttributeError:\n"
+            "    print('AttributeError')")
+        self.assertEqual(completed.stdout.strip(), "AttributeError", completed.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import time
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.backtest.parameter_sweep import run_sweep_case
+
+
+class TopMomentumStrategy(qt.LightStrategy):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.top_n = kwargs.get("top_n")
+        self.lookback = kwargs.get("lookback")
+        self.sleep_seconds = kwargs.get("sleep_seconds", 0)
+
+    def on_data(self):
+        time.sleep(self.sleep_seconds)
+        past_price_df = self.daily_price_df.loc[:self.date].iloc[-self.lookback - 1:]
+        momentum = past_price_df.iloc[-1] / past_price_df.iloc[0]
+        tickers = momentum.sort_values(ascending=False).index[:self.top_n]
+        self.reserve_order({ticker: 1 / self.top_n for ticker in tickers})
+
+
+class ParameterSweepTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2019-01-01", "2020-12-31")
+        self.market_data = {
+            "daily_price_df": pd.DataFrame(100 * np.cumprod(1 + rng.normal(0.0003, 0.01, (len(index), 6)), axis=0),
+                                           index=index, columns=[f"T{i}" for i in range(6)]),
+        }
+        self.base_kwargs = {
+            "start_date": pd.Timestamp("2020-01-01"),
+            "end_date": pd.Timestamp("2020-12-31"),
+            "rebalancing_periodic": "monthly",
+            "rebalancing_moment": "first",
+        }
+        self.param_grid = {"top_n": [1, 3], "lookback": [20, 60]}
+
+    def test_sweep_equals_sequential_runs(self):
+        summary_df = qt.run_parameter_sweep(TopMomentumStrategy, self.param_grid, self.market_data,
+                                            self.base_kwargs, max_workers=2)
+        sequential_summary_df = qt.run_parameter_sweep(TopMomentumStrategy, self.param_grid, self.market_data,
+                                                       self.base_kwargs, max_workers=1)
+        pd.testing.assert_frame_equal(summary_df, sequential_summary_df)
+
+        self.assertEqual(summary_df[["top_n", "lookback"]].values.tolist(), [[1, 20], [1, 60], [3, 20], [3, 60]])
+        performance_summary, _ = run_sweep_case(TopMomentumStrategy,
+                                                {**self.base_kwargs, **self.market_data, "top_n": 3, "lookback": 20})
+        pd.testing.assert_series_equal(summary_df.loc[2, performance_summary.index], performance_summary,
+                                       check_names=False, check_dtype=False)
+
+    def test_early_break(self):
+        param_grid = {"top_n": [1, 2, 3, 4, 5], "lookback": [20, 60]}
+        base_kwargs = {**self.base_kwargs, "sleep_seconds": 0.1}
+        start_time = time.perf_counter()
+        sweep = qt.iter_parameter_sweep(TopMomentumStrategy, param_grid, self.market_data, base_kwargs,
+                                        max_workers=2)
+        next(sweep)
+        sweep.close()
+        elapsed = time.perf_counter() - start_time
+
+        # case 하나는 약 1.2 초, 10 개를 모두 기다리면 6 초 이상
+        self.assertLess(elapsed, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+
+
+class DrawDownTestCase(unittest.TestCase):
+    def setUp(self):
+        index = pd.bdate_range("2020-01-01", periods=8)
+        value_series = pd.Series([100, 110, 99, 88, 110, 121, 115, 118], index=index, dtype=float)
+        self.index = index
+        self.cumulative_returns = qt.convert_values_to_cumulative_returns(value_series)
+
+    def test_draw_down(self):
+        drawdown = qt.get_draw_down(self.cumulative_returns)
+        expected = [np.nan, 0, -0.1, -0.2, 0, 0, 115 / 121 - 1, 118 / 121 - 1]
+        np.testing.assert_allclose(drawdown.values, expected)
+        self.assertEqual(drawdown.name, 'drawdown')
+
+        drawdown_df = qt.get_draw_down(pd.concat([self.cumulative_returns] * 2, axis=1, keys=["a", "b"]))
+        np.testing.assert_allclose(drawdown_df["b"].values, expected)
+
+    def test_draw_down_episodes(self):
+        _, episodes = qt.get_draw_down(self.cumulative_returns, return_episodes=True)
+        index = self.index
+
+        self.assertEqual(len(episodes), 2)
+        self.assertEqual(episodes.loc[0, "고점일"], index[1])
+        self.assertEqual(episodes.loc[0, "저점일"], index[3])
+        self.assertEqual(episodes.loc[0, "회복일"], index[4])
+        self.assertAlmostEqual(episodes.loc[0, "낙폭"], -0.2)
+        self.assertEqual(episodes.loc[0, "기간"], 3)
+        self.assertEqual(episodes.loc[1, "고점일"], index[5])
+        self.assertTrue(pd.isna(episodes.loc[1, "회복일"]))
+        self.assertEqual(episodes.loc[1, "기간"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
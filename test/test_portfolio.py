@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from quantrading.backtest.portfolio import Portfolio
+
+
+class PortfolioTestCase(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range(datetime(2020, 1, 1), periods=3)
+        self.market_df_pct_change = pd.DataFrame({
+            'A': [np.nan, 0.1, -0.05],
+            'B': [np.nan, np.nan, 0.02],
+            'C': [np.nan, 0.5, 0.5],
+        }, index=index)
+        self.portfolio = Portfolio(tickers=['A', 'B', 'C'], portfolio_transaction_fee=0.01)
+
+    def test_buy_sell(self):
+        self.portfolio.buy('A', 50)
+        self.portfolio.buy('B', 20)
+        self.portfolio.sell('B', 19.8)
+
+        self.assertEqual(self.portfolio.security_holding, {'A': 49.5})
+        self.assertAlmostEqual(self.portfolio.cash, 100 - 70 + 19.8 * 0.99)
+        self.assertAlmostEqual(self.portfolio.get_total_portfolio_value(), 49.5 + self.portfolio.cash)
+
+    def test_update_holdings_value_by_position(self):
+        self.portfolio.buy('A', 50)
+        self.portfolio.buy('B', 30)
+        return_matrix = self.portfolio.get_return_matrix(self.market_df_pct_change)
+
+        self.portfolio.update_holdings_value_by_position(1, return_matrix)
+        np.testing.assert_allclose(self.portfolio.amounts, [49.5 * 1.1, 29.7, 0])
+
+        self.portfolio.update_holdings_value(self.market_df_pct_change.index[2], self.market_df_pct_change)
+        np.testing.assert_allclose(self.portfolio.amounts, [49.5 * 1.1 * 0.95, 29.7 * 1.02, 0])
+        self.assertNotIn('C', self.portfolio.get_allocations().index)
+
+    def test_unknown_ticker(self):
+        self.portfolio.buy('D', 10)
+        self.assertEqual(self.portfolio.tickers, ['A', 'B', 'C', 'D'])
+        self.assertAlmostEqual(self.portfolio.get_allocations()['D'], 9.9 / 99.9)
+
+    def test_buy_sell_array(self):
+        sequential_portfolio = Portfolio(tickers=['A', 'B', 'C'], portfolio_transaction_fee=0.01)
+        for portfolio in [self.portfolio, sequential_portfolio]:
+            portfolio.buy('A', 50)
+            portfolio.buy('B', 20)
+
+        self.portfolio.sell_array(np.array([10, 19.8, 0]), np.array([True, True, False]))
+        self.portfolio.buy_array(np.array([0, 0, 30]), np.array([False, False, True]))
+        sequential_portfolio.sell('A', 10)
+        sequential_portfolio.sell('B', 19.8)
+        sequential_portfolio.buy('C', 30)
+
+        self.assertEqual(self.portfolio.security_holding, sequential_portfolio.security_holding)
+        self.assertAlmostEqual(self.portfolio.cash, sequential_portfolio.cash)
+
+    def test_set_allocations(self):
+        rng = np.random.default_rng(0)
+        tickers = [f"T{i}" for i in range(30)]
+        for transaction_fee in [0, 0.001, 0.05]:
+            portfolio = Portfolio(tickers=tickers, portfolio_transaction_fee=transaction_fee)
+            sequential_portfolio = Portfolio(tickers=tickers, portfolio_transaction_fee=transaction_fee)
+            for _ in range(5):
+                weights = rng.dirichlet(np.ones(len(tickers) + 1))
+                weights[:3] = 0
+                new_allocations = pd.Series(weights, index=tickers + ["cash"])
+
+                portfolio.set_allocations(new_allocations)
+                allocations_delta_df = sequential_portfolio.get_allocations_delta(new_allocations)
+                for ticker, weight in allocations_delta_df["next"].items():
+                    if ticker != "cash":
+                        sequential_portfolio.set_weight(ticker, weight)
+
+                np.testing.assert_allclose(portfolio.amounts, sequential_portfolio.amounts, atol=1e-12)
+                self.assertAlmostEqual(portfolio.cash, sequential_portfolio.cash, places=12)
+                daily_returns = rng.normal(0, 0.02, len(tickers))
+                portfolio.update_holdings_value_by_returns(daily_returns)
+                sequential_portfolio.update_holdings_value_by_returns(daily_returns)
+            self.assertNotIn('T0', portfolio.security_holding)
+
+    def test_get_amount_delta(self):
+        self.portfolio.buy('A', 50)
+        amount_delta_series = self.portfolio.get_amount_delta(pd.Series({'B': 0.3, 'cash': 0.7}))
+        self.assertTrue(np.isneginf(amount_delta_series['A']))
+        self.assertAlmostEqual(amount_delta_series['B'], 0.3 * self.portfolio.get_total_portfolio_value())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import pandas as pd
+from quantrading.backtest.portfolio import Portfolio
+from quantrading.backtest.portfolio_log import PortfolioLogBuffer
+
+
+class PortfolioLogBufferTestCase(unittest.TestCase):
+    def run_portfolio(self, trades_list: list, initial_holding=None):
+        """
+        날짜별 (매매, 수익률) 을 실행하며 PortfolioLogBuffer 와 DataFrame 에 행을 추가하는 기존 방식으로 함께 기록
+        """
+        date_list = pd.bdate_range("2020-01-01", periods=len(trades_list)).to_list()
+        portfolio = Portfolio(tickers=['A', 'B', 'C'], portfolio_transaction_fee=0.01,
+                              SECURITY_HOLDING=initial_holding or {})
+        if initial_holding is not None:
+            portfolio.cash -= sum(initial_holding.values())
+        buffer = PortfolioLogBuffer(date_list, portfolio.tickers)
+
+        portfolio_log = pd.DataFrame(columns=['port_value', 'cash'])
+        weight_list = []
+        for position, (date, (trades, daily_returns)) in enumerate(zip(date_list, trades_list)):
+            for ticker, amount in trades:
+                if amount > 0:
+                    portfolio.buy(ticker, amount)
+                else:
+                    portfolio.sell(ticker, -amount)
+            portfolio.update_holdings_value_by_returns(np.array(daily_returns))
+
+            buffer.record(position, portfolio.get_total_portfolio_value(), portfolio.cash, portfolio.amounts,
+                          portfolio.held)
+            portfolio_log.loc[date, "port_value"] = portfolio.get_total_portfolio_value()
+            portfolio_log.loc[date, "cash"] = portfolio.cash
+            for ticker, amount in portfolio.security_holding.items():
+                portfolio_log.loc[date, ticker + "_amount"] = amount
+            weight_list.append(portfolio.get_allocations().to_frame(date).T)
+        return buffer, portfolio_log.astype(float), pd.concat(weight_list, axis=0)
+
+    def test_same_as_appended_log(self):
+        trades_list = [
+            ([], [0, 0, 0]),
+            ([('A', 40)], [0.01, 0, 0]),
+            ([('C', 30)], [-0.02, 0, 0.03]),
+            ([('A', -10)], [0, 0, 0.01]),
+            ([('B', 10), ('A', 5)], [0.02, -0.01, 0]),
+        ]
+        buffer, portfolio_log, weight_df = self.run_portfolio(trades_list)
+
+        self.assertEqual(len(buffer), 5)
+        pd.testing.assert_frame_equal(buffer.to_frame(), portfolio_log)
+        pd.testing.assert_frame_equal(buffer.to_weight_frame(), weight_df)
+        self.assertEqual(buffer.to_weight_frame().columns.to_list(), ['cash', 'A', 'C', 'B'])
+
+    def test_cash_after_first_day_holdings(self):
+        trades_list = [
+            ([('B', 20)], [0, 0.01, 0]),
+            ([('C', 10)], [0.01, 0, -0.02]),
+        ]
+        buffer, portfolio_log, weight_df = self.run_portfolio(trades_list, initial_holding={'A': 30})
+
+        pd.testing.assert_frame_equal(buffer.to_frame(), portfolio_log)
+        pd.testing.assert_frame_equal(buffer.to_weight_frame(), weight_df)
+        self.assertEqual(buffer.to_weight_frame().columns.to_list(), ['A', 'B', 'cash', 'C'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from quantrading.backtest.profiler import RunProfiler, NullProfiler
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def test_run_profiler(self):
+        profiler = RunProfiler()
+        profiler.start()
+        for _ in range(10):
+            with profiler.measure("on_data"):
+                sum(range(1000))
+        with profiler.measure("on_end_of_algorithm"):
+            pass
+        profiler.stop(10)
+
+        profile_df = profiler.to_frame()
+        self.assertEqual(profile_df.loc["on_data", "calls"], 10)
+        self.assertEqual(profile_df.loc["on_end_of_algorithm", "calls"], 1)
+        self.assertLessEqual(profile_df["total"].sum(), profiler.run_seconds)
+        self.assertGreater(profiler.get_summary()["days_per_sec"], 0)
+
+    def test_null_profiler(self):
+        profiler = NullProfiler()
+        profiler.start()
+        with profiler.measure("on_data"):
+            pass
+        profiler.stop(1)
+        self.assertIsNone(profiler.get_summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.backtest import load_simulation_result_from_binary
+
+
+def get_base_array(values: np.ndarray) -> np.ndarray:
+    while values.base is not None and not isinstance(values, np.memmap):
+        values = values.base
+    return values
+
+
+class FixedWeightStrategy(qt.LightStrategy):
+    def initialize(self):
+        self.initial_order = True
+        self.reserve_order({"A": 0.5, "B": 0.5})
+
+    def on_data(self):
+        self.reserve_order({"A": 0.7, "B": 0.3})
+
+
+class ResultBinaryTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", periods=300)
+        price_df = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (300, 2)), axis=0), index=index,
+                                columns=["A", "B"])
+        strategy = FixedWeightStrategy(name="fixed", daily_price_df=price_df, start_date=index[0],
+                                       end_date=index[-1], rebalancing_periodic="monthly",
+                                       rebalancing_moment="first")
+        strategy.run()
+        strategy.result['info'] = {"memo": "test", "empty": {}}
+
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        strategy.result_value_to_binary(path)
+        for mmap in [False, True]:
+            result = load_simulation_result_from_binary(path, mmap=mmap)
+            self.assertEqual(result['info'], {"memo": "test", "empty": {}})
+            self.assertEqual(set(result['performance']), set(strategy.result['performance']))
+            for key, value in strategy.result['performance'].items():
+                if isinstance(value, pd.DataFrame):
+                    pd.testing.assert_frame_equal(result['performance'][key], value, check_freq=False)
+                else:
+                    pd.testing.assert_series_equal(result['performance'][key], value, check_freq=False)
+            pd.testing.assert_frame_equal(result['rebalacing_history'], strategy.result['rebalacing_history'])
+
+            port_value = result['performance']['port_value'].to_numpy()
+            rebalacing_history = result['rebalacing_history']
+            self.assertEqual(isinstance(get_base_array(port_value), np.memmap), mmap)
+            for column in rebalacing_history.columns:
+                column_values = rebalacing_history[column].to_numpy()
+                self.assertEqual(isinstance(get_base_array(column_values), np.memmap), mmap)
+
+
+if __name__ == '__main__':
+    unittest.main()
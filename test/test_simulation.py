@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.simulation import MonteCarloGenerator, simulate_strategy_performance
+
+
+class FixedWeightStrategy(qt.LightStrategy):
+    def initialize(self):
+        self.initial_order = True
+        self.reserve_order({0: 0.6, 1: 0.4})
+
+    def on_data(self):
+        self.reserve_order({0: 0.6, 1: 0.4})
+
+
+class MonteCarloGeneratorTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.returns_df = pd.DataFrame(rng.normal(0.0004, 0.01, (500, 3)))
+
+    def test_same_seed_same_paths(self):
+        paths = MonteCarloGenerator(self.returns_df, seed=7).generate_paths(150, 20, chunk_size=1000)
+        for chunk_size in [1, 13, 64, 100]:
+            np.testing.assert_array_equal(
+                MonteCarloGenerator(self.returns_df, seed=7).generate_paths(150, 20, chunk_size=chunk_size), paths)
+
+        generator = MonteCarloGenerator(self.returns_df, seed=7)
+        np.testing.assert_array_equal(generator.generate_chunk(30, 20, start_path=50), paths[50:80])
+        self.assertEqual(generator.generate_chunk(0, 20, start_path=10).shape, (0, 20, 3))
+        self.assertFalse(np.array_equal(MonteCarloGenerator(self.returns_df, seed=8).generate_paths(150, 20), paths))
+
+    def test_spawn(self):
+        generator = MonteCarloGenerator(self.returns_df, seed=7)
+        stream_list = generator.spawn(3)
+        stream_paths = [stream.generate_paths(200, 50) for stream in stream_list]
+
+        # 같은 seed 에서 spawn 하면 같은 stream
+        same_stream_list = MonteCarloGenerator(self.returns_df, seed=7).spawn(3)
+        np.testing.assert_array_equal(same_stream_list[1].generate_paths(200, 50), stream_paths[1])
+
+        parent_paths = generator.generate_paths(200, 50)
+        for i, paths in enumerate(stream_paths):
+            for other_paths in [parent_paths, *stream_paths[i + 1:]]:
+                correlation = np.corrcoef(paths.ravel(), other_paths.ravel())[0, 1]
+                self.assertLess(abs(correlation), 0.02)
+
+    def test_worker_count(self):
+        generator = MonteCarloGenerator(self.returns_df, seed=1)
+        weight_series = pd.Series({0: 0.5, 1: 0.3, 2: 0.2})
+        result = simulate_strategy_performance(generator, weight=weight_series, n_paths=40, walk_length=100,
+                                               chunk_size=40, max_workers=1)
+        parallel_result = simulate_strategy_performance(generator, weight=weight_series, n_paths=40, walk_length=100,
+                                                        chunk_size=7, max_workers=2)
+        pd.testing.assert_frame_equal(parallel_result, result)
+
+
+class StrategySimulationTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        returns_df = pd.DataFrame(rng.normal(0.0004, 0.01, (500, 2)))
+        self.generator = MonteCarloGenerator(returns_df, seed=1)
+        self.paths = self.generator.generate_paths(10, 300, chunk_size=4)
+
+    def test_weight_and_strategy(self):
+        weight_series = pd.Series({0: 0.6, 1: 0.4})
+        result = simulate_strategy_performance(self.paths, weight=weight_series, chunk_size=4, max_workers=1)
+        expected = simulate_strategy_performance(self.paths, strategy_class=FixedWeightStrategy,
+                                                 strategy_kwargs={"rebalancing_periodic": "monthly",
+                                                                  "rebalancing_moment": "first"},
+                                                 chunk_size=4, max_workers=1)
+        self.assertEqual(result.shape, (10, 5))
+        np.testing.assert_allclose(result.values, expected.values, rtol=1e-10)
+
+        generated = simulate_strategy_performance(self.generator, weight=weight_series, n_paths=10, walk_length=300,
+                                                  chunk_size=4, max_workers=1)
+        np.testing.assert_allclose(generated.values, result.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
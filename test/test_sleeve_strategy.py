@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from quantrading.backtest.sleeve_strategy import SleeveStrategy
+from quantrading.backtest.simulation_result_utils import save_simulation_result_to_excel_file
+
+
+class SleeveStrategyTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", "2020-06-30")
+        daily_returns = rng.normal(0.0005, 0.01, (len(index), 2))
+        daily_returns[0] = 0
+        self.sleeve_value_df = pd.DataFrame(100 * np.cumprod(1 + daily_returns, axis=0), index=index,
+                                            columns=["momentum", "value"])
+
+    def get_loop_port_value(self, strategy, allocation):
+        # 리밸런싱일 종가에 sleeve value 를 비중대로 다시 나눔
+        returns_df = self.sleeve_value_df.pct_change().fillna(0)
+        weights = pd.Series(allocation).reindex(self.sleeve_value_df.columns).fillna(0)
+        holdings = weights * 100
+        cash = 100 - holdings.sum()
+        port_value_list = []
+        for date in self.sleeve_value_df.index:
+            holdings = holdings * (1 + returns_df.loc[date])
+            if date in strategy.rebalancing_days:
+                port_value = holdings.sum() + cash
+                holdings = weights * port_value
+                cash = port_value - holdings.sum()
+            port_value_list.append(holdings.sum() + cash)
+        return np.array(port_value_list)
+
+    def test_run(self):
+        allocation = {"momentum": 0.6, "value": 0.3}
+        strategy = SleeveStrategy(sleeve_value_df=self.sleeve_value_df, allocation=allocation,
+                                  rebalancing_periodic="monthly", rebalancing_moment="first", name="sleeve")
+        strategy.run()
+
+        port_value = strategy.result['performance']['port_value']
+        self.assertEqual(len(strategy.rebalancing_days), 5)
+        np.testing.assert_allclose(port_value.to_numpy(), self.get_loop_port_value(strategy, allocation))
+        self.assertAlmostEqual(strategy.result['rebalancing_weight']['cash'].iloc[0], 0.1)
+
+        portfolio_log = strategy.result['performance']['portfolio_log']
+        self.assertEqual(portfolio_log.columns.to_list(), ['port_value', 'momentum', 'value', 'cash', 'drawdown'])
+        np.testing.assert_allclose(portfolio_log[['momentum', 'value', 'cash']].sum(axis=1), port_value)
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, ignore_errors=True)
+        path = os.path.join(folder, "sleeve.xlsx")
+        save_simulation_result_to_excel_file(strategy.result, path)
+        self.assertTrue(os.path.exists(path))
+
+    def test_run_variants(self):
+        strategy = SleeveStrategy(sleeve_value_df=self.sleeve_value_df, rebalancing_periodic="monthly",
+                                  rebalancing_moment="first")
+        allocation_dict = {f"{weight:.1f}": {"momentum": weight, "value": 1 - weight}
+                           for weight in np.linspace(0, 1, 11)}
+        result = strategy.run_variants(allocation_dict, chunk_size=4)
+
+        self.assertEqual(result['port_value'].columns.to_list(), list(allocation_dict))
+        self.assertEqual(result['performance_summary'].index.to_list(), list(allocation_dict))
+        for name, allocation in allocation_dict.items():
+            np.testing.assert_allclose(result['port_value'][name].to_numpy(),
+                                       self.get_loop_port_value(strategy, allocation))
+
+    def test_allocation_schedule(self):
+        strategy = SleeveStrategy(sleeve_value_df=self.sleeve_value_df, rebalancing_periodic="monthly",
+                                  rebalancing_moment="first")
+        schedule = pd.DataFrame({"momentum": [1.0, 0.2]},
+                                index=pd.to_datetime(["2020-01-01", "2020-03-15"]))
+        weight_array = strategy.get_weight_array(schedule)
+        np.testing.assert_allclose(weight_array[:, 0], [1, 1, 1, 0.2, 0.2, 0.2])
+        np.testing.assert_allclose(weight_array[:, 2], [0, 0, 0, 0.8, 0.8, 0.8])
+
+        with self.assertRaises(ValueError):
+            strategy.get_weight_array({"growth": 0.5})
+        with self.assertRaises(ValueError):
+            strategy.get_weight_array({"momentum": 0.5, "value": 0.5, "cash": 0.3})
+        with self.assertRaises(ValueError):
+            strategy.get_weight_array({"momentum": 0.8, "value": 0.5})
+        np.testing.assert_allclose(strategy.get_weight_array({"momentum": 0.5, "cash": 0.5})[0], [0.5, 0, 0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
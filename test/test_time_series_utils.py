@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+
+
+class TimeSeriesUtilsTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", periods=300)
+        self.price_df = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.02, (300, 3)), axis=0), index=index,
+                                     columns=["A", "B", "C"])
+        self.price_df.iloc[50:55, 1] = np.nan
+
+    def test_rolling_returns(self):
+        window_list = [5, 21]
+        result = qt.get_panel_rolling_returns(self.price_df, window_list, chunk_size=2)
+        self.assertEqual(result.index.names, ["date", "ticker"])
+
+        for ticker in self.price_df.columns:
+            daily_returns = self.price_df[ticker].pct_change().add(1)
+            for window in window_list:
+                expected = daily_returns.rolling(window).apply(np.prod, raw=True) - 1
+                name = f"Rolling{window}Returns"
+                np.testing.assert_allclose(result[name].xs(ticker, level="ticker").values, expected.values,
+                                           rtol=1e-10)
+                np.testing.assert_allclose(qt.get_rolling_returns(self.price_df[ticker], window_list)[name].values,
+                                           expected.values, rtol=1e-10)
+
+    def test_panel_features(self):
+        price_df = self.price_df
+        cases = [
+            (qt.get_past_returns, qt.get_panel_past_returns),
+            (qt.get_future_returns, qt.get_panel_future_returns),
+            (lambda s: qt.add_both_side_returns(s, remove_base=False),
+             lambda df: qt.add_panel_both_side_returns(df, remove_base=False, max_workers=2)),
+            (lambda s: qt.add_ma_price(s, [5, 21]), lambda df: qt.add_panel_ma_price(df, [5, 21])),
+            (lambda s: qt.get_vol(s, [5, 21]), lambda df: qt.get_panel_vol(df, [5, 21])),
+        ]
+        for get_features, get_panel_features in cases:
+            result = get_panel_features(price_df)
+            for ticker in price_df.columns:
+                expected = get_features(price_df[ticker])
+                self.assertEqual(list(result[ticker].columns), list(expected.columns))
+                np.testing.assert_allclose(result[ticker].values, expected.values, rtol=1e-8, atol=1e-12)
+
+        result = qt.get_panel_ma(price_df, [5, 21])
+        expected = qt.get_ma(price_df["B"], [5, 21])
+        np.testing.assert_allclose(result["B"].dropna().values, expected.values, rtol=1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
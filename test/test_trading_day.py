@@ -19,7 +19,46 @@ class MyTestCase(unittest.TestCase):
         a = td.get_rebalancing_days(start_date, end_date, rebalancing_periodic, rebalancing_moment)
         print(a)
 
-        self.assertEqual(True, False)
+        self.assertEqual(a, [datetime(2020, 3, 31), datetime(2020, 6, 30), datetime(2020, 9, 30)])
+
+    def test_magnet(self):
+        td = qt.trading_day.TradingDay(pd.bdate_range(datetime(2020, 1, 1), datetime(2020, 3, 31)).tolist())
+
+        self.assertEqual(td.magnet(datetime(2020, 2, 1), 1), datetime(2020, 2, 3))
+        self.assertEqual(td.magnet(datetime(2020, 2, 1), 0), datetime(2020, 1, 31))
+        self.assertEqual(td.magnet(datetime(2020, 2, 3), 0), datetime(2020, 2, 3))
+        with self.assertRaises(IndexError):
+            td.magnet(datetime(2020, 4, 1), 1)
+
+    def test_rebalancing_days(self):
+        start_date = datetime(2019, 12, 15)
+        end_date = datetime(2021, 2, 10)
+        trading_days = pd.bdate_range(datetime(2019, 1, 1), datetime(2021, 12, 31))
+        td = qt.trading_day.TradingDay(trading_days.tolist(), close_day_policy="before")
+
+        def magnet(date, flag):
+            if flag == 1:
+                return trading_days[trading_days >= date][0]
+            return trading_days[trading_days <= date][-1]
+
+        months = pd.period_range(start_date, end_date, freq="M")
+        in_range = trading_days[(trading_days >= start_date) & (trading_days <= end_date)]
+        expected = {
+            ('daily', 'first'): in_range.tolist(),
+            ('weekly', 'first'): [magnet(d, 1) for d in pd.date_range(start_date, end_date, freq="W-MON")],
+            ('weekly', 'last'): [magnet(d, 0) for d in pd.date_range(start_date, end_date, freq="W-FRI")],
+            ('monthly', 'first'): [magnet(m.start_time, 1) for m in months],
+            ('monthly', 'last'): [magnet(m.end_time.normalize(), 0) for m in months],
+            ('monthly', 15): [magnet(m.start_time + pd.Timedelta(days=14), 0) for m in months],
+            ('monthly', 31): [magnet(m.end_time.normalize(), 0) for m in months],
+            ('quarterly', 'first'): [magnet(m.start_time, 1) for m in months if m.month in [1, 4, 7, 10]],
+            ('quarterly', 'last'): [magnet(m.end_time.normalize(), 0) for m in months if m.month in [3, 6, 9, 12]],
+            ('yearly', 'first'): [datetime(2019, 1, 1), datetime(2020, 1, 1), datetime(2021, 1, 1)],
+            ('yearly', 'last'): [datetime(2019, 12, 31), datetime(2020, 12, 31), datetime(2021, 12, 31)],
+        }
+        for (rebalancing_periodic, rebalancing_moment), days in expected.items():
+            result = td.get_rebalancing_days(start_date, end_date, rebalancing_periodic, rebalancing_moment)
+            self.assertEqual(result, days, (rebalancing_periodic, rebalancing_moment))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,186 @@
+import unittest
+import numpy as np
+import pandas as pd
+import quantrading as qt
+from quantrading.backtest.simulation_result_utils import calc_performance_from_value_history
+from quantrading.backtest.utils import calc_rebalancing_port_value_array, get_rebalancing_segment_ids, \
+    calc_sparse_rebalancing_port_value_array, merge_portfolio_log, SimulationResultAggregator, concat_simulation_result
+
+
+def get_port_value_by_loop(weight_df: pd.DataFrame, daily_return_df: pd.DataFrame, rebalancing_date_list: list):
+    value_df_list = []
+    start_value = 1
+    segment_ids = get_rebalancing_segment_ids(daily_return_df.index, rebalancing_date_list)
+    for i in range(len(weight_df)):
+        sliced_daily_return_df = daily_return_df.loc[segment_ids == i]
+        if len(sliced_daily_return_df) == 0:
+            start_value = start_value * weight_df.iloc[i].sum()
+            continue
+        sliced_value_df = sliced_daily_return_df.fillna(0).add(1).cumprod().multiply(weight_df.iloc[i] * start_value)
+        start_value = sliced_value_df.iloc[-1].sum()
+        value_df_list.append(sliced_value_df)
+    return pd.concat(value_df_list, axis=0)
+
+
+class RebalancingKernelTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", periods=300)
+        self.daily_return_df = pd.DataFrame(rng.normal(0.0005, 0.02, (300, 4)), index=index, columns=list("ABCD"))
+        self.daily_return_df.iloc[0] = np.nan
+        self.daily_return_df.iloc[10, 2] = -1
+        self.rebalancing_date_list = [index[20], index[21].strftime("%Y-%m-%d"), index[150], index[299]]
+        self.weight_df = pd.DataFrame(rng.uniform(0, 1, (5, 4)), columns=list("ABCD"))
+        self.weight_df = self.weight_df.divide(self.weight_df.sum(axis=1), axis=0)
+
+    def test_dynamic_weight(self):
+        weight_series_list = [row for _, row in self.weight_df.iterrows()]
+        result = qt.get_dynamic_weight_rebalancing_port_daily_value_df(
+            weight_series_list, self.daily_return_df, self.rebalancing_date_list)
+        expected = get_port_value_by_loop(self.weight_df, self.daily_return_df, self.rebalancing_date_list)
+
+        self.assertEqual(result.shape, self.daily_return_df.shape)
+        np.testing.assert_allclose(result.values, expected.values, rtol=1e-10)
+
+        result_float32 = qt.get_dynamic_weight_rebalancing_port_daily_value_df(
+            weight_series_list, self.daily_return_df, self.rebalancing_date_list, dtype=np.float32)
+        self.assertEqual(result_float32.values.dtype, np.float32)
+        np.testing.assert_allclose(result_float32.values, expected.values, rtol=1e-4)
+
+    def test_static_weight(self):
+        weight_series = self.weight_df.iloc[0]
+        result = qt.get_static_weight_rebalancing_port_daily_value_df(
+            weight_series, self.daily_return_df, self.rebalancing_date_list)
+        static_weight_df = pd.DataFrame([weight_series] * 5)
+        expected = get_port_value_by_loop(static_weight_df, self.daily_return_df, self.rebalancing_date_list)
+        np.testing.assert_allclose(result.values, expected.values, rtol=1e-10)
+
+    def test_batch(self):
+        segment_ids = get_rebalancing_segment_ids(self.daily_return_df.index, self.rebalancing_date_list)
+        return_array = np.stack([self.daily_return_df.values, self.daily_return_df.values[::-1]])
+        weight_array = np.stack([self.weight_df.values, self.weight_df.values])
+        result = calc_rebalancing_port_value_array(return_array, weight_array, segment_ids)
+
+        for i in range(2):
+            daily_return_df = pd.DataFrame(return_array[i], index=self.daily_return_df.index)
+            weight_df = pd.DataFrame(weight_array[i])
+            expected = get_port_value_by_loop(weight_df, daily_return_df, self.rebalancing_date_list)
+            np.testing.assert_allclose(result[i], expected.values, rtol=1e-10)
+
+    def test_sparse(self):
+        weight_df = self.weight_df.copy()
+        weight_df.iloc[1, [0, 2]] = 0
+        weight_df.iloc[3, :3] = 0
+        weight_rows = []
+        for _, weight_series in weight_df.iterrows():
+            columns = np.flatnonzero(weight_series.values)
+            weight_rows.append((columns, weight_series.values[columns]))
+
+        segment_ids = get_rebalancing_segment_ids(self.daily_return_df.index, self.rebalancing_date_list)
+        result = calc_sparse_rebalancing_port_value_array(self.daily_return_df.values, weight_rows, segment_ids)
+        expected = get_port_value_by_loop(weight_df, self.daily_return_df, self.rebalancing_date_list)
+        np.testing.assert_allclose(result, expected.sum(axis=1).values, rtol=1e-10)
+
+
+class PanelBucketingTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.bdate_range("2020-01-01", periods=20)
+        score_array = rng.integers(0, 8, (20, 23)).astype(float)
+        score_array[rng.random(score_array.shape) < 0.2] = np.nan
+        score_array[0] = np.nan
+        self.score_df = pd.DataFrame(score_array, index=index, columns=[f"T{i}" for i in range(23)])
+
+    def test_quantiles(self):
+        for ascending in [False, True]:
+            code_df = qt.divide_panel_by_quantiles(self.score_df, 4, ascending=ascending)
+            for date, score_series in self.score_df.iterrows():
+                for tile in range(4):
+                    first_quantile, last_quantile = qt.divide_code_list_by_quantiles(score_series, 4, tile, ascending)
+                    self.assertEqual(set(code_df.columns[code_df.loc[date] == tile]), set(first_quantile))
+                    last_mask = qt.get_panel_quantile_mask(self.score_df, 4, tile, ascending=not ascending)
+                    self.assertEqual(set(last_mask.columns[last_mask.loc[date]]), set(last_quantile))
+            self.assertTrue((code_df.loc[self.score_df.index[0]] == -1).all())
+            self.assertTrue((code_df.values[self.score_df.isna().values] == -1).all())
+
+    def test_percentile(self):
+        mask_df = qt.get_panel_percentile_mask(self.score_df, 10, 35)
+        for date, score_series in self.score_df.iterrows():
+            sorted_series = score_series.dropna().sort_values(ascending=False, kind='stable')
+            expected = qt.divide_code_list_by_percentile(sorted_series, 10, 35)
+            self.assertEqual(set(mask_df.columns[mask_df.loc[date]]), set(expected))
+
+
+class SimulationResultAggregationTestCase(unittest.TestCase):
+    def get_result(self, name: str, seed: int) -> dict:
+        index = pd.bdate_range("2020-01-01", periods=300)
+        value_series = pd.Series(100 * np.cumprod(1 + np.random.default_rng(seed).normal(0, 0.01, 300)),
+                                 index=index, name=name)
+        performance = calc_performance_from_value_history(value_series)
+        performance['portfolio_log'] = value_series.to_frame()
+        return {'performance': performance}
+
+    def test_aggregator(self):
+        result_list = [self.get_result(f"case{i}", i) for i in range(4)]
+        aggregator = SimulationResultAggregator()
+        aggregator.add(result_list[2], order=2)
+        aggregator.add(result_list[0], order=0)
+        self.assertEqual(list(aggregator.get_result()['performance']['portfolio_log'].columns), ["case0", "case2"])
+
+        aggregator.add(result_list[3], order=3)
+        aggregator.add(result_list[1], order=1)
+        performance = aggregator.get_result()['performance']
+        self.assertEqual(list(performance['portfolio_log'].columns), ["case0", "case1", "case2", "case3"])
+        self.assertEqual(performance['performance_summary'].shape[1], 4)
+        self.assertEqual(len(performance['returns_until_next_rebal']), 0)
+
+        concated_performance = concat_simulation_result(result_list)['performance']
+        pd.testing.assert_frame_equal(concated_performance['monthly_returns'], performance['monthly_returns'])
+
+    def test_interleaved_add(self):
+        result_list = [self.get_result(f"case{i}", i) for i in range(5)]
+        aggregator = SimulationResultAggregator(custom_df=pd.DataFrame({"custom": [0.1]}))
+        for i, result in enumerate(result_list):
+            aggregator.add(result)
+            performance = aggregator.get_result()['performance']
+            expected = concat_simulation_result(result_list[:i + 1],
+                                                custom_df=pd.DataFrame({"custom": [0.1]}))['performance']
+            for key in SimulationResultAggregator.PERFORMANCE_KEYS:
+                pd.testing.assert_frame_equal(performance[key], expected[key])
+
+        aggregator.add(self.get_result("first", 9), order=-1)
+        self.assertEqual(aggregator.get_result()['performance']['portfolio_log'].columns[0], "first")
+
+    def test_out_of_order_stream(self):
+        result_list = [self.get_result(None if i % 3 == 0 else f"case{i}", i) for i in range(8)]
+        aggregator = SimulationResultAggregator()
+        added_orders = []
+        for order in [3, 5, 0, 7, 1, 4, 6, 2]:
+            aggregator.add(result_list[order], order=order)
+            added_orders.append(order)
+            performance = aggregator.get_result()['performance']
+            expected = concat_simulation_result([result_list[i] for i in sorted(added_orders)])['performance']
+            for key in SimulationResultAggregator.PERFORMANCE_KEYS:
+                pd.testing.assert_frame_equal(performance[key], expected[key])
+
+    def test_merge_portfolio_log(self):
+        index = pd.bdate_range("2020-01-01", periods=3)
+
+        class Algorithm:
+            def __init__(self, portfolio_log):
+                self.portfolio_log = portfolio_log
+
+        algorithm_list = [
+            Algorithm(pd.DataFrame({'port_value': [100, 101, 102], 'cash': [10, 10, 10], 'A_amount': [90, 91, 92]},
+                                   index=index)),
+            Algorithm(pd.DataFrame({'port_value': [100, 99, 98], 'cash': [0, 0, 0], 'B_amount': [100, 99, np.nan]},
+                                   index=index)),
+        ]
+        merged_log = merge_portfolio_log(algorithm_list)
+        self.assertEqual(list(merged_log.columns), ['port_value', 'cash', 'A_amount', 'B_amount'])
+        self.assertEqual(merged_log['port_value'].tolist(), [200, 200, 200])
+        self.assertEqual(merged_log['B_amount'].tolist(), [100, 99, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()